@@ -1,38 +1,87 @@
 
 
 # Importacoes necessarias para o código funcionar corretamente 
+# (o matplotlib e o numpy-stl sao importados apenas no primeiro uso, para a janela abrir mais rapido)
+import time
+START_TIME = time.perf_counter()
 import sys
-from PyQt5.QtCore import *
+import argparse
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QPushButton, QGridLayout, QWidget, 
-    QHBoxLayout, QMessageBox
+    QHBoxLayout, QMessageBox, QComboBox, QShortcut
 )
-from PyQt5.QtGui import QIcon
-from src.utils.load_stl import load_stl
+from PyQt5.QtGui import QIcon, QKeySequence
 from src.camera.initialize_camera import initialize_camera
-from src.plot.plot import Plots
+from src.plot.plot import Plots, RENDER_MODES, INIT_CONFIGURING, INIT_CREATED, INIT_READY
 from src.world.world_config import World
 from src.intrinsic.intrinsic_config import Intrinsic
 from src.reset.reset_config import Reset
 from src.camera.camera import Camera  # Import the Camera class
+from src.history.history_config import History
+from src.history.pose_history import PoseHistory
+from src.bookmarks.bookmark_config import Bookmarks
+from src.bookmarks.bookmarks import bookmarks_path
+from src.presets.preset_config import Presets
+from src.rig.rig_config import Rig
 from src.utils.tutorial_popup import TutorialPopup
-import matplotlib.pyplot as plt
+from src.utils.meshes import DEFAULT_MESH, load_mesh
+from src.utils.mesh_analysis import MeshData
+from src.session.recorder import SessionRecorder
+from src.scene.scene import Scene
+from src.scene.instancing import InstancedMesh
+from src.scene.state import SceneState
+from src.utils.projection_cache import ProjectionCache
 
-class MainWindow(QMainWindow, Plots, Camera, World, Intrinsic,Reset):
+class MainWindow(QMainWindow, Plots, Camera, World, Intrinsic,Reset, History, Bookmarks, Presets, Rig):
 
     def log(self, message):
         print(f"[LOG] {message}")
+
+    def record_event(self, kind, values=None):
+        """
+        Registra uma alteração confirmada de parâmetros na sessão gravada (quando a gravação está ativa) e no
+        histórico de desfazer/refazer.
+
+        Parâmetros:
+        -----------
+        - `kind` (str): Tipo da alteração ("cam", "world", "intrinsic", "reset" ou "restore").
+        - `values` (dict): Campos e valores aplicados.
+        """
+        if self.recorder is not None:
+            self.recorder.record(kind, values)
+        self.commit_history()
     
-    def __init__(self):
+    def __init__(self, record_path=None, scene_paths=None, grid=None, autoframe=False, bookmarks_file=None, preset=None, preset_view=None, rig=None):
         """
         Inicializa a janela principal e configura as variáveis, valores padrão, e a interface de usuário.
         Este método cria a estrutura básica do programa, definindo:
         - Título e dimensões da janela.
         - Valores padrão para transformações do mundo, transformações da câmera e parâmetros intrínsecos da câmera.
         - Configura a interface gráfica inicial.
+
+        Parâmetros:
+        -----------
+        - `record_path` (str, opcional): Arquivo onde a sessão (alterações de parâmetros) será gravada ao fechar a janela.
+        - `scene_paths` (list, opcional): Malhas a carregar juntas em uma cena, sem exibir o tutorial.
+        - `grid` (tuple, opcional): Número de cópias (nx, ny) da malha escolhida, desenhadas por instanciamento.
+        - `autoframe` (bool, opcional): Posiciona a câmera inicial (e a do reset) de modo a enquadrar o objeto.
+        - `bookmarks_file` (str, opcional): Arquivo de favoritos (por padrão, `<malha>.bookmarks.npz` ao lado da malha).
+        - `preset` (str, opcional): Preset (.json ou .toml) aplicado no primeiro quadro.
+        - `preset_view` (str, opcional): Vista do preset a aplicar (por padrão, a primeira).
+        - `rig` (str, opcional): Preset cujas vistas formam um rig de câmeras, exibido ao abrir.
         """
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: __init__")
+        # Nenhum desenho e feito ate o primeiro quadro (ver `request_render` e `first_frame`)
+        self.init_state = INIT_CREATED
+        self.render_dirty = False
+        # Versoes da pose, dos parametros intrinsecos e da malha: so as vistas afetadas sao redesenhadas
+        self.scene_state = SceneState()
+        # Poses e parametros intrinsecos confirmados, para desfazer/refazer
+        self.history = PoseHistory()
+        # Projecoes ja calculadas, reaproveitadas ao rever uma vista
+        self.projection_cache = ProjectionCache()
         self.log("Iniciando a aplicacao...")
 
         # Chamada ao construtor da classe base QMainWindow.
@@ -40,7 +89,20 @@ class MainWindow(QMainWindow, Plots, Camera, World, Intrinsic,Reset):
         self.log("Construtor da classe base chamado com sucesso.")
 
         # Inicializa as variaveis de configuracao necessarias para a aplicacao.
-        self.set_variables()
+        self.set_variables(scene_paths, grid)
+
+        self.autoframe = autoframe
+        self.preset = preset
+        self.preset_view = preset_view
+        self.rig_path = rig
+
+        # Vistas salvas: ao lado da malha, a menos que outro arquivo seja indicado (cenas so gravam com --bookmarks)
+        self.bookmarks_path = bookmarks_file or (bookmarks_path(self.mesh_path) if self.scene is None else None)
+
+        # Inicia a gravacao da sessao, se solicitada.
+        self.record_path = record_path
+        recorded_grid = grid if isinstance(self.scene, InstancedMesh) else None
+        self.recorder = SessionRecorder(self.mesh_path, recorded_grid) if record_path else None
 
         # Define os textos nas janelas e icones.
         self.setWindowTitle("Github: Dsbrito ~ Visão Computacional com a Professora Raquel ~ Trabalho 1 - Movimento de Corpo Rígido e Projeção Perspectiva")
@@ -82,6 +144,11 @@ class MainWindow(QMainWindow, Plots, Camera, World, Intrinsic,Reset):
             "ccd_y:": 0,
             "dist_focal:": 0,
             "s_theta:": 0,
+            "k1:": 0,
+            "k2:": 0,
+            "p1:": 0,
+            "p2:": 0,
+            "k3:": 0,
             "sx:": 0,
             "sy:": 0,
             "ox:": 0,
@@ -89,34 +156,73 @@ class MainWindow(QMainWindow, Plots, Camera, World, Intrinsic,Reset):
         }
         self.log(f"Parametros intrinsecos da camera inicializados: {self.params_intrinsc_values}")
 
+        # Modo de desenho da imagem 2D (ver RENDER_MODES).
+        self.render_mode = "wireframe"
+
         # Configura e exibe a interface grafica principal do programa.
         try:
             self.InterfaceUI()
             self.log("Interface grafica configurada com sucesso.")
+
+            # O primeiro quadro e desenhado depois que a janela aparece (o esqueleto da janela e exibido antes)
+            QTimer.singleShot(0, self.first_frame)
             self.log("Saindo da funcao __init__.")
             self.log("-----------------------------------------")
             self.log("-----------------------------------------")
-            self.reset()
-            self.reset_parameter()
-            self.log("-----------------------------------------")
 
         except Exception as e:
             self.log(f"Erro ao configurar a interface grafica: {e}")
             self.log("-----------------------------------------")
 
-    def set_variables(self):
+    def first_frame(self):
+        """
+        Define a pose e os parâmetros iniciais e desenha os gráficos pela primeira vez.
+
+        Chamado pelo laço de eventos do Qt logo depois que a janela é exibida, de modo que o esqueleto da janela
+        aparece antes do trabalho pesado (importação do matplotlib e primeira renderização). Registra no log o
+        tempo desde o início do programa até o primeiro quadro.
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: first_frame")
+        try:
+            # Enquanto os valores padrao sao definidos, os pedidos de desenho apenas marcam a cena como suja;
+            # o desenho acontece uma unica vez, na transicao para INIT_READY
+            self.set_init_state(INIT_CONFIGURING)
+            self.reset_parameter()
+            self.reset()
+            if self.autoframe:
+                # A pose inicial depende da malha: gravada para que a reprodução parta do mesmo estado
+                self.record_event("reset", {"cam": self.cam.tolist()})
+            if self.preset:
+                self.apply_preset(self.preset, self.preset_view, ask=False)
+            self.set_init_state(INIT_READY)
+            self.commit_history()
+            if self.rig_path:
+                self.load_rig(self.rig_path)
+            self.log(f"Primeiro quadro desenhado em {time.perf_counter() - START_TIME:.3f} s desde o inicio.")
+        except Exception as e:
+            self.log(f"Erro ao desenhar o primeiro quadro: {e}")
+            # Libera os proximos desenhos mesmo que a inicializacao tenha falhado
+            self.init_state = INIT_READY
+        self.log("-----------------------------------------")
+
+    def set_variables(self, scene_paths=None, grid=None):
         """
         Inicializa as variáveis essenciais para a aplicação, incluindo a malha 3D e a configuração da câmera.
 
         Esta função realiza as seguintes tarefas:
         1. Carrega a malha STL do arquivo especificado e armazena as informações necessárias para manipulação.
+        Quando `scene_paths` é informado, o tutorial não é exibido e as malhas são carregadas em uma cena (`self.scene`).
+        Quando `grid` é informado, a malha escolhida é replicada em uma grade por instanciamento (`self.scene`).
         2. Inicializa as configurações da câmera, incluindo vetores, matriz de transformação, 
         posição inicial e parâmetros adicionais.
 
         Variáveis inicializadas:
         ------------------------
-        - self.urso: Objeto da malha STL carregada.
-        - self.urso_vectors: Coordenadas dos vetores da malha STL.
+        - self.urso: Objeto da malha STL carregada (ou da nuvem de pontos PLY/XYZ/NPY).
+        - self.urso_vectors: Coordenadas dos vetores da malha STL (None para nuvens de pontos).
+        - self.scene: Cena com várias malhas (None quando uma única malha é carregada).
+        - self.mesh_data: Dados derivados da malha (`MeshData`), gravados em cache ao lado do arquivo STL (None para nuvens de pontos).
         - self.e1, self.e2, self.e3: Vetores base da câmera no espaço 3D.
         - self.Rx: Matriz de rotação no eixo X.
         - self.T: Matriz de transformação.
@@ -141,22 +247,47 @@ class MainWindow(QMainWindow, Plots, Camera, World, Intrinsic,Reset):
         """
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: set_variables")
-        self.log("Carregando tutorial...")
-        your_mesh=TutorialPopup()
-        self.log("Tutorial carregado com sucesso.")
-
-        self.log("Inicializando variaveis essenciais para a aplicacao...")
-        self.log("Carregando malha STL...")
-        self.log(f"Malha STL escolhida: {your_mesh}")
-
-        try: 
-            self.urso, self.urso_vectors = load_stl(your_mesh)
-            self.log("Malha STL carregada com sucesso.")
-        except Exception as e:
-            urso_mesh = './assets/stl/urso.STL'
-            QMessageBox.warning(self, "Erro", f" Voce não escolheu nenhuma malha e fechou o tutorial.arregando a malha padrão: {urso_mesh}", QMessageBox.Ok)
-            self.log(f"Voce fechou o tutorial, a malha carregada sera: {urso_mesh}")
-            self.urso, self.urso_vectors = load_stl(urso_mesh)
+        self.scene = None
+        if scene_paths:
+            self.log(f"Carregando cena com {len(scene_paths)} malhas: {scene_paths}")
+            self.scene = Scene.from_files(scene_paths)
+            self.urso, self.urso_vectors = self.scene.points, self.scene.vectors
+            self.mesh_path = list(scene_paths)
+            self.log("Cena carregada com sucesso.")
+        else:
+            self.log("Carregando tutorial...")
+            your_mesh=TutorialPopup()
+            self.log("Tutorial carregado com sucesso.")
+
+            self.log("Inicializando variaveis essenciais para a aplicacao...")
+            self.log("Carregando malha STL...")
+            self.log(f"Malha STL escolhida: {your_mesh}")
+            try: 
+                self.urso, self.urso_vectors = load_mesh(your_mesh)
+                self.mesh_path = your_mesh
+                self.log("Malha STL carregada com sucesso.")
+            except Exception as e:
+                urso_mesh = DEFAULT_MESH
+                QMessageBox.warning(self, "Erro", f" Voce não escolheu nenhuma malha e fechou o tutorial.arregando a malha padrão: {urso_mesh}", QMessageBox.Ok)
+                self.log(f"Voce fechou o tutorial, a malha carregada sera: {urso_mesh}")
+                self.urso, self.urso_vectors = load_mesh(urso_mesh)
+                self.mesh_path = urso_mesh
+
+            if grid and self.urso_vectors is not None:
+                self.log(f"Replicando a malha em uma grade {grid[0]}x{grid[1]}...")
+                # `self.urso_vectors` e `self.mesh_data` continuam sendo os da malha única: as instâncias são
+                # desenhadas a partir de `self.scene.transforms`, sem materializar as cópias
+                self.scene = InstancedMesh.grid(self.urso, self.urso_vectors, grid[0], grid[1])
+
+        # Dados derivados da malha (normais, arestas, vizinhanca, limites), calculados uma unica vez
+        self.mesh_data = None
+        if self.urso_vectors is not None:
+            self.log("Analisando a malha...")
+            if self.scene is None or isinstance(self.scene, InstancedMesh):
+                self.mesh_data = MeshData.from_file(self.mesh_path, self.urso_vectors)
+            else:
+                self.mesh_data = MeshData(self.urso_vectors)
+            self.log(f"Malha com {len(self.mesh_data.faces)} triangulos e {len(self.mesh_data.edges)} arestas.")
             
         self.log("Inicializando configuracoes da camera...")   
 
@@ -258,7 +389,34 @@ class MainWindow(QMainWindow, Plots, Camera, World, Intrinsic,Reset):
         reset_button.setStyleSheet(style_sheet)
         reset_button.clicked.connect(self.reset_canvas)
         reset_layout.addWidget(reset_button)
+
+        render_combo = QComboBox()
+        render_combo.addItems(list(RENDER_MODES))
+        render_combo.currentTextChanged.connect(self.change_render_mode)
+        reset_layout.addWidget(render_combo)
+
+        undo_button = QPushButton("Desfazer")
+        undo_button.clicked.connect(self.undo)
+        reset_layout.addWidget(undo_button)
+        redo_button = QPushButton("Refazer")
+        redo_button.clicked.connect(self.redo)
+        reset_layout.addWidget(redo_button)
+        preset_button = QPushButton("Carregar preset")
+        preset_button.clicked.connect(self.open_preset)
+        reset_layout.addWidget(preset_button)
+        rig_button = QPushButton("Adicionar ao rig")
+        rig_button.clicked.connect(self.add_camera_to_rig)
+        reset_layout.addWidget(rig_button)
+        open_rig_button = QPushButton("Carregar rig")
+        open_rig_button.clicked.connect(self.open_rig)
+        reset_layout.addWidget(open_rig_button)
+        triangulate_button = QPushButton("Triangular rig")
+        triangulate_button.clicked.connect(lambda: self.reconstruct_rig())
+        reset_layout.addWidget(triangulate_button)
+        QShortcut(QKeySequence.Undo, self, activated=self.undo)
+        QShortcut(QKeySequence.Redo, self, activated=self.redo)
         grid_layout.addWidget(reset_widget, 2, 0, 1, 3)
+        grid_layout.addWidget(self.create_bookmark_widget("Vistas Salvas"), 3, 0, 1, 3)
         self.log("Botao de reset configurado com sucesso.")
 
         central_widget = QWidget()
@@ -268,9 +426,39 @@ class MainWindow(QMainWindow, Plots, Camera, World, Intrinsic,Reset):
         self.log("Saindo da funcao InterfaceUI.")
         self.log("-----------------------------------------")
 
+    def change_render_mode(self, text):
+        """
+        Troca o modo de desenho da imagem 2D (wireframe, silhueta, ...) e redesenha apenas a imagem 2D.
+        """
+        self.render_mode = RENDER_MODES[text]
+        self.log(f"Modo de desenho: {self.render_mode}")
+        self.request_render()
+
+    def closeEvent(self, event):
+        """
+        Salva a sessão gravada (quando a gravação está ativa) antes de fechar a janela.
+        """
+        if self.recorder is not None:
+            self.recorder.save(self.record_path)
+            self.log(f"Sessao gravada em: {self.record_path}")
+        super().closeEvent(event)
+
 
 if __name__=="__main__":
-    app = QApplication(sys.argv)
-    main_window = MainWindow()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--record", help="Grava as alteracoes de parametros da sessao neste arquivo JSON.")
+    parser.add_argument("--scene", nargs="+", help="Carrega varias malhas lado a lado em uma unica cena.")
+    parser.add_argument("--grid", nargs=2, type=int, metavar=("NX", "NY"), help="Replica a malha escolhida em uma grade NX x NY.")
+    parser.add_argument("--autoframe", action="store_true", help="Posiciona a camera para enquadrar o objeto carregado.")
+    parser.add_argument("--bookmarks", help="Arquivo .npz das vistas salvas (padrao: ao lado da malha).")
+    parser.add_argument("--preset", help="Aplica um preset (.json ou .toml) de camera e pose ao abrir.")
+    parser.add_argument("--preset-view", help="Vista do preset a aplicar (padrao: a primeira).")
+    parser.add_argument("--rig", help="Preset (.json ou .toml) cujas vistas formam um rig de cameras exibido lado a lado.")
+    args, qt_args = parser.parse_known_args()
+
+    app = QApplication(sys.argv[:1] + qt_args)
+    main_window = MainWindow(record_path=args.record, scene_paths=args.scene, grid=args.grid, autoframe=args.autoframe,
+                             bookmarks_file=args.bookmarks, preset=args.preset, preset_view=args.preset_view,
+                             rig=args.rig)
     main_window.show()
     sys.exit(app.exec_())
\ No newline at end of file
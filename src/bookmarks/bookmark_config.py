@@ -0,0 +1,142 @@
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QIcon, QImage, QPixmap
+from PyQt5.QtWidgets import QGroupBox, QHBoxLayout, QInputDialog, QMessageBox, QPushButton, QToolButton
+
+from src.bookmarks.bookmarks import Bookmark, BookmarkStore, cloud_thumbnail, mesh_fingerprint, points_thumbnail
+from src.utils.projection import project_view
+from src.utils.projection_cache import projection_key
+
+
+def thumbnail_icon(thumbnail):
+    """
+    Converte uma miniatura uint8 (altura x largura) em um `QIcon`.
+    """
+    height, width = thumbnail.shape
+    image = QImage(thumbnail.tobytes(), width, height, width, QImage.Format_Grayscale8)
+    return QIcon(QPixmap.fromImage(image.copy()))
+
+
+class Bookmarks:
+    def create_bookmark_widget(self, title):
+        """
+        Cria a barra de favoritos: uma miniatura por vista salva e o botão "Salvar vista".
+
+        Os favoritos são carregados de `self.bookmarks_path` (quando houver) e exibidos pelas miniaturas gravadas,
+        sem projetar a malha de novo.
+
+        Parâmetros:
+        -----------
+        - `title` (str): Título do grupo de widgets.
+
+        Retorna:
+        --------
+        - `QGroupBox` com a barra de favoritos.
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: create_bookmark_widget")
+        self.bookmarks = BookmarkStore.load(self.bookmarks_path)
+        self.log(f"Favoritos carregados: {len(self.bookmarks)}")
+
+        bookmark_widget = QGroupBox(title)
+        layout = QHBoxLayout()
+        bookmark_widget.setLayout(layout)
+        self.bookmark_strip = QHBoxLayout()
+        layout.addLayout(self.bookmark_strip)
+        layout.addStretch()
+        save_button = QPushButton("Salvar vista")
+        save_button.clicked.connect(self.ask_bookmark_name)
+        layout.addWidget(save_button)
+
+        self.refresh_bookmark_strip()
+        self.log("Saindo da funcao create_bookmark_widget")
+        self.log("-----------------------------------------")
+        return bookmark_widget
+
+    def refresh_bookmark_strip(self):
+        """
+        Recria os botões da barra de favoritos a partir das miniaturas (nenhuma projeção é feita).
+        """
+        while self.bookmark_strip.count():
+            widget = self.bookmark_strip.takeAt(0).widget()
+            if widget is not None:
+                widget.deleteLater()
+        for bookmark in self.bookmarks:
+            button = QToolButton()
+            button.setText(bookmark.name)
+            button.setIcon(thumbnail_icon(bookmark.thumbnail))
+            button.setIconSize(QSize(*bookmark.thumbnail.shape[::-1]))
+            button.setToolButtonStyle(Qt.ToolButtonTextUnderIcon)
+            button.clicked.connect(lambda checked=False, name=bookmark.name: self.go_to_bookmark(name))
+            self.bookmark_strip.addWidget(button)
+
+    def ask_bookmark_name(self):
+        name, ok = QInputDialog.getText(self, "Salvar vista", "Nome da vista:", text=f"Vista {len(self.bookmarks) + 1}")
+        if ok and name.strip():
+            self.add_bookmark(name.strip())
+
+    def add_bookmark(self, name):
+        """
+        Salva a vista atual (pose absoluta e parâmetros intrínsecos) como favorito e grava o arquivo de favoritos.
+
+        A projeção da vista é calculada uma única vez (ou reaproveitada do cache de projeções) e guardada junto com
+        uma miniatura, para que voltar à vista e exibir a barra de favoritos não exijam projetar a malha de novo.
+
+        Parâmetros:
+        -----------
+        - `name` (str): Nome do favorito.
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: add_bookmark")
+        width = self.params_intrinsc_values["n_pixels_base:"]
+        height = self.params_intrinsc_values["n_pixels_altura:"]
+        if self.urso_vectors is None:
+            projection = fingerprint = None
+            thumbnail = cloud_thumbnail(self.urso, self.cam, self.params_intrinsc_values)
+        else:
+            mesh = self.scene if self.scene is not None else self.urso
+            key = projection_key("wireframe", mesh, self.cam, self.params_intrinsc_values)
+            cached = self.projection_cache.get(key)
+            projection = cached[0] if cached is not None else project_view(mesh, self.cam, self.params_intrinsc_values)[0]
+            thumbnail = points_thumbnail(projection, width, height)
+            fingerprint = mesh_fingerprint(mesh)
+        self.bookmarks.add(Bookmark(name, self.cam.copy(), self.params_intrinsc_values, projection, thumbnail,
+                                    fingerprint))
+        if self.bookmarks_path:
+            self.bookmarks.save(self.bookmarks_path)
+            self.log(f"Favoritos gravados em: {self.bookmarks_path}")
+        self.refresh_bookmark_strip()
+        self.log(f"Vista '{name}' salva.")
+        self.log("Saindo da funcao add_bookmark")
+        self.log("-----------------------------------------")
+
+    def go_to_bookmark(self, name):
+        """
+        Vai para uma vista salva.
+
+        A projeção guardada no favorito é colocada no cache de projeções antes do desenho, de modo que a imagem 2D
+        é trocada sem projetar a malha. Se a geometria mudou desde que a vista foi salva (malha alterada no disco,
+        objetos da cena movidos), a projeção guardada é descartada e a vista é projetada de novo. A mudança passa
+        por `restore_state`, então pode ser desfeita.
+
+        Parâmetros:
+        -----------
+        - `name` (str): Nome do favorito.
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: go_to_bookmark")
+        bookmark = self.bookmarks.get(name)
+        if bookmark is None:
+            QMessageBox.warning(self, "Erro", f"Vista nao encontrada: {name}")
+            return
+        projection = bookmark.projection
+        if projection is not None and self.urso_vectors is not None:
+            mesh = self.scene if self.scene is not None else self.urso
+            if bookmark.fingerprint is not None and bookmark.fingerprint == mesh_fingerprint(mesh):
+                key = projection_key("wireframe", mesh, bookmark.cam, bookmark.params(self.params_intrinsc_values))
+                self.projection_cache.put(key, (projection, True))
+            else:
+                self.log("Geometria alterada desde que a vista foi salva; projetando de novo.")
+        self.restore_state(bookmark.cam.copy(), bookmark.intrinsics)
+        self.log(f"Vista '{name}' restaurada.")
+        self.log("Saindo da funcao go_to_bookmark")
+        self.log("-----------------------------------------")
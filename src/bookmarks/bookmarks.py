@@ -0,0 +1,191 @@
+import hashlib
+import os
+
+import numpy as np
+
+from src.history.pose_history import HISTORY_KEYS
+from src.utils.projection import density_image, derive_intrinsics, intrinsic_matrix, projection_matrix
+
+# Arquivo de favoritos gravado ao lado da malha
+BOOKMARK_SUFFIX = ".bookmarks.npz"
+
+# Tamanho (largura, altura) das miniaturas, na proporção da imagem padrão (1050x700)
+THUMBNAIL_SIZE = (96, 64)
+
+
+def bookmarks_path(mesh_path):
+    """
+    Caminho do arquivo de favoritos de uma malha (None para cenas com várias malhas).
+    """
+    if not isinstance(mesh_path, str):
+        return None
+    return mesh_path + BOOKMARK_SUFFIX
+
+
+def mesh_fingerprint(mesh):
+    """
+    Identifica a geometria projetada por uma vista: número de vértices e hash dos vértices no referencial do mundo
+    (e das transformações das instâncias), para detectar malhas alteradas ou objetos movidos na cena.
+
+    Parâmetros:
+        mesh: Matriz 4xN, `Scene` ou `InstancedMesh`.
+
+    Retorna:
+        fingerprint (str): "<vértices>:<hash>".
+    """
+    points = mesh if isinstance(mesh, np.ndarray) else mesh.points
+    digest = hashlib.blake2b(np.ascontiguousarray(points, dtype=float).tobytes(), digest_size=16)
+    transforms = getattr(mesh, "transforms", None)
+    if transforms is not None:
+        digest.update(np.ascontiguousarray(transforms, dtype=float).tobytes())
+    return f"{points.shape[1]}:{digest.hexdigest()}"
+
+
+def to_thumbnail(counts):
+    """
+    Converte uma contagem de pontos por pixel em uma miniatura em tons de cinza (uint8, escala logarítmica).
+    """
+    image = np.log1p(counts.astype(float))
+    peak = image.max()
+    if peak > 0:
+        image *= 255/peak
+    return image.astype(np.uint8)
+
+
+def points_thumbnail(points_2d, width, height, size=THUMBNAIL_SIZE):
+    """
+    Rasteriza pontos já projetados (em pixels da imagem `width x height`) em uma miniatura.
+
+    Parâmetros:
+        points_2d (numpy.ndarray): Coordenadas 2xN ou 3xN (u, v, ...); colunas NaN são ignoradas.
+        width, height (float): Dimensões da imagem de origem em pixels.
+        size (tuple): Dimensões (largura, altura) da miniatura.
+
+    Retorna:
+        thumbnail (numpy.ndarray): Imagem uint8 (altura x largura).
+    """
+    tw, th = size
+    with np.errstate(invalid="ignore"):
+        u = np.floor(points_2d[0]*tw/width)
+        v = np.floor(points_2d[1]*th/height)
+        inside = (u >= 0) & (u < tw) & (v >= 0) & (v < th)
+    pixels = v[inside].astype(np.int64)*tw + u[inside].astype(np.int64)
+    return to_thumbnail(np.bincount(pixels, minlength=tw*th).reshape(th, tw))
+
+
+def cloud_thumbnail(points, cam, params, size=THUMBNAIL_SIZE):
+    """
+    Miniatura de uma nuvem de pontos: a imagem de densidade é acumulada direto na resolução da miniatura
+    (matriz de projeção reescalada), sem projetar a nuvem na resolução cheia.
+    """
+    tw, th = size
+    scale = np.diag([tw/params["n_pixels_base:"], th/params["n_pixels_altura:"], 1.0])
+    P = np.dot(scale, projection_matrix(cam, intrinsic_matrix(params)))
+    return to_thumbnail(density_image(P, points, tw, th))
+
+
+class Bookmark:
+    """
+    Vista salva: pose absoluta da câmera, parâmetros intrínsecos, projeção pré-calculada e miniatura.
+
+    Atributos:
+        name (str): Nome exibido na barra de favoritos.
+        cam (numpy.ndarray): Pose 4x4 da câmera.
+        intrinsics (dict): Parâmetros intrínsecos editáveis (`HISTORY_KEYS`).
+        projection (numpy.ndarray): Resultado de `project_view` para a vista (None para nuvens de pontos).
+        thumbnail (numpy.ndarray): Miniatura uint8 (altura x largura).
+        fingerprint (str): `mesh_fingerprint` da geometria projetada (None quando não há projeção).
+    """
+
+    def __init__(self, name, cam, intrinsics, projection=None, thumbnail=None, fingerprint=None):
+        self.name = name
+        self.cam = np.asarray(cam, dtype=float)
+        self.intrinsics = {key: float(intrinsics[key]) for key in HISTORY_KEYS if key in intrinsics}
+        self.projection = projection
+        self.thumbnail = thumbnail
+        self.fingerprint = fingerprint
+
+    def params(self, base=None):
+        """
+        Parâmetros intrínsecos completos da vista (com sx, sy, ox e oy), partindo de `base` quando informado.
+        """
+        params = dict(base or {})
+        params.update(self.intrinsics)
+        return derive_intrinsics(params)
+
+
+class BookmarkStore:
+    """
+    Conjunto ordenado de favoritos, gravado em um único arquivo `.npz`.
+
+    Atributos:
+        bookmarks (list): Favoritos na ordem em que foram criados.
+    """
+
+    def __init__(self, bookmarks=None):
+        self.bookmarks = list(bookmarks or [])
+
+    def __len__(self):
+        return len(self.bookmarks)
+
+    def __iter__(self):
+        return iter(self.bookmarks)
+
+    def get(self, name):
+        for bookmark in self.bookmarks:
+            if bookmark.name == name:
+                return bookmark
+        return None
+
+    def add(self, bookmark):
+        """
+        Adiciona um favorito (substitui o que tiver o mesmo nome, mantendo a posição).
+        """
+        for i, existing in enumerate(self.bookmarks):
+            if existing.name == bookmark.name:
+                self.bookmarks[i] = bookmark
+                return
+        self.bookmarks.append(bookmark)
+
+    def remove(self, name):
+        self.bookmarks = [bookmark for bookmark in self.bookmarks if bookmark.name != name]
+
+    def save(self, filepath):
+        """
+        Grava os favoritos em um arquivo `.npz` (poses, parâmetros, miniaturas, projeções e suas geometrias).
+
+        Parâmetros:
+            filepath (str): Caminho do arquivo de saída.
+        """
+        arrays = {
+            "names": np.array([bookmark.name for bookmark in self.bookmarks], dtype=str),
+            "cams": np.array([bookmark.cam for bookmark in self.bookmarks]).reshape(-1, 4, 4),
+            "intrinsics": np.array([[bookmark.intrinsics.get(key, 0.0) for key in HISTORY_KEYS]
+                                    for bookmark in self.bookmarks]).reshape(-1, len(HISTORY_KEYS)),
+            "thumbnails": np.array([bookmark.thumbnail for bookmark in self.bookmarks], dtype=np.uint8)
+                            .reshape(-1, THUMBNAIL_SIZE[1], THUMBNAIL_SIZE[0]),
+        }
+        for i, bookmark in enumerate(self.bookmarks):
+            if bookmark.projection is not None:
+                arrays[f"projection_{i}"] = bookmark.projection
+            if bookmark.fingerprint is not None:
+                arrays[f"fingerprint_{i}"] = np.array(bookmark.fingerprint)
+        with open(filepath, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, filepath):
+        """
+        Carrega os favoritos gravados por `save` (conjunto vazio se o arquivo não existir).
+        """
+        if not filepath or not os.path.exists(filepath):
+            return cls()
+        with np.load(filepath) as data:
+            bookmarks = []
+            for i, name in enumerate(data["names"]):
+                intrinsics = dict(zip(HISTORY_KEYS, data["intrinsics"][i]))
+                projection = data[f"projection_{i}"] if f"projection_{i}" in data.files else None
+                fingerprint = str(data[f"fingerprint_{i}"]) if f"fingerprint_{i}" in data.files else None
+                bookmarks.append(Bookmark(str(name), data["cams"][i], intrinsics, projection, data["thumbnails"][i],
+                                          fingerprint))
+        return cls(bookmarks)
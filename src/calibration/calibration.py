@@ -0,0 +1,280 @@
+import numpy as np
+
+from src.utils.geometry import pose_to_cam, rodrigues, skew
+from src.utils.projection import derive_intrinsics, validate_intrinsics
+
+
+def batched(points_3d, points_2d):
+    """
+    Garante o formato em lote (B, N, 3) e (B, N, 2) e indica se a entrada era um único problema.
+    """
+    points_3d = np.asarray(points_3d, dtype=float)
+    points_2d = np.asarray(points_2d, dtype=float)
+    single = points_3d.ndim == 2
+    if single:
+        points_3d, points_2d = points_3d[None], points_2d[None]
+    return points_3d, points_2d, single
+
+
+def hartley_normalization(points):
+    """
+    Calcula a normalização de Hartley (centróide na origem, distância média sqrt(d)) em lote.
+
+    Parâmetros:
+        points (numpy.ndarray): Pontos (B, N, d).
+
+    Retorna:
+        T (numpy.ndarray): Matrizes de normalização (B, d+1, d+1).
+        normalized (numpy.ndarray): Pontos homogêneos normalizados (B, N, d+1).
+    """
+    B, N, d = points.shape
+    centroid = points.mean(axis=1)
+    distance = np.linalg.norm(points - centroid[:, None], axis=-1).mean(axis=1)
+    scale = np.sqrt(d)/distance
+    T = np.zeros((B, d + 1, d + 1))
+    T[:, np.arange(d), np.arange(d)] = scale[:, None]
+    T[:, :d, d] = -scale[:, None]*centroid
+    T[:, d, d] = 1
+    homogeneous = np.concatenate((points, np.ones((B, N, 1))), axis=-1)
+    return T, np.einsum('bij,bnj->bni', T, homogeneous)
+
+
+def dlt(points_3d, points_2d):
+    """
+    Estima a matriz de projeção P (3x4) pelo DLT linear normalizado, para vários problemas de uma vez.
+
+    São necessárias pelo menos 6 correspondências não coplanares por problema.
+
+    Parâmetros:
+        points_3d (numpy.ndarray): Pontos do mundo (B, N, 3) ou (N, 3).
+        points_2d (numpy.ndarray): Pixels observados (B, N, 2) ou (N, 2).
+
+    Retorna:
+        P (numpy.ndarray): Matrizes de projeção (B, 3, 4) ou (3, 4).
+    """
+    points_3d, points_2d, single = batched(points_3d, points_2d)
+    B, N, _ = points_3d.shape
+    T3, X = hartley_normalization(points_3d)
+    T2, x = hartley_normalization(points_2d)
+
+    A = np.zeros((B, 2*N, 12))
+    A[:, 0::2, 0:4] = X
+    A[:, 0::2, 8:12] = -x[..., 0:1]*X
+    A[:, 1::2, 4:8] = X
+    A[:, 1::2, 8:12] = -x[..., 1:2]*X
+    _, _, Vh = np.linalg.svd(A, full_matrices=False)
+    Pn = Vh[:, -1].reshape(B, 3, 4)
+
+    P = np.matmul(np.linalg.inv(T2), np.matmul(Pn, T3))
+    return P[0] if single else P
+
+
+def rq(M):
+    """
+    Decomposição RQ em lote (M = K R, com K triangular superior e R ortogonal).
+    """
+    Q, R = np.linalg.qr(np.swapaxes(M[..., ::-1, :], -1, -2))
+    K = np.swapaxes(R, -1, -2)[..., ::-1, ::-1]
+    Rot = np.swapaxes(Q, -1, -2)[..., ::-1, :]
+    return K, Rot
+
+
+def decompose_projection(P):
+    """
+    Separa matrizes de projeção P = K [R | t] em intrínsecos e pose (em lote).
+
+    Parâmetros:
+        P (numpy.ndarray): Matrizes de projeção (B, 3, 4) ou (3, 4).
+
+    Retorna:
+        K (numpy.ndarray): Matrizes intrínsecas com K[2, 2] = 1.
+        R (numpy.ndarray): Rotações (det = +1).
+        t (numpy.ndarray): Translações, com X_cam = R X + t.
+    """
+    P = np.asarray(P, dtype=float)
+    single = P.ndim == 2
+    if single:
+        P = P[None]
+    # Escala positiva: det(M) > 0 garante K com diagonal positiva e R própria
+    P = P*np.sign(np.linalg.det(P[:, :, :3]))[:, None, None]
+    K, R = rq(P[:, :, :3])
+    D = np.sign(np.diagonal(K, axis1=1, axis2=2))
+    K = K*D[:, None, :]
+    R = R*D[:, :, None]
+    t = np.linalg.solve(K, P[:, :, 3:])[..., 0]
+    K = K/K[:, 2:3, 2:3]
+    if single:
+        return K[0], R[0], t[0]
+    return K, R, t
+
+
+def reprojection_residuals(K, R, t, points_3d, points_2d):
+    """
+    Resíduos de reprojeção (pixel projetado - pixel observado) em lote.
+
+    Retorna:
+        residuals (numpy.ndarray): Resíduos (B, N, 2).
+        Xc (numpy.ndarray): Pontos no referencial da câmera (B, N, 3).
+    """
+    Xc = np.einsum('bij,bnj->bni', R, points_3d) + t[:, None]
+    xn = Xc[..., 0]/Xc[..., 2]
+    yn = Xc[..., 1]/Xc[..., 2]
+    u = K[:, 0, 0, None]*xn + K[:, 0, 1, None]*yn + K[:, 0, 2, None]
+    v = K[:, 1, 1, None]*yn + K[:, 1, 2, None]
+    return np.stack((u, v), axis=-1) - points_2d, Xc
+
+
+def jacobian(K, t, Xc):
+    """
+    Jacobiano analítico dos pixels em relação aos 11 parâmetros (fx, fy, s, cx, cy, ω, t), em lote.
+
+    A rotação é atualizada por uma perturbação à esquerda R <- exp([ω]x) R, cuja derivada em ω = 0 é
+    d(Xc)/dω = -[R X]x.
+
+    Retorna:
+        J (numpy.ndarray): Jacobiano (B, N, 2, 11).
+    """
+    B, N, _ = Xc.shape
+    a, b, c = Xc[..., 0], Xc[..., 1], Xc[..., 2]
+    fx, fy, s = K[:, 0, 0, None], K[:, 1, 1, None], K[:, 0, 1, None]
+    xn, yn = a/c, b/c
+
+    J = np.zeros((B, N, 2, 11))
+    J[..., 0, 0] = xn
+    J[..., 1, 1] = yn
+    J[..., 0, 2] = yn
+    J[..., 0, 3] = 1
+    J[..., 1, 4] = 1
+
+    dpix = np.zeros((B, N, 2, 3))
+    dpix[..., 0, 0] = fx/c
+    dpix[..., 0, 1] = s/c
+    dpix[..., 0, 2] = -(fx*a + s*b)/c**2
+    dpix[..., 1, 1] = fy/c
+    dpix[..., 1, 2] = -fy*b/c**2
+    J[..., 5:8] = -np.matmul(dpix, skew(Xc - t[:, None]))
+    J[..., 8:11] = dpix
+    return J
+
+
+def apply_update(K, R, t, delta):
+    """
+    Aplica um passo (B, 11) aos parâmetros (fx, fy, s, cx, cy, ω, t).
+    """
+    K = K.copy()
+    K[:, 0, 0] += delta[:, 0]
+    K[:, 1, 1] += delta[:, 1]
+    K[:, 0, 1] += delta[:, 2]
+    K[:, 0, 2] += delta[:, 3]
+    K[:, 1, 2] += delta[:, 4]
+    R = np.matmul(rodrigues(delta[:, 5:8]), R)
+    return K, R, t + delta[:, 8:11]
+
+
+def levenberg_marquardt(K, R, t, points_3d, points_2d, iterations=20, damping=1e-3, fixed_intrinsics=False):
+    """
+    Refina intrínsecos e pose por Levenberg–Marquardt com Jacobiano analítico, vetorizado sobre o lote.
+
+    Cada problema tem seu próprio fator de amortecimento; passos que não reduzem o erro são rejeitados apenas
+    nos problemas em que isso acontece.
+
+    Parâmetros:
+        K, R, t (numpy.ndarray): Estimativa inicial (B, 3, 3), (B, 3, 3) e (B, 3).
+        points_3d (numpy.ndarray): Pontos do mundo (B, N, 3).
+        points_2d (numpy.ndarray): Pixels observados (B, N, 2).
+        iterations (int): Número de iterações.
+        damping (float): Fator de amortecimento inicial.
+        fixed_intrinsics (bool): Se True, refina apenas a pose (usado na estimação de pose, PnP).
+
+    Retorna:
+        K, R, t (numpy.ndarray): Parâmetros refinados.
+        cost (numpy.ndarray): Soma dos quadrados dos resíduos de cada problema (B,).
+    """
+    B = K.shape[0]
+    first = 5 if fixed_intrinsics else 0
+    residuals, Xc = reprojection_residuals(K, R, t, points_3d, points_2d)
+    cost = np.sum(residuals**2, axis=(1, 2))
+    lam = np.full(B, damping)
+    for _ in range(iterations):
+        J = jacobian(K, t, Xc)[..., first:]
+        JtJ = np.einsum('bnki,bnkj->bij', J, J)
+        g = np.einsum('bnki,bnk->bi', J, residuals)
+        diagonal = np.diagonal(JtJ, axis1=1, axis2=2)
+        A = JtJ + (lam[:, None]*diagonal)[:, :, None]*np.eye(J.shape[-1])
+        step = -np.linalg.solve(A, g[..., None])[..., 0]
+
+        delta = np.zeros((B, 11))
+        delta[:, first:] = step
+        K_new, R_new, t_new = apply_update(K, R, t, delta)
+        residuals_new, Xc_new = reprojection_residuals(K_new, R_new, t_new, points_3d, points_2d)
+        cost_new = np.sum(residuals_new**2, axis=(1, 2))
+
+        better = cost_new < cost
+        K = np.where(better[:, None, None], K_new, K)
+        R = np.where(better[:, None, None], R_new, R)
+        t = np.where(better[:, None], t_new, t)
+        residuals = np.where(better[:, None, None], residuals_new, residuals)
+        Xc = np.where(better[:, None, None], Xc_new, Xc)
+        cost = np.where(better, cost_new, cost)
+        lam = np.where(better, lam*0.1, lam*10)
+    return K, R, t, cost
+
+
+def calibrate(points_3d, points_2d, iterations=20):
+    """
+    Estima intrínsecos (K) e pose da câmera a partir de correspondências 3D-2D: DLT linear seguido de
+    refinamento por Levenberg–Marquardt. Aceita um problema (N, 3)/(N, 2) ou um lote (B, N, 3)/(B, N, 2).
+
+    Parâmetros:
+        points_3d (numpy.ndarray): Pontos do mundo (por exemplo, vértices escolhidos da malha STL).
+        points_2d (numpy.ndarray): Pixels correspondentes na imagem.
+        iterations (int): Número de iterações do refinamento.
+
+    Retorna:
+        result (dict):
+            - "K": Matriz intrínseca 3x3 (no mesmo formato usado por `plot2d`).
+            - "cam": Pose da câmera 4x4 no formato de `self.cam`.
+            - "R", "t": Pose extrínseca (X_cam = R X + t).
+            - "rms": Erro RMS de reprojeção, em pixels.
+    """
+    points_3d, points_2d, single = batched(points_3d, points_2d)
+    K, R, t = decompose_projection(dlt(points_3d, points_2d))
+    K, R, t, cost = levenberg_marquardt(K, R, t, points_3d, points_2d, iterations=iterations)
+    rms = np.sqrt(cost/points_3d.shape[1])
+    result = {"K": K, "cam": pose_to_cam(R, t), "R": R, "t": t, "rms": rms}
+    if single:
+        result = {key: value[0] for key, value in result.items()}
+    return result
+
+
+def params_from_K(K, params):
+    """
+    Converte uma matriz K estimada para os campos editáveis de `params_intrinsc_values`.
+
+    `sx` vem da resolução e do sensor e é mantido: a distância focal reproduz K[0, 0], `s_theta` reproduz K[0, 1]
+    e K[1, 1] é expresso pelo tamanho vertical do sensor (`ccd_y = n_pixels_altura · dist_focal / K[1, 1]`), de modo
+    que o resultado sobrevive a `derive_intrinsics`. O ponto principal do modelo é sempre o centro da imagem, então
+    o deslocamento de K em relação a ele não é representável e é devolvido à parte. Resultados fora de
+    `INTRINSIC_LIMITS` levantam ValueError, como em `preset_intrinsics`.
+
+    Parâmetros:
+        K (numpy.ndarray): Matriz intrínseca 3x3.
+        params (dict): Parâmetros intrínsecos atuais (precisa da resolução e do sensor).
+
+    Retorna:
+        params (dict): Cópia de `params` com `dist_focal:`, `s_theta:` e `ccd_y:` ajustados (e sx, sy, ox, oy
+        recalculados).
+        offset (numpy.ndarray): Ponto principal de K menos o centro da imagem (pixels), ignorado em `params`.
+    """
+    params = derive_intrinsics(dict(params))
+    dist_focal = K[0, 0]/params["sx:"]
+    params["dist_focal:"] = dist_focal
+    params["s_theta:"] = K[0, 1]/dist_focal
+    params["ccd_y:"] = params["n_pixels_altura:"]*dist_focal/K[1, 1]
+    invalid_fields = validate_intrinsics(params)
+    if invalid_fields:
+        raise ValueError("A matriz K estimada fica fora dos limites dos parametros intrinsecos:\n\n"
+                         + "\n".join(invalid_fields))
+    params = derive_intrinsics(params)
+    offset = np.array([K[0, 2] - params["ox:"], K[1, 2] - params["oy:"]])
+    return params, offset
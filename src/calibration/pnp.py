@@ -0,0 +1,151 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.calibration.calibration import dlt, levenberg_marquardt
+from src.utils.geometry import pose_to_cam
+
+
+def normalize_pixels(K, points_2d):
+    """
+    Leva pixels (F, N, 2) para coordenadas normalizadas da câmera com inv(K).
+    """
+    Kinv = np.linalg.inv(K)
+    return points_2d @ Kinv[:2, :2].T + Kinv[:2, 2]
+
+
+def pnp_linear(K, points_3d, points_2d):
+    """
+    Estimativa linear da pose com K conhecida (DLT nos pixels normalizados + projeção em SO(3)), em lote.
+
+    Parâmetros:
+        K (numpy.ndarray): Matriz intrínseca 3x3 (compartilhada por todos os quadros).
+        points_3d (numpy.ndarray): Pontos do mundo (F, N, 3).
+        points_2d (numpy.ndarray): Pixels observados (F, N, 2).
+
+    Retorna:
+        R (numpy.ndarray): Rotações (F, 3, 3).
+        t (numpy.ndarray): Translações (F, 3), com X_cam = R X + t.
+    """
+    P = dlt(points_3d, normalize_pixels(K, points_2d))
+    P = P*np.sign(np.linalg.det(P[:, :, :3]))[:, None, None]
+    U, S, Vt = np.linalg.svd(P[:, :, :3])
+    R = np.matmul(U, Vt)
+    t = P[:, :, 3]/S.mean(axis=1)[:, None]
+    return R, t
+
+
+def solve_pnp(K, points_3d, points_2d, R0=None, t0=None, iterations=10):
+    """
+    Estima a pose da câmera de vários quadros de uma vez (K conhecida).
+
+    Sem estimativa inicial, usa `pnp_linear`; em seguida refina com Levenberg–Marquardt só na pose.
+
+    Parâmetros:
+        K (numpy.ndarray): Matriz intrínseca 3x3.
+        points_3d (numpy.ndarray): Pontos do mundo (F, N, 3).
+        points_2d (numpy.ndarray): Pixels observados (F, N, 2).
+        R0, t0 (numpy.ndarray): Estimativa inicial (F, 3, 3) e (F, 3), opcional.
+        iterations (int): Número de iterações do refinamento.
+
+    Retorna:
+        R, t (numpy.ndarray): Poses (F, 3, 3) e (F, 3).
+        rms (numpy.ndarray): Erro RMS de reprojeção de cada quadro, em pixels.
+    """
+    F, N, _ = points_2d.shape
+    if R0 is None:
+        R0, t0 = pnp_linear(K, points_3d, points_2d)
+    Kb = np.broadcast_to(K, (F, 3, 3)).astype(float)
+    _, R, t, cost = levenberg_marquardt(Kb, R0, t0, points_3d, points_2d, iterations=iterations, fixed_intrinsics=True)
+    return R, t, np.sqrt(cost/N)
+
+
+def track_segment(K, points_3d, points_2d, chunk_size=256, iterations=10, max_rms=2.0):
+    """
+    Rastreia a pose ao longo de uma sequência de quadros, em blocos vetorizados.
+
+    Cada bloco parte da última pose resolvida no bloco anterior (partida a quente); o primeiro bloco parte da
+    estimativa linear. Quadros cujo erro ainda fica acima de `max_rms` são resolvidos de novo a partir da
+    estimativa linear.
+
+    Parâmetros:
+        K (numpy.ndarray): Matriz intrínseca 3x3.
+        points_3d (numpy.ndarray): Pontos da malha (N, 3), compartilhados por todos os quadros, ou (F, N, 3).
+        points_2d (numpy.ndarray): Pixels observados (F, N, 2).
+        chunk_size (int): Número de quadros resolvidos juntos.
+        iterations (int): Número de iterações do refinamento por bloco.
+        max_rms (float): Erro (em pixels) acima do qual o quadro é reinicializado pela estimativa linear.
+
+    Retorna:
+        R, t (numpy.ndarray): Poses (F, 3, 3) e (F, 3).
+        rms (numpy.ndarray): Erro RMS de reprojeção de cada quadro.
+    """
+    points_2d = np.asarray(points_2d, dtype=float)
+    F, N, _ = points_2d.shape
+    points_3d = np.asarray(points_3d, dtype=float)
+    if points_3d.ndim == 2:
+        points_3d = np.broadcast_to(points_3d, (F, N, 3))
+
+    R = np.empty((F, 3, 3))
+    t = np.empty((F, 3))
+    rms = np.empty(F)
+    previous = None
+    for start in range(0, F, chunk_size):
+        frames = slice(start, min(start + chunk_size, F))
+        X, x = points_3d[frames], points_2d[frames]
+        n = x.shape[0]
+        if previous is None:
+            R_chunk, t_chunk, rms_chunk = solve_pnp(K, X, x, iterations=iterations)
+        else:
+            R0 = np.broadcast_to(previous[0], (n, 3, 3)).copy()
+            t0 = np.broadcast_to(previous[1], (n, 3)).copy()
+            R_chunk, t_chunk, rms_chunk = solve_pnp(K, X, x, R0, t0, iterations=iterations)
+
+        lost = rms_chunk > max_rms
+        if np.any(lost):
+            R_lost, t_lost, rms_lost = solve_pnp(K, X[lost], x[lost], iterations=iterations)
+            R_chunk[lost], t_chunk[lost], rms_chunk[lost] = R_lost, t_lost, rms_lost
+
+        R[frames], t[frames], rms[frames] = R_chunk, t_chunk, rms_chunk
+        previous = (R_chunk[-1], t_chunk[-1])
+    return R, t, rms
+
+
+def track_sequence(K, points_3d, points_2d, chunk_size=256, iterations=10, max_rms=2.0, processes=None):
+    """
+    Estima a pose (no formato de `self.cam`) de cada quadro de uma sequência contra uma malha conhecida.
+
+    Com `processes`, a sequência é dividida em trechos contíguos resolvidos em paralelo por um pool de processos
+    (cada trecho com sua própria partida a quente).
+
+    Parâmetros:
+        K (numpy.ndarray): Matriz intrínseca 3x3.
+        points_3d (numpy.ndarray): Pontos da malha (N, 3) ou (F, N, 3).
+        points_2d (numpy.ndarray): Pixels observados (F, N, 2).
+        chunk_size (int): Número de quadros resolvidos juntos.
+        iterations (int): Número de iterações do refinamento por bloco.
+        max_rms (float): Erro acima do qual o quadro é reinicializado.
+        processes (int): Número de processos (None ou 1 para resolver no processo atual).
+
+    Retorna:
+        cams (numpy.ndarray): Poses da câmera (F, 4, 4), no formato de `self.cam`.
+        rms (numpy.ndarray): Erro RMS de reprojeção de cada quadro, em pixels.
+    """
+    points_2d = np.asarray(points_2d, dtype=float)
+    F = points_2d.shape[0]
+    if not processes or processes == 1:
+        R, t, rms = track_segment(K, points_3d, points_2d, chunk_size, iterations, max_rms)
+        return pose_to_cam(R, t), rms
+
+    bounds = np.linspace(0, F, processes + 1).astype(int)
+    points_3d = np.asarray(points_3d, dtype=float)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = []
+        for a, b in zip(bounds[:-1], bounds[1:]):
+            X = points_3d if points_3d.ndim == 2 else points_3d[a:b]
+            futures.append(pool.submit(track_segment, K, X, points_2d[a:b], chunk_size, iterations, max_rms))
+        results = [future.result() for future in futures]
+    R = np.concatenate([r[0] for r in results])
+    t = np.concatenate([r[1] for r in results])
+    rms = np.concatenate([r[2] for r in results])
+    return pose_to_cam(R, t), rms
@@ -0,0 +1,105 @@
+import numpy as np
+
+from src.intrinsic.distortion import apply_distortion_batch, has_distortion
+from src.sweep.sweep import CHUNK_ELEMENTS
+from src.utils.projection import projection_matrices, project_points_batch
+
+
+def match_nearest(projected, observations, chunk_elements=CHUNK_ELEMENTS):
+    """
+    Associa cada observação 2D ao ponto projetado mais próximo, para todo o lote.
+
+    A busca é feita em blocos de pontos projetados, dimensionados para que a matriz de distâncias (B, M, bloco)
+    tenha no máximo `chunk_elements` elementos. As distâncias usam a expansão ‖b‖² - 2a·b (o termo ‖a‖² da
+    observação não muda o mais próximo), sem o temporário das diferenças (B, M, 2, bloco).
+
+    Parâmetros:
+        projected (numpy.ndarray): Pontos projetados (B, 2, N).
+        observations (numpy.ndarray): Observações (B, M, 2).
+        chunk_elements (int): Limite de elementos da matriz de distâncias de cada bloco.
+
+    Retorna:
+        indices (numpy.ndarray): Índice do ponto projetado mais próximo de cada observação (B, M).
+    """
+    B, _, N = projected.shape
+    M = observations.shape[1]
+    chunk_size = max(1, chunk_elements // max(1, B*M))
+    best = np.full((B, M), np.inf)
+    indices = np.zeros((B, M), dtype=np.int64)
+    for start in range(0, N, chunk_size):
+        block = projected[:, :, start:start + chunk_size]
+        distances = np.matmul(observations, block)
+        distances *= -2
+        distances += np.sum(block*block, axis=1)[:, None]
+        closest = np.argmin(distances, axis=2)
+        closest_distance = np.take_along_axis(distances, closest[..., None], axis=2)[..., 0]
+        improved = closest_distance < best
+        best = np.where(improved, closest_distance, best)
+        indices = np.where(improved, closest + start, indices)
+    return indices
+
+
+def evaluate_reprojection(Ks, cams, points, observations, indices=None, coeffs=None, percentiles=(50, 90, 95)):
+    """
+    Mede o quanto combinações de K e pose reproduzem pontos 2D observados (vetorizado no lote).
+
+    Os pontos da malha são projetados com a mesma matemática de `plot2d` (P = K · M_x · inv(cam), divisão
+    homogênea e, opcionalmente, distorção da lente). Cada observação é comparada com o vértice indicado em
+    `indices` ou, se `indices` for None, com o vértice projetado mais próximo.
+
+    Parâmetros:
+        Ks (numpy.ndarray): Matrizes intrínsecas (B, 3, 3) ou (3, 3).
+        cams (numpy.ndarray): Poses da câmera (B, 4, 4) ou (4, 4), no formato de `self.cam`.
+        points (numpy.ndarray): Malha em coordenadas homogêneas 4xN (como `self.urso`).
+        observations (numpy.ndarray): Pixels observados (M, 2), ou (B, M, 2) quando variam no lote.
+        indices (numpy.ndarray): Vértice correspondente a cada observação (M,), opcional.
+        coeffs (numpy.ndarray): Coeficientes de distorção (k1, k2, p1, p2, k3), opcional.
+        percentiles (tuple): Percentis do erro incluídos no resultado.
+
+    Retorna:
+        result (dict):
+            - "residuals": Resíduos (projetado - observado) (B, M, 2).
+            - "errors": Norma dos resíduos (B, M), em pixels.
+            - "indices": Vértice usado para cada observação (B, M).
+            - "behind": Observações associadas a vértices atrás da câmera (B, M).
+            - "rms", "mean", "max" e "p<percentil>": Estatísticas por elemento do lote (B,).
+    """
+    Ks = np.asarray(Ks, dtype=float)
+    cams = np.asarray(cams, dtype=float)
+    B = max(Ks.shape[0] if Ks.ndim == 3 else 1, cams.shape[0] if cams.ndim == 3 else 1)
+    Ks = np.broadcast_to(Ks, (B, 3, 3))
+    cams = np.broadcast_to(cams, (B, 4, 4))
+    observations = np.broadcast_to(np.asarray(observations, dtype=float), (B,) + np.shape(observations)[-2:])
+
+    if indices is not None:
+        # Apenas os vértices observados precisam ser projetados
+        indices = np.broadcast_to(np.asarray(indices), observations.shape[:2])
+        used, inverse = np.unique(indices, return_inverse=True)
+        subset = np.asarray(points[:, used], dtype=float)
+        inverse = inverse.reshape(indices.shape)
+    else:
+        subset = np.asarray(points, dtype=float)
+
+    projected, depth = project_points_batch(projection_matrices(cams, Ks), subset)
+    if coeffs is not None and has_distortion(np.asarray(coeffs)):
+        projected = apply_distortion_batch(projected, Ks, np.asarray(coeffs, dtype=float))
+
+    if indices is None:
+        inverse = match_nearest(projected, observations)
+        indices = inverse
+    matched = np.take_along_axis(projected, inverse[:, None, :], axis=2)
+    residuals = np.swapaxes(matched, 1, 2) - observations
+    errors = np.linalg.norm(residuals, axis=2)
+
+    result = {
+        "residuals": residuals,
+        "errors": errors,
+        "indices": np.asarray(indices),
+        "behind": np.take_along_axis(depth, inverse, axis=1) <= 0,
+        "rms": np.sqrt(np.mean(errors**2, axis=1)),
+        "mean": errors.mean(axis=1),
+        "max": errors.max(axis=1),
+    }
+    for q, value in zip(percentiles, np.percentile(errors, percentiles, axis=1)):
+        result[f"p{q}"] = value
+    return result
@@ -0,0 +1,81 @@
+import numpy as np
+
+from src.utils.bounds import bounding_sphere
+from src.utils.transformations import x_rotation
+
+# Orientação padrão da câmera (a mesma de `initialize_camera`): eixo óptico ao longo de +Y do mundo
+DEFAULT_ROTATION = x_rotation(-90)[:3, :3]
+
+
+def frame_cameras(centers, radii, Ks, width, height, rotation=DEFAULT_ROTATION, margin=1.1):
+    """
+    Calcula, em lote, a pose da câmera que enquadra esferas envolventes na imagem.
+
+    A câmera mantém a orientação `rotation` e é afastada do centro da esfera, ao longo do eixo óptico, até que a
+    esfera (ampliada por `margin`) caiba no menor dos campos de visão horizontal e vertical.
+
+    Parâmetros:
+        centers (numpy.ndarray): Centros das esferas (B, 3) ou (3,).
+        radii (numpy.ndarray): Raios das esferas (B,) ou escalar.
+        Ks (numpy.ndarray): Matriz intrínseca 3x3 ou lote (B, 3, 3).
+        width, height (float ou numpy.ndarray): Resolução da imagem (`n_pixels_base`, `n_pixels_altura`).
+        rotation (numpy.ndarray): Orientação 3x3 da câmera no mundo (colunas = eixos X, Y, Z da câmera).
+        margin (float): Folga em torno do objeto (1 = esfera tocando a borda da imagem).
+
+    Retorna:
+        cams (numpy.ndarray): Poses (B, 4, 4) no formato de `self.cam` ((4, 4) para uma única esfera).
+    """
+    centers = np.asarray(centers, dtype=float)
+    single = centers.ndim == 1
+    centers = centers.reshape(-1, 3)
+    radii = np.broadcast_to(np.asarray(radii, dtype=float), centers.shape[:1])
+    Ks = np.broadcast_to(np.asarray(Ks, dtype=float), centers.shape[:1] + (3, 3))
+
+    # Meio campo de visão a partir do centro da imagem (o ponto principal fica no centro, como em `derive_intrinsics`)
+    half_fov = np.arctan(np.minimum(np.asarray(width)/2/Ks[:, 0, 0], np.asarray(height)/2/Ks[:, 1, 1]))
+    distance = margin*radii/np.sin(half_fov)
+
+    cams = np.broadcast_to(np.eye(4), centers.shape[:1] + (4, 4)).copy()
+    cams[:, :3, :3] = rotation
+    cams[:, :3, 3] = centers - distance[:, None]*rotation[:, 2]
+    return cams[0] if single else cams
+
+
+def frame_mesh(points, K, width, height, rotation=DEFAULT_ROTATION, margin=1.1):
+    """
+    Calcula a pose da câmera que enquadra uma malha (pela sua esfera envolvente).
+
+    Parâmetros:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN (como `self.urso`).
+        K (numpy.ndarray): Matriz intrínseca 3x3.
+        width, height (float): Resolução da imagem.
+        rotation (numpy.ndarray): Orientação 3x3 da câmera no mundo.
+        margin (float): Folga em torno do objeto.
+
+    Retorna:
+        cam (numpy.ndarray): Pose 4x4 no formato de `self.cam`.
+    """
+    center, radius = bounding_sphere(points)
+    return frame_cameras(center, radius, K, width, height, rotation, margin)
+
+
+def frame_meshes(meshes, K, width, height, rotation=DEFAULT_ROTATION, margin=1.1):
+    """
+    Enquadra várias malhas de um conjunto de dados de uma vez, sem nenhuma renderização de teste.
+
+    Apenas as esferas envolventes são calculadas malha a malha; as poses são resolvidas em lote.
+
+    Parâmetros:
+        meshes (iterable): Malhas em coordenadas homogêneas 4xN (por exemplo, vindas de `load_mesh`).
+        K (numpy.ndarray): Matriz intrínseca 3x3 ou lote (B, 3, 3).
+        width, height (float ou numpy.ndarray): Resolução da imagem.
+        rotation (numpy.ndarray): Orientação 3x3 da câmera no mundo.
+        margin (float): Folga em torno de cada objeto.
+
+    Retorna:
+        cams (numpy.ndarray): Poses (B, 4, 4), uma por malha.
+    """
+    spheres = [bounding_sphere(points) for points in meshes]
+    centers = np.array([center for center, _ in spheres]).reshape(-1, 3)
+    radii = np.array([radius for _, radius in spheres])
+    return frame_cameras(centers, radii, K, width, height, rotation, margin)
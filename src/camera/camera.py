@@ -147,6 +147,7 @@ class Camera:
         - `self.cam_line_edits`: Dicionário que contém os campos de entrada para os parâmetros da câmera.
         - `self.cam_values`: Dicionário que armazena os valores atualizados dos parâmetros da câmera.
         - `self.cam_action`: Função que é chamada para processar a atualização ou transformação da câmera com base nos valores inseridos.
+        - `self.batch_render`: Agrupa os desenhos pedidos pelos campos; só as vistas cuja pose mudou são refeitas, uma única vez.
         """
 
         self.log("-----------------------------------------")
@@ -157,23 +158,27 @@ class Camera:
         for key, value in self.cam_values.items():
             print(f"{key}: {value}")
         erro=False
+        applied = {}
 
-        for key, cam_line_edit in self.cam_line_edits.items():
+        with self.batch_render():
+            for key, cam_line_edit in self.cam_line_edits.items():
 
-            text = cam_line_edit.text()
-            if text: 
-                try:
-                    self.cam_values[key] = float(text)
+                text = cam_line_edit.text()
+                if text: 
+                    try:
+                        self.cam_values[key] = float(text)
 
-                    self.cam_action(key, self.cam_values[key])
+                        self.cam_action(key, self.cam_values[key])
+                        applied[key] = self.cam_values[key]
 
 
-                except ValueError:
-                    erro=True
-                    self.ke=key
-                    self.te=text
-                    print(f"Erro ao converter {key} {text}")
+                    except ValueError:
+                        erro=True
+                        self.ke=key
+                        self.te=text
+                        print(f"Erro ao converter {key} {text}")
 
+        self.record_event("cam", applied)
         self.log("-----------------------------------------")
         if(erro):
             QMessageBox.warning(self, "Erro de Validacao", "Os seguintes campos estao fora dos limites ou invalidos:\n\n  "+self.ke+" : "+self.te)
@@ -189,7 +194,7 @@ class Camera:
 
         Este método realiza a atualização da posição ou orientação da câmera no espaço tridimensional com base no parâmetro 
         `key` e no valor `value`. O método identifica qual transformação aplicar à câmera (movimento ou rotação nos eixos X, Y ou Z) 
-        e aplica a transformação correspondente. Após a atualização, o método chama `update_canvas()` para renderizar as alterações.
+        e aplica a transformação correspondente. Após a atualização, o método chama `request_render()` para renderizar as alterações.
 
         Passos realizados:
         -------------------
@@ -197,7 +202,7 @@ class Camera:
         2. Dependendo do eixo identificado (X, Y ou Z), calcula a transformação correspondente (movimento ou rotação) 
         utilizando as funções `move()`, `x_rotation()`, `y_rotation()`, ou `z_rotation()`.
         3. Aplica a transformação calculada na câmera, atualizando a matriz de transformação `self.cam`.
-        4. Chama a função `update_canvas()` para re-renderizar a visualização com a nova posição e orientação da câmera.
+        4. Chama a função `request_render()` para re-renderizar a visualização com a nova posição e orientação da câmera.
 
         Parâmetros:
         -----------
@@ -215,7 +220,7 @@ class Camera:
         - `self.cam`: A matriz de transformação da câmera, que é atualizada com a nova posição ou orientação.
         - `self.zero_cam`: A configuração inicial da câmera (referência para a transformação).
         - `self.T`: A matriz de transformação calculada para a operação de movimento ou rotação.
-        - `self.update_canvas`: Função chamada para atualizar a renderização da cena após a transformação.
+        - `self.request_render`: Função chamada para atualizar a renderização da cena após a transformação.
 
         """
 
@@ -229,41 +234,41 @@ class Camera:
             self.T = move(value,0,0)
             aux_cam = np.dot(self.T,self.zero_cam)
             self.cam = np.dot(accumulated_cam,aux_cam)
-            self.update_canvas()            
+            self.request_render()            
 
         elif "X(angle)" in key:
             accumulated_cam = self.cam
             self.T = x_rotation(value)
             aux_cam = np.dot(self.T,self.zero_cam)
             self.cam = np.dot(accumulated_cam,aux_cam)
-            self.update_canvas()           
+            self.request_render()           
         elif "Y(move)" in key:
             accumulated_cam = self.cam
             self.T = move(0,value,0)
             aux_cam = np.dot(self.T,self.zero_cam)
             self.cam = np.dot(accumulated_cam,aux_cam)
-            self.update_canvas()            
+            self.request_render()            
 
         elif "Y(angle)" in key:
             accumulated_cam = self.cam
             self.T = y_rotation(value)
             aux_cam = np.dot(self.T,self.zero_cam)
             self.cam = np.dot(accumulated_cam,aux_cam)
-            self.update_canvas()   
+            self.request_render()   
 
         elif "Z(move)" in key:
             accumulated_cam = self.cam
             self.T = move(0, 0, value)
             aux_cam = np.dot(self.T,self.zero_cam)
             self.cam = np.dot(accumulated_cam,aux_cam)
-            self.update_canvas()           
+            self.request_render()           
 
         elif "Z(angle)" in key:
             accumulated_cam = self.cam
             self.T = z_rotation(value)
             aux_cam = np.dot(self.T,self.zero_cam)
             self.cam = np.dot(accumulated_cam,aux_cam)
-            self.update_canvas()          
+            self.request_render()          
         self.log("Saindo da funcao cam_action")
         self.log("-----------------------------------------")
         self.log("-----------------------------------------")
\ No newline at end of file
@@ -0,0 +1,68 @@
+from src.history.pose_history import PoseHistory
+
+
+class History:
+    def commit_history(self):
+        """
+        Grava a pose atual da câmera e os parâmetros intrínsecos no histórico de desfazer/refazer.
+
+        Chamado a cada alteração confirmada (botões "Atualizar", reset e primeiro quadro). Estados iguais ao registro
+        atual não são gravados, de modo que restaurar um registro (desfazer/refazer) não cria um registro novo.
+
+        Variáveis envolvidas:
+        ----------------------
+        - `self.history`: Histórico (`PoseHistory`) com os registros compactos.
+        - `self.cam`: Pose 4x4 da câmera.
+        - `self.params_intrinsc_values`: Parâmetros intrínsecos da câmera.
+        """
+        if getattr(self, "history", None) is None:
+            self.history = PoseHistory()
+        if self.history.push(self.cam, self.params_intrinsc_values):
+            self.log(f"Historico: {len(self.history)} registro(s)")
+
+    def restore_state(self, cam, params):
+        """
+        Aplica uma pose e um conjunto de parâmetros intrínsecos salvos e redesenha os gráficos.
+
+        Os parâmetros derivados (sx, sy, ox, oy) são recalculados por `projection_2d()`, os campos de entrada são
+        atualizados e o desenho é pedido por `request_render()`, que refaz apenas as vistas afetadas.
+
+        Parâmetros:
+        -----------
+        - `cam` (numpy.ndarray): Pose 4x4 da câmera.
+        - `params` (dict): Parâmetros intrínsecos (apenas os campos editáveis).
+        """
+        self.cam = cam
+        self.params_intrinsc_values.update(params)
+        self.projection_2d()
+        self.populate_intrinsic_fields()
+        self.record_event("restore", {"cam": self.cam.tolist(), "intrinsic": dict(params)})
+        self.request_render()
+
+    def undo(self):
+        """
+        Desfaz a última alteração confirmada da pose ou dos parâmetros intrínsecos (atalho Ctrl+Z).
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: undo")
+        state = self.history.undo()
+        if state is None:
+            self.log("Nada para desfazer.")
+        else:
+            self.restore_state(*state)
+        self.log("Saindo da funcao undo")
+        self.log("-----------------------------------------")
+
+    def redo(self):
+        """
+        Refaz a última alteração desfeita (atalho Ctrl+Shift+Z).
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: redo")
+        state = self.history.redo()
+        if state is None:
+            self.log("Nada para refazer.")
+        else:
+            self.restore_state(*state)
+        self.log("Saindo da funcao redo")
+        self.log("-----------------------------------------")
@@ -0,0 +1,124 @@
+import numpy as np
+
+from src.utils.transformations import quaternion_to_rotation, rotation_to_quaternion
+
+# Parâmetros intrínsecos guardados em cada registro (os derivados sx, sy, ox e oy são recalculados)
+HISTORY_KEYS = ("n_pixels_base:", "n_pixels_altura:", "ccd_x:", "ccd_y:", "dist_focal:", "s_theta:",
+                "k1:", "k2:", "p1:", "p2:", "k3:")
+
+# Tamanho de uma pose compacta: quaternion (w, x, y, z) + translação (x, y, z)
+POSE_SIZE = 7
+
+DEFAULT_CAPACITY = 1024
+
+
+def pose_to_vector(cam):
+    """
+    Compacta a pose 4x4 da câmera em 7 valores: quaternion (w, x, y, z) e translação.
+
+    Parâmetros:
+        cam (numpy.ndarray): Pose 4x4 da câmera no referencial do mundo (`self.cam`).
+
+    Retorna:
+        vector (numpy.ndarray): Vetor (7,).
+    """
+    cam = np.asarray(cam, dtype=float)
+    return np.concatenate((rotation_to_quaternion(cam[:3, :3]), cam[:3, 3]))
+
+
+def vector_to_pose(vector):
+    """
+    Reconstrói a pose 4x4 a partir do vetor de `pose_to_vector`.
+    """
+    cam = np.eye(4)
+    cam[:3, :3] = quaternion_to_rotation(vector[:4])
+    cam[:3, 3] = vector[4:POSE_SIZE]
+    return cam
+
+
+class PoseHistory:
+    """
+    Histórico de desfazer/refazer com registros compactos em um buffer circular pré-alocado.
+
+    Cada registro é uma linha de `self.records`: a pose compacta (`pose_to_vector`) seguida dos parâmetros
+    intrínsecos de `HISTORY_KEYS`. Gravar, desfazer e refazer custam O(1); quando o buffer enche, o registro mais
+    antigo é descartado. Gravar depois de desfazer descarta os registros que poderiam ser refeitos.
+
+    Atributos:
+        capacity (int): Número máximo de registros.
+        records (numpy.ndarray): Buffer (capacity, 7 + len(HISTORY_KEYS)).
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, keys=HISTORY_KEYS):
+        self.capacity = int(capacity)
+        self.keys = tuple(keys)
+        self.records = np.zeros((self.capacity, POSE_SIZE + len(self.keys)))
+        self._start = 0      # índice do registro mais antigo no buffer
+        self._size = 0       # número de registros válidos
+        self._cursor = -1    # posição (relativa a _start) do registro atual
+
+    def __len__(self):
+        return self._size
+
+    def _row(self, position):
+        return (self._start + position) % self.capacity
+
+    def encode(self, cam, params):
+        record = np.empty(POSE_SIZE + len(self.keys))
+        record[:POSE_SIZE] = pose_to_vector(cam)
+        record[POSE_SIZE:] = [float(params.get(key, 0) or 0) for key in self.keys]
+        return record
+
+    def decode(self, record):
+        """
+        Retorna a pose 4x4 e o dicionário de parâmetros intrínsecos de um registro.
+        """
+        params = {key: float(value) for key, value in zip(self.keys, record[POSE_SIZE:])}
+        return vector_to_pose(record), params
+
+    def push(self, cam, params):
+        """
+        Grava o estado confirmado (pose e parâmetros intrínsecos) como registro atual.
+
+        Parâmetros:
+            cam (numpy.ndarray): Pose 4x4 da câmera.
+            params (dict): Parâmetros intrínsecos (formato de `params_intrinsc_values`).
+
+        Retorna:
+            pushed (bool): False quando o estado é igual ao registro atual (nada é gravado).
+        """
+        record = self.encode(cam, params)
+        if self._cursor >= 0 and np.allclose(self.records[self._row(self._cursor)], record, rtol=0, atol=1e-9):
+            return False
+        self._size = self._cursor + 1
+        if self._size == self.capacity:
+            self._start = (self._start + 1) % self.capacity
+            self._size -= 1
+        self.records[self._row(self._size)] = record
+        self._size += 1
+        self._cursor = self._size - 1
+        return True
+
+    def can_undo(self):
+        return self._cursor > 0
+
+    def can_redo(self):
+        return self._cursor < self._size - 1
+
+    def undo(self):
+        """
+        Volta um registro. Retorna `(cam, params)` do registro anterior, ou None se não houver.
+        """
+        if not self.can_undo():
+            return None
+        self._cursor -= 1
+        return self.decode(self.records[self._row(self._cursor)])
+
+    def redo(self):
+        """
+        Avança um registro. Retorna `(cam, params)` do registro seguinte, ou None se não houver.
+        """
+        if not self.can_redo():
+            return None
+        self._cursor += 1
+        return self.decode(self.records[self._row(self._cursor)])
@@ -0,0 +1,169 @@
+import numpy as np
+
+# Coeficientes de distorção de Brown–Conrady, na ordem usual (k1, k2, p1, p2, k3)
+DISTORTION_KEYS = ("k1:", "k2:", "p1:", "p2:", "k3:")
+
+
+def distortion_coefficients(params):
+    """
+    Lê os coeficientes de distorção de `params_intrinsc_values` (campos ausentes valem 0).
+
+    Parâmetros:
+        params (dict): Parâmetros intrínsecos da câmera.
+
+    Retorna:
+        coeffs (numpy.ndarray): Vetor (k1, k2, p1, p2, k3).
+    """
+    return np.array([float(params.get(key, 0) or 0) for key in DISTORTION_KEYS])
+
+
+def has_distortion(coeffs):
+    return bool(np.any(coeffs != 0))
+
+
+def distort_normalized(x, y, coeffs):
+    """
+    Aplica a distorção radial e tangencial de Brown–Conrady a coordenadas normalizadas (x = X/Z, y = Y/Z).
+
+    Parâmetros:
+        x, y (numpy.ndarray): Coordenadas normalizadas sem distorção.
+        coeffs (numpy.ndarray): Coeficientes (k1, k2, p1, p2, k3).
+
+    Retorna:
+        xd, yd (numpy.ndarray): Coordenadas normalizadas com distorção.
+    """
+    k1, k2, p1, p2, k3 = coeffs
+    r2 = x*x + y*y
+    radial = 1 + r2*(k1 + r2*(k2 + r2*k3))
+    xd = x*radial + 2*p1*x*y + p2*(r2 + 2*x*x)
+    yd = y*radial + p1*(r2 + 2*y*y) + 2*p2*x*y
+    return xd, yd
+
+
+def undistort_normalized(xd, yd, coeffs, iterations=10):
+    """
+    Inverte a distorção de Brown–Conrady por iteração de ponto fixo (vetorizada).
+
+    Parâmetros:
+        xd, yd (numpy.ndarray): Coordenadas normalizadas com distorção.
+        coeffs (numpy.ndarray): Coeficientes (k1, k2, p1, p2, k3).
+        iterations (int): Número de iterações.
+
+    Retorna:
+        x, y (numpy.ndarray): Coordenadas normalizadas sem distorção.
+    """
+    k1, k2, p1, p2, k3 = coeffs
+    x, y = xd.copy(), yd.copy()
+    for _ in range(iterations):
+        r2 = x*x + y*y
+        radial = 1 + r2*(k1 + r2*(k2 + r2*k3))
+        dx = 2*p1*x*y + p2*(r2 + 2*x*x)
+        dy = p1*(r2 + 2*y*y) + 2*p2*x*y
+        x = (xd - dx)/radial
+        y = (yd - dy)/radial
+    return x, y
+
+
+def apply_distortion(points_2d, K, coeffs):
+    """
+    Estágio de distorção aplicado depois da divisão homogênea da projeção (`project_points`).
+
+    Os pixels ideais (modelo pinhole) voltam para coordenadas normalizadas com inv(K), são distorcidos e
+    levados de novo para pixels com K.
+
+    Parâmetros:
+        points_2d (numpy.ndarray): Coordenadas 3xN (u, v, 1) projetadas pelo modelo pinhole.
+        K (numpy.ndarray): Matriz 3x3 de calibração intrínseca.
+        coeffs (numpy.ndarray): Coeficientes (k1, k2, p1, p2, k3).
+
+    Retorna:
+        points_2d (numpy.ndarray): Coordenadas 3xN (u, v, 1) com distorção.
+    """
+    normalized = np.linalg.solve(K, points_2d)
+    xd, yd = distort_normalized(normalized[0], normalized[1], coeffs)
+    return np.dot(K, np.vstack((xd, yd, np.ones_like(xd))))
+
+
+def undistort_points(points_2d, K, coeffs):
+    """
+    Inverso de `apply_distortion`: leva pixels observados (com distorção) para os pixels ideais do modelo pinhole.
+
+    Parâmetros:
+        points_2d (numpy.ndarray): Coordenadas 2xN ou 3xN (u, v, 1) com distorção.
+        K (numpy.ndarray): Matriz 3x3 de calibração intrínseca.
+        coeffs (numpy.ndarray): Coeficientes (k1, k2, p1, p2, k3).
+
+    Retorna:
+        points_2d (numpy.ndarray): Coordenadas 3xN (u, v, 1) sem distorção.
+    """
+    points_2d = np.asarray(points_2d, dtype=float)
+    points_2d = np.vstack((points_2d[:2], np.ones(points_2d.shape[1])))
+    if not has_distortion(coeffs):
+        return points_2d
+    normalized = np.linalg.solve(K, points_2d)
+    x, y = undistort_normalized(normalized[0], normalized[1], coeffs)
+    return np.dot(K, np.vstack((x, y, np.ones_like(x))))
+
+
+def undistortion_map(K, coeffs, width, height):
+    """
+    Pré-calcula, para cada pixel da imagem distorcida, o pixel correspondente na imagem ideal (pinhole).
+
+    Com o mapa calculado uma vez, distorcer uma imagem rasterizada pelo modelo pinhole custa apenas uma leitura
+    indexada por quadro (`remap`), sem avaliar o polinômio de distorção.
+
+    Parâmetros:
+        K (numpy.ndarray): Matriz 3x3 de calibração intrínseca.
+        coeffs (numpy.ndarray): Coeficientes (k1, k2, p1, p2, k3).
+        width, height (int): Dimensões da imagem em pixels.
+
+    Retorna:
+        lookup (numpy.ndarray): Índices (height x width) no vetor achatado da imagem ideal; -1 fora da imagem.
+    """
+    width, height = int(width), int(height)
+    u, v = np.meshgrid(np.arange(width) + 0.5, np.arange(height) + 0.5)
+    pixels = np.vstack((u.ravel(), v.ravel(), np.ones(u.size)))
+    normalized = np.linalg.solve(K, pixels)
+    x, y = undistort_normalized(normalized[0], normalized[1], coeffs)
+    ideal = np.dot(K, np.vstack((x, y, np.ones_like(x))))
+    iu = np.floor(ideal[0]).astype(np.int64)
+    iv = np.floor(ideal[1]).astype(np.int64)
+    inside = (iu >= 0) & (iu < width) & (iv >= 0) & (iv < height)
+    lookup = np.where(inside, iv*width + iu, -1)
+    return lookup.reshape(height, width)
+
+
+def remap(image, lookup, fill=0):
+    """
+    Aplica um mapa pré-calculado por `undistortion_map` a uma imagem (uma única leitura indexada).
+
+    Parâmetros:
+        image (numpy.ndarray): Imagem ideal (height x width).
+        lookup (numpy.ndarray): Índices calculados por `undistortion_map`.
+        fill: Valor dos pixels sem correspondência na imagem ideal.
+
+    Retorna:
+        remapped (numpy.ndarray): Imagem com distorção.
+    """
+    flat = np.append(image.ravel(), np.asarray(fill, dtype=image.dtype))
+    return flat[lookup]
+
+
+def apply_distortion_batch(points_2d, Ks, coeffs):
+    """
+    Versão em lote de `apply_distortion`, para projeções feitas com várias matrizes K.
+
+    Parâmetros:
+        points_2d (numpy.ndarray): Pixels ideais (B, 2, N).
+        Ks (numpy.ndarray): Matrizes intrínsecas (B, 3, 3).
+        coeffs (numpy.ndarray): Coeficientes (k1, k2, p1, p2, k3), compartilhados por todo o lote.
+
+    Retorna:
+        points_2d (numpy.ndarray): Pixels com distorção (B, 2, N).
+    """
+    fx, s, cx = Ks[:, 0, 0, None], Ks[:, 0, 1, None], Ks[:, 0, 2, None]
+    fy, cy = Ks[:, 1, 1, None], Ks[:, 1, 2, None]
+    y = (points_2d[:, 1] - cy)/fy
+    x = (points_2d[:, 0] - cx - s*y)/fx
+    xd, yd = distort_normalized(x, y, coeffs)
+    return np.stack((fx*xd + s*yd + cx, fy*yd + cy), axis=1)
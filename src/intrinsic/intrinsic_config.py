@@ -1,6 +1,9 @@
 from PyQt5.QtWidgets import QMessageBox, QPushButton, QLineEdit, QLabel, QGroupBox, QVBoxLayout, QGridLayout
 from PyQt5.QtGui import QDoubleValidator
 
+from src.intrinsic.distortion import DISTORTION_KEYS
+from src.utils.projection import INTRINSIC_LIMITS, default_intrinsics, validate_intrinsics
+
 class Intrinsic:
     def intrinsc_parameter(self):
         """
@@ -18,6 +21,8 @@ class Intrinsic:
         - ccd_y: 24             # Altura física do sensor em milímetros (mm).
         - dist_focal: 10        # Distância focal da câmera em milímetros (mm).
         - s_theta: 0            # Inclinação do sensor.
+        - k1, k2, k3: 0         # Coeficientes de distorção radial (Brown–Conrady).
+        - p1, p2: 0             # Coeficientes de distorção tangencial (Brown–Conrady).
         - sx: Calculado como a razão entre o número de pixels na base e a largura física do sensor (n_pixels_base / ccd_x).
         - sy: Calculado como a razão entre o número de pixels na altura e a altura física do sensor (n_pixels_altura / ccd_y).
         - ox: Ponto principal no eixo x, calculado como a metade do número de pixels na base (n_pixels_base / 2).
@@ -32,6 +37,7 @@ class Intrinsic:
             - "ccd_y:"  # Altura física do sensor.
             - "dist_focal:"  # Distância focal da câmera.
             - "s_theta:"  # Inclinação do sensor .
+            - "k1:", "k2:", "p1:", "p2:", "k3:"  # Coeficientes de distorção.
             - "sx:"  # Escala no eixo x.
             - "sy:"  # Escala no eixo y.
             - "ox:"  # Ponto principal no eixo x (meia largura do sensor).
@@ -41,16 +47,7 @@ class Intrinsic:
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: intrinsc_parameter")
         self.log("Inicializando parametros intrinsecos da camera...")
-        self.params_intrinsc_values["n_pixels_base:"] = 1050
-        self.params_intrinsc_values["n_pixels_altura:"] = 700
-        self.params_intrinsc_values["ccd_x:"] = 36
-        self.params_intrinsc_values["ccd_y:"] = 24
-        self.params_intrinsc_values["dist_focal:"] = 10
-        self.params_intrinsc_values["s_theta:"] = 0
-        self.params_intrinsc_values["sx:"] = self.params_intrinsc_values["n_pixels_base:"]/self.params_intrinsc_values["ccd_x:"]
-        self.params_intrinsc_values["sy:"] = self.params_intrinsc_values["n_pixels_altura:"]/self.params_intrinsc_values["ccd_y:"]
-        self.params_intrinsc_values["ox:"] = self.params_intrinsc_values["n_pixels_base:"]/2
-        self.params_intrinsc_values["oy:"] = self.params_intrinsc_values["n_pixels_altura:"]/2
+        self.params_intrinsc_values.update(default_intrinsics())
         self.log("Parametros intrinsecos da camera inicializados com sucesso.")
         self.log("Saindo da funcao intrinsc_parameter")
         self.log("-----------------------------------------")
@@ -111,6 +108,7 @@ class Intrinsic:
             - `ccd_y:`
             - `dist_focal:`
             - `s_theta:`
+            - `k1:`, `k2:`, `p1:`, `p2:`, `k3:` (coeficientes de distorção de Brown–Conrady)
         4. Adiciona validações de entrada para garantir que os valores inseridos estejam dentro de limites definidos para cada parâmetro.
         5. Cria um botão "Atualizar" que, ao ser clicado, valida e atualiza os parâmetros com base nos valores inseridos.
         6. Popula os campos de entrada com os valores atuais dos parâmetros intrínsecos.
@@ -136,31 +134,19 @@ class Intrinsic:
 
 
         self.log("Definindo limites para os campos de entrada...")
-        limits = {
-            'n_pixels_base:': (640, 1920),
-            'n_pixels_altura:': (480, 1080),
-            'ccd_x:': (10, 50),
-            'ccd_y:': (10, 50),
-            'dist_focal:': (1, 1000),
-            's_theta:': (-1000, 1000)
-        }
+        limits = INTRINSIC_LIMITS
 
         self.log("Configurando campos de entrada para parametros intrinsecos...")
         self.params_intrinsc_line_edits = {} 
-        labels = [
-            'n_pixels_base:', 
-            'n_pixels_altura:', 
-            'ccd_x:', 
-            'ccd_y:', 
-            'dist_focal:', 
-            's_theta:'
-        ]
+        labels = list(limits)
         for i, label_text in enumerate(labels):
             line_edit = QLineEdit()
             label = QLabel(label_text)
 
             min_val, max_val = limits[label_text]
-            validator = QDoubleValidator(float(min_val), float(max_val), 2, self)
+            # Coeficientes de distorcao sao pequenos e precisam de mais casas decimais
+            decimals = 6 if label_text in DISTORTION_KEYS else 2
+            validator = QDoubleValidator(float(min_val), float(max_val), decimals, self)
             validator.setNotation(QDoubleValidator.StandardNotation)
             line_edit.setValidator(validator) 
 
@@ -216,18 +202,12 @@ class Intrinsic:
         self.log("FUNCAO CHAMADA: validate_and_update_params")
         
         self.log("Validando campos de entrada...")
-        invalid_fields = []
+        texts = {label: line_edit.text() for label, line_edit in self.params_intrinsc_line_edits.items()}
 
-        for label, line_edit in self.params_intrinsc_line_edits.items():
-            text = line_edit.text()
+        for label, text in texts.items():
             min_val, max_val = limits[label]
             self.log(f"Validando campo {label} com valor {text} (min: {min_val}, max: {max_val})")  
-            try:
-                value = float(text)
-                if value < min_val or value > max_val:
-                    invalid_fields.append(f"{label} (valor digitado: {text}, limite: {min_val} a {max_val})")
-            except ValueError:
-                invalid_fields.append(f"{label} (valor digitado: {text}, valor invalido)")
+        invalid_fields = validate_intrinsics(texts, limits)
 
         if invalid_fields:
             error_message = "Os seguintes campos estao fora dos limites ou invalidos:\n\n" + "\n".join(invalid_fields)
@@ -256,7 +236,8 @@ class Intrinsic:
         usando `setattr`.
         3. Exibe uma mensagem de sucesso utilizando `QMessageBox` informando que os parâmetros foram atualizados com sucesso.
         4. Em seguida, o método percorre novamente os campos de entrada, atualizando os valores no dicionário `params_intrinsc_values`
-        e chama uma função de ação (`params_intrinsc_action`) para processar as atualizações.
+        e chama uma função de ação (`params_intrinsc_action`) para processar as atualizações. Campos cujo valor não mudou
+        são ignorados, e os gráficos são redesenhados uma única vez no final (`batch_render`).
         5. Se algum valor inserido for inválido (não puder ser convertido para número), exibe um erro no console.
 
         Variáveis envolvidas:
@@ -274,16 +255,24 @@ class Intrinsic:
         QMessageBox.information(self, "Atualizacao bem-sucedida", "Parametros atualizados com sucesso!")
 
         self.log("Atualizando parametros intrinsecos...")
-        for key, params_intrinsc_line_edit in self.params_intrinsc_line_edits.items():
-            text = params_intrinsc_line_edit.text()
-            if text:  
-                try:
-                    self.params_intrinsc_values[key] = float(text)
-
-                    self.params_intrinsc_action(key, self.params_intrinsc_values[key])
-
-                except ValueError:
-                    print(f"Erro ao converter {key} {text}")
+        applied = {}
+        with self.batch_render():
+            for key, params_intrinsc_line_edit in self.params_intrinsc_line_edits.items():
+                text = params_intrinsc_line_edit.text()
+                if text:  
+                    try:
+                        value = float(text)
+                        if self.params_intrinsc_values.get(key) == value:
+                            # Campo sem alteracao: nada a recalcular
+                            continue
+                        self.params_intrinsc_values[key] = value
+
+                        self.params_intrinsc_action(key, self.params_intrinsc_values[key])
+                        applied[key] = self.params_intrinsc_values[key]
+
+                    except ValueError:
+                        print(f"Erro ao converter {key} {text}")
+        self.record_event("intrinsic", applied)
         self.log("Parametros intrinsecos atualizados com sucesso.")
         self.log("Saindo da funcao update_params_intrinsc")
         self.log("-----------------------------------------")
@@ -296,14 +285,14 @@ class Intrinsic:
         Este método realiza a atualização dos valores intrínsecos da câmera armazenados no dicionário `params_intrinsc_values` 
         de acordo com o parâmetro `key` fornecido. Dependendo do valor de `key`, o método atualiza o respectivo parâmetro 
         intrínseco (como o número de pixels, a distância focal, ou as dimensões do sensor). Após a atualização, o método 
-        chama as funções `projection_2d()` e `update_canvas()` para atualizar a projeção 2D e os gráficos na interface.
+        chama as funções `projection_2d()` e `request_render()` para atualizar a projeção 2D e os gráficos na interface.
 
         Passos realizados:
         -------------------
         1. Verifica o valor de `key` para determinar qual parâmetro intrínseco deve ser atualizado.
         2. Atualiza o valor correspondente no dicionário `self.params_intrinsc_values`.
         3. Após atualizar o valor, chama a função `projection_2d()` para recalcular a projeção 2D com base no novo valor.
-        4. Em seguida, chama a função `update_canvas()` para atualizar os gráficos ou a interface com as novas configurações.
+        4. Em seguida, chama a função `request_render()` para atualizar os gráficos ou a interface com as novas configurações.
 
         Parâmetros:
         -----------
@@ -314,13 +303,14 @@ class Intrinsic:
             - "ccd_y:"
             - "dist_focal:"
             - "s_theta:"
+            - "k1:", "k2:", "p1:", "p2:", "k3:"
         - `value` (float): O novo valor que será atribuído ao parâmetro identificado pela chave `key`.
 
         Variáveis envolvidas:
         ----------------------
         - `self.params_intrinsc_values`: Dicionário que armazena os valores dos parâmetros intrínsecos da câmera.
         - `self.projection_2d`: Função chamada para recalcular a projeção 2D após a atualização dos parâmetros.
-        - `self.update_canvas`: Função chamada para atualizar os gráficos ou visualizações na interface com os novos parâmetros.
+        - `self.request_render`: Função chamada para atualizar os gráficos ou visualizações na interface com os novos parâmetros.
 
         """
 
@@ -342,9 +332,11 @@ class Intrinsic:
             self.params_intrinsc_values['dist_focal:'] = value
         elif "s_theta:" in key:
             self.params_intrinsc_values['s_theta:'] = value
+        elif key in DISTORTION_KEYS:
+            self.params_intrinsc_values[key] = value
 
         self.projection_2d()
-        self.update_canvas()       
+        self.request_render()       
         self.log("Saindo da funcao params_intrinsc_action")
         self.log("-----------------------------------------")
         self.log("-----------------------------------------")
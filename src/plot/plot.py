@@ -1,8 +1,55 @@
+from contextlib import contextmanager
+
 from PyQt5.QtWidgets import QMessageBox, QWidget, QHBoxLayout
-from matplotlib import pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvas
 import numpy as np
-from mpl_toolkits.mplot3d import art3d
+
+from src.render.shading import shade_faces, update_collection
+from src.render.silhouette import edge_segments, silhouette_edges
+from src.utils.bounds import hull_points, projected_bbox
+from src.intrinsic.distortion import apply_distortion, distortion_coefficients, has_distortion, remap, undistortion_map
+from src.utils.projection_cache import geometry_version, projection_key
+from src.utils.projection import density_image, derive_intrinsics, intrinsic_matrix, projection_matrix, project_points, project_view
+
+# O matplotlib é importado apenas dentro dos métodos de desenho (ver `matplotlib_figure`), para que a janela
+# abra sem esperar por ele.
+
+# Número máximo de pontos de uma nuvem exibidos no plot 3D
+MAX_POINTS_3D = 20000
+
+# Número máximo de triângulos materializados no plot 3D de uma malha instanciada (`InstancedMesh.sample_vectors`)
+MAX_TRIANGLES_3D = 200000
+
+# Modos de desenho da imagem 2D: texto exibido na interface -> modo
+RENDER_MODES = {
+    "Wireframe": "wireframe",
+    "Silhueta": "silhouette",
+    "Sombreado": "shaded",
+}
+
+# Estados da inicialização da janela: enquanto o estado não é INIT_READY, pedidos de desenho apenas marcam a
+# cena como suja e o primeiro quadro é desenhado uma única vez, na transição para INIT_READY.
+INIT_CREATED = "created"
+INIT_CONFIGURING = "configuring"
+INIT_READY = "ready"
+
+
+
+def matplotlib_figure():
+    """
+    Cria uma figura Matplotlib e o canvas Qt dela, importando o matplotlib no primeiro uso.
+
+    A figura é criada diretamente (sem `pyplot`), então não fica registrada no gerenciador global de figuras e
+    não precisa ser fechada com `plt.close`.
+
+    Retorna:
+        fig (matplotlib.figure.Figure): Figura vazia.
+        canvas (FigureCanvas): Canvas Qt da figura.
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_qt5agg import FigureCanvas
+    fig = Figure()
+    return fig, FigureCanvas(fig)
+
 
 class Plots:
 
@@ -54,7 +101,7 @@ class Plots:
 
         Passos realizados:
         -------------------
-        1. Cria uma nova figura (`self.fig2`) utilizando `plt.figure()`.
+        1. Cria uma nova figura (`self.fig2`) e seu canvas (`self.canvas2`) utilizando `matplotlib_figure()`.
         2. Cria um eixo 3D (`self.ax2`) e adiciona uma coleção 3D com os vetores de polígono (`self.urso_vectors`).
         3. Adiciona uma coleção de linhas (contornos) à visualização utilizando os vetores de `self.urso_vectors`, 
         com cores pretas e espessura de linha configurada.
@@ -75,20 +122,30 @@ class Plots:
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: plot3d")
         self.log("Configurando plot 3D...")
-        self.fig2 = plt.figure()
+        from mpl_toolkits.mplot3d import art3d  # também registra a projeção '3d'
+        self.fig2, self.canvas2 = matplotlib_figure()
         self.ax2 = self.fig2.add_subplot(111, projection='3d')
         self.ax2.set_title("Imagem 3D")
         self.ax2.set_xlabel('x-axis')
         self.ax2.set_ylabel('y-axis')
         self.ax2.set_zlabel('z-axis')
-        self.ax2.add_collection3d(art3d.Poly3DCollection(self.urso_vectors))
-        self.ax2.add_collection3d(art3d.Line3DCollection(self.urso_vectors, colors='k', linewidths=0.2, linestyles='-'))
+        if self.urso_vectors is None:
+            # Nuvem de pontos: exibe uma amostra dos pontos para manter o plot 3D interativo
+            step = max(1, self.urso.shape[1] // MAX_POINTS_3D)
+            sample = np.asarray(self.urso[:3, ::step])
+            self.ax2.scatter(sample[0], sample[1], sample[2], s=1)
+        else:
+            vectors = self.urso_vectors
+            if hasattr(self.scene, "transforms"):
+                # Malha instanciada: só uma amostra limitada das cópias é materializada
+                vectors = self.scene.sample_vectors(MAX_TRIANGLES_3D)
+            self.ax2.add_collection3d(art3d.Poly3DCollection(vectors))
+            self.ax2.add_collection3d(art3d.Line3DCollection(vectors, colors='k', linewidths=0.2, linestyles='-'))
         
         self.log("Desenhando setas...")
         self.draw_arrows(self.cam[:,-1],self.cam[:,0:3], self.ax2)
         
         self.log("Carregando Canvas...")
-        self.canvas2 = FigureCanvas(self.fig2)
         self.canvas_layout.addWidget(self.canvas2)
         self.log("Plot 3D configurado com sucesso.")
         self.log("Saindo da funcao plot3d")
@@ -105,7 +162,8 @@ class Plots:
 
         Passos realizados:
         -------------------
-        1. Cria uma nova figura (`self.fig1`) e um eixo (`self.ax1`) para o gráfico 2D usando Matplotlib.
+        1. Cria, na primeira chamada, a figura (`self.fig1`) e o eixo (`self.ax1`) do gráfico 2D; nas seguintes, apenas
+        remove do eixo os artistas do quadro anterior (a coleção do modo sombreado é mantida e reaproveitada).
         2. Define o título do gráfico como "Imagem".
         3. Calcula a matriz de calibração intrínseca `self.K` com base nos parâmetros intrínsecos fornecidos em 
         `self.params_intrinsc_values`.
@@ -114,7 +172,8 @@ class Plots:
         6. Normaliza as coordenadas 2D dividindo pelos valores da terceira coordenada (homogênea).
         7. Define os limites dos eixos X e Y do gráfico com base nos parâmetros `n_pixels_base:` e `n_pixels_altura:`.
         8. Plota a malha projetada 2D utilizando `self.ax1.plot()` e ajusta o gráfico com uma grade e aspecto igual.
-        9. Adiciona o canvas (`self.canvas1`) ao layout da interface para exibição.
+        9. Adiciona o canvas (`self.canvas1`) ao layout da interface na primeira chamada, à esquerda do gráfico 3D, e
+        pede o redesenho (`draw_idle`).
 
         Variáveis envolvidas:
         ----------------------
@@ -128,56 +187,69 @@ class Plots:
         - `self.P`: A matriz de projeção final utilizada para converter a malha 3D para 2D.
         - `self.urso`: A malha 3D a ser projetada.
         - `self.URSO_2D`: A malha projetada em 2D após a transformação.
+        - `self.projection_cache`: Cache LRU das projeções já calculadas, por malha, pose e parâmetros intrínsecos; rever
+        uma vista (reset, desfazer) não refaz a projeção.
         """
 
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: plot2d")
         self.log("Configurando plot 2D...")
-        self.fig1, self.ax1 = plt.subplots()
-        self.ax1.set_title("Imagem 2D")
-        self.ax1.set_xlabel('x-axis')
-        self.ax1.set_ylabel('y-axis')
-        self.canvas1 = FigureCanvas(self.fig1)
+        if getattr(self, "canvas1", None) is None:
+            # A figura 2D é criada uma única vez; os quadros seguintes só trocam os artistas do eixo
+            self.fig1, self.canvas1 = matplotlib_figure()
+            self.ax1 = self.fig1.add_subplot(111)
+            self.ax1.set_title("Imagem 2D")
+            self.ax1.set_xlabel('x-axis')
+            self.ax1.set_ylabel('y-axis')
+            self.canvas_layout.insertWidget(0, self.canvas1)
+        else:
+            shaded = getattr(self, "shaded_collection", None)
+            for artist in self.ax1.lines[:] + self.ax1.images[:] + self.ax1.collections[:]:
+                if artist is not shaded:
+                    artist.remove()
+        if getattr(self, "shaded_collection", None) is not None:
+            self.shaded_collection.set_visible(False)
 
         self.log("Calculando parametros da camera...")
-        M = self.cam
-        K = np.array([[self.params_intrinsc_values['dist_focal:']*self.params_intrinsc_values["sx:"], 
-                            self.params_intrinsc_values['dist_focal:']*self.params_intrinsc_values["s_theta:"], 
-                            self.params_intrinsc_values["ox:"]],
-                            [0, self.params_intrinsc_values['dist_focal:']*self.params_intrinsc_values["sy:"],
-                            self.params_intrinsc_values["oy:"]], [0, 0, 1]])
-        
-        M_ext = np.linalg.inv(M)
-        M_x = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]])
-        P = np.dot(K, np.dot(M_x, M_ext))
-        URSO = np.dot(P, self.urso)
-        
-        # Verificar se a terceira coordenada homogênea tem zeros
-        erro=False
-        if np.any(URSO[2] == 0):
-            erro=True
-            URSO[2] = 1 
-            self.log("Erro de Projeção: A terceira coordenada homogenea contem zeros. A projecao nao pode ser calculada.")
-
-        # Normalizar as coordenadas 2D
-        if (erro):
-            QMessageBox.warning( "Erro de Projeção", 
-                            "A terceira coordenada homogênea contém zeros. A projeção não pode ser calculada.")
-
-            
+        K = intrinsic_matrix(self.params_intrinsc_values)
+        P = projection_matrix(self.cam, K)
+
+        if self.urso_vectors is None:
+            # Nuvem de pontos: imagem de densidade em vez de linhas
+            self.plot_density(P, K)
+        elif getattr(self, "render_mode", "wireframe") == "silhouette" and self.mesh_data is not None:
+            self.plot_silhouette(P, K)
+        elif getattr(self, "render_mode", "wireframe") == "shaded" and self.mesh_data is not None:
+            self.plot_shaded(K)
         else:
-            self.log("Terceira coordenada homogenea nao contem zeros. Projecao calculada com sucesso.")
-            URSO_2D = URSO / URSO[2]
+            mesh = self.scene if self.scene is not None else self.urso
+            key = projection_key("wireframe", mesh, self.cam, self.params_intrinsc_values)
+            cached = self.projection_cache.get(key)
+            if cached is not None:
+                # Vista ja visitada (reset, desfazer, ...): nenhuma projecao a refazer
+                self.log("Projecao reaproveitada do cache.")
+                URSO_2D, valid = cached
+            else:
+                URSO_2D, valid = project_view(mesh, self.cam, self.params_intrinsc_values)
+                self.projection_cache.put(key, (URSO_2D, valid))
+
+            # Verificar se a terceira coordenada homogênea tem zeros
+            if not valid:
+                self.log("Erro de Projeção: A terceira coordenada homogenea contem zeros. A projecao nao pode ser calculada.")
+                QMessageBox.warning(self, "Erro de Projeção", 
+                                "A terceira coordenada homogênea contém zeros. A projeção não pode ser calculada.")
+            else:
+                self.log("Terceira coordenada homogenea nao contem zeros. Projecao calculada com sucesso.")
+            self.ax1.plot(URSO_2D[0],URSO_2D[1])
 
         self.log("Configurando limites do plot...");
         self.ax1.set_xlim([0, self.params_intrinsc_values['n_pixels_base:']])
         self.ax1.set_ylim([self.params_intrinsc_values['n_pixels_altura:'],0])   
-        self.ax1.plot(URSO_2D[0],URSO_2D[1])
         self.ax1.grid('True')
         self.ax1.set_aspect('equal')
 
         self.log("Carregando Canvas...")
-        self.canvas_layout.addWidget(self.canvas1)
+        self.canvas1.draw_idle()
 
         self.log("Plot 2D configurado com sucesso.")
         self.log("Saindo da funcao plot2d")
@@ -185,6 +257,148 @@ class Plots:
         self.log("-----------------------------------------")
 
 
+    def instance_transforms(self):
+        """
+        Transformações das cópias desenhadas a partir de `self.mesh_data` (só a identidade sem instanciamento).
+        """
+        if hasattr(self.scene, "transforms"):
+            return self.scene.transforms
+        return np.eye(4)[None]
+
+    def plot_silhouette(self, P, K):
+        """
+        Desenha na imagem 2D apenas o contorno do objeto visto da câmera atual.
+
+        As arestas do contorno são escolhidas a partir das normais e da vizinhança dos triângulos (`self.mesh_data`)
+        e da posição da câmera; só os vértices dessas arestas são projetados, e todas as arestas são desenhadas
+        com um único `plot`.
+
+        Parâmetros:
+        -----------
+        - `P` (numpy.ndarray): Matriz de projeção 3x4.
+        - `K` (numpy.ndarray): Matriz de calibração intrínseca 3x3 (usada no estágio de distorção).
+        """
+        self.log("Extraindo arestas do contorno...")
+        coeffs = distortion_coefficients(self.params_intrinsc_values)
+        segments, count = [], 0
+        for T in self.instance_transforms():
+            # Contorno de cada instância com a câmera no referencial da malha única
+            edges = silhouette_edges(self.mesh_data, np.linalg.solve(T, self.cam)[:3, 3])
+            used, inverse = np.unique(edges, return_inverse=True)
+            vertices = np.vstack((self.mesh_data.vertices[used].T, np.ones(len(used))))
+            points_2d, valid = project_points(np.dot(P, T), vertices)
+            if not valid:
+                self.log("Erro de Projeção: A terceira coordenada homogenea contem zeros. A projecao nao pode ser calculada.")
+            if has_distortion(coeffs):
+                points_2d = apply_distortion(points_2d, K, coeffs)
+            segments.append(edge_segments(points_2d, inverse.reshape(-1, 2)))
+            count += len(edges)
+        self.ax1.plot(*np.hstack(segments))
+        self.log(f"Arestas do contorno: {count} de {len(self.mesh_data.edges)*len(segments)}")
+
+    def plot_shaded(self, K):
+        """
+        Desenha na imagem 2D os triângulos preenchidos, com sombreamento de Lambert e ordenados por profundidade.
+
+        A luz fica junto da câmera (ver `shade_faces`). Todos os triângulos são desenhados por uma única
+        `PolyCollection` (`self.shaded_collection`), criada uma única vez no eixo persistente `self.ax1`; a cada
+        quadro os triângulos e as cores são atualizados no lugar por `update_collection`.
+
+        Parâmetros:
+        -----------
+        - `K` (numpy.ndarray): Matriz de calibração intrínseca 3x3.
+        """
+        self.log("Sombreando triangulos...")
+        transforms = self.instance_transforms()
+        # Instâncias da mais distante para a mais próxima (as cópias não se interpenetram); dentro de cada uma, os
+        # triângulos já vêm ordenados por `shade_faces`
+        centers = np.dot(transforms, np.append(self.mesh_data.sphere_center, 1))
+        depth = np.dot(centers, np.linalg.inv(self.cam)[2])
+        shaded = [shade_faces(self.mesh_data.vectors, self.mesh_data.normals, np.linalg.solve(T, self.cam), K)
+                  for T in transforms[np.argsort(-depth, kind='stable')]]
+        polygons = np.concatenate([polygons for polygons, _, _ in shaded])
+        colors = np.concatenate([colors for _, colors, _ in shaded])
+        coeffs = distortion_coefficients(self.params_intrinsc_values)
+        if has_distortion(coeffs) and len(polygons):
+            flat = np.vstack((polygons.reshape(-1, 2).T, np.ones(polygons.shape[0]*3)))
+            polygons = apply_distortion(flat, K, coeffs)[:2].T.reshape(-1, 3, 2)
+        if getattr(self, "shaded_collection", None) is None:
+            from matplotlib.collections import PolyCollection
+            self.shaded_collection = PolyCollection([], edgecolors='none')
+            self.ax1.add_collection(self.shaded_collection)
+        update_collection(self.shaded_collection, polygons, colors)
+        self.shaded_collection.set_visible(True)
+        self.log(f"Triangulos desenhados: {len(polygons)} de {len(self.mesh_data.vectors)*len(transforms)}")
+
+    def plot_density(self, P, K):
+        """
+        Desenha a projeção de uma nuvem de pontos como imagem de densidade (pontos por pixel).
+
+        Usado por `plot2d` quando a entrada é uma nuvem de pontos (`self.urso_vectors` é None). Desenhar milhões de
+        pontos como linhas é inviável; a projeção é acumulada em blocos por `density_image` e exibida com `imshow`
+        em escala logarítmica. Com distorção de lente, a imagem rasterizada é distorcida por um mapa pré-calculado
+        (`undistortion_map`), que só é recalculado quando K, os coeficientes ou a resolução mudam.
+
+        Parâmetros:
+        -----------
+        - `P` (numpy.ndarray, shape (3, 4)): Matriz de projeção da câmera.
+        - `K` (numpy.ndarray, shape (3, 3)): Matriz de calibração intrínseca.
+
+        Variáveis envolvidas:
+        ----------------------
+        - `self.urso`: A nuvem de pontos em coordenadas homogêneas 4xN.
+        - `self.ax1`: O eixo 2D onde a imagem de densidade é desenhada.
+        - `self.undistortion_lookup`: Mapa de distorção em cache (e `self.undistortion_key`, a chave dele).
+        - `self.projection_cache`: Cache LRU das imagens de densidade já calculadas, por pose e parâmetros intrínsecos.
+        """
+        self.log("Projetando nuvem de pontos como imagem de densidade...")
+        width = self.params_intrinsc_values['n_pixels_base:']
+        height = self.params_intrinsc_values['n_pixels_altura:']
+        cache_key = projection_key("density", self.urso, self.cam, self.params_intrinsc_values)
+        density = self.projection_cache.get(cache_key)
+        if density is not None:
+            self.log("Imagem de densidade reaproveitada do cache.")
+        else:
+            density = density_image(P, self.urso, width, height)
+
+            coeffs = distortion_coefficients(self.params_intrinsc_values)
+            if has_distortion(coeffs):
+                key = (K.tobytes(), coeffs.tobytes(), width, height)
+                if getattr(self, 'undistortion_key', None) != key:
+                    self.log("Calculando mapa de distorcao...")
+                    self.undistortion_lookup = undistortion_map(K, coeffs, width, height)
+                    self.undistortion_key = key
+                density = remap(density, self.undistortion_lookup)
+            self.projection_cache.put(cache_key, density)
+        self.ax1.imshow(np.log1p(density), extent=(0, width, height, 0), cmap='viridis', interpolation='nearest')
+        self.log(f"Pontos visiveis na imagem: {int(density.sum())} de {self.urso.shape[1]}")
+
+    def projected_extent(self, P=None):
+        """
+        Calcula a caixa envolvente 2D do objeto carregado e se ele cabe inteiro na imagem, sem projetar todos os vértices.
+
+        Os pontos do fecho convexo (ou da caixa orientada) de `self.urso` são calculados na primeira chamada e
+        guardados em `self.urso_hull`; cada consulta seguinte projeta apenas esses pontos.
+
+        Parâmetros:
+        -----------
+        - `P` (numpy.ndarray, opcional): Matriz de projeção 3x4 (padrão: a da câmera e dos intrínsecos atuais).
+
+        Retorna:
+        --------
+        - `bbox` (numpy.ndarray): (u_min, v_min, u_max, v_max) em pixels (NaN se o objeto cruza o plano da câmera).
+        - `in_frame` (bool): True quando o objeto cabe inteiro na imagem.
+        """
+        if getattr(self, "urso_hull_source", None) is not self.urso:
+            self.log("Calculando o fecho convexo da malha...")
+            self.urso_hull, exact = hull_points(self.urso)
+            self.urso_hull_source = self.urso
+            self.log(f"Fecho com {self.urso_hull.shape[1]} pontos (exato: {exact}).")
+        if P is None:
+            P = projection_matrix(self.cam, intrinsic_matrix(self.params_intrinsc_values))
+        return projected_bbox(P, self.urso_hull, self.params_intrinsc_values['n_pixels_base:'],
+                              self.params_intrinsc_values['n_pixels_altura:'])
+
     def projection_2d(self):
         """
         Calcula os parâmetros de escala e os pontos principais para a projeção 2D da câmera.
@@ -214,10 +428,7 @@ class Plots:
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: projection_2d")
         self.log("Calculando projeção 2D..")
-        self.params_intrinsc_values['sx:'] = self.params_intrinsc_values['n_pixels_base:']/self.params_intrinsc_values["ccd_x:"]
-        self.params_intrinsc_values["sy:"] = self.params_intrinsc_values['n_pixels_altura:']/self.params_intrinsc_values["ccd_y:"]
-        self.params_intrinsc_values["ox:"] = self.params_intrinsc_values['n_pixels_base:']/2
-        self.params_intrinsc_values["oy:"] = self.params_intrinsc_values['n_pixels_altura:']/2
+        derive_intrinsics(self.params_intrinsc_values)
         self.log("Projeção 2D calculada com sucesso!")
         self.log("Novos valores intrínsecos:")
         self.log(f"sx: {self.params_intrinsc_values['sx:']} | sy: {self.params_intrinsc_values['sy:']} | ox: {self.params_intrinsc_values['ox:']} | oy: {self.params_intrinsc_values['oy:']}")
@@ -231,15 +442,14 @@ class Plots:
         Cria e retorna um widget contendo um canvas para exibição de gráficos 3D e 2D utilizando Matplotlib.
 
         Este método cria um `QWidget` para ser usado como o canvas de exibição de gráficos 3D e 2D. O canvas
-        é configurado com um layout horizontal e os gráficos de projeção 2D e 3D são gerados e exibidos.
+        é configurado com um layout horizontal; os gráficos são desenhados depois, no primeiro quadro, para que a 
+        janela apareça sem esperar pelo matplotlib.
 
         Passos realizados:
         -------------------
         1. Cria um widget (`QWidget`) que servirá como o canvas para renderização dos gráficos.
         2. Define um layout horizontal (`QHBoxLayout`) para o widget, onde os gráficos serão colocados.
-        3. Chama os métodos `projection_2d()`, `plot3d()`, e `plot2d()` para gerar e exibir os gráficos de 
-        projeção 2D e gráficos 3D.
-        4. Retorna o widget (`self.canvas_widget`) que contém o canvas com os gráficos renderizados.
+        3. Retorna o widget (`self.canvas_widget`), ainda vazio.
 
         Variáveis afetadas:
         -------------------
@@ -248,7 +458,7 @@ class Plots:
 
         Retorno:
         --------
-        - Retorna o widget `self.canvas_widget`, que contém o canvas com os gráficos renderizados.
+        - Retorna o widget `self.canvas_widget`, onde os gráficos serão renderizados.
 
         """
         self.log("-----------------------------------------")
@@ -258,60 +468,129 @@ class Plots:
         self.canvas_layout = QHBoxLayout()
         self.canvas_widget.setLayout(self.canvas_layout)
 
-        self.log("Criando graficos 3D e 2D...")
-        self.projection_2d()
-        self.plot2d()
-        self.plot3d()
-
-        self.log("Graficos criados com sucesso.")
+        # Os graficos (e a projecao 2D) sao calculados uma unica vez, no primeiro quadro (ver `first_frame`)
+        self.log("Area de desenho criada com sucesso.")
         self.log("-----------------------------------------")
         self.log("-----------------------------------------")
         return self.canvas_widget
 
 
-    def update_canvas(self):
+    def update_canvas(self, views=None):
         """
-        Limpa os widgets do layout do canvas, fecha figuras existentes e re-renderiza os gráficos.
+        Remove do layout os gráficos desatualizados e os re-renderiza.
 
-        Este método é responsável por limpar o layout onde os gráficos são exibidos, fechando qualquer figura existente 
-        e removendo os widgets associados do layout. Após limpar a tela, ele chama as funções `plot3d()` e `plot2d()` 
-        para re-renderizar os gráficos 3D e 2D com os dados mais atualizados.
+        Este método é responsável por limpar o layout onde os gráficos são exibidos, removendo os widgets das vistas
+        que serão refeitas. Em seguida, chama as funções `plot2d()` e/ou `plot3d()` para re-renderizar os gráficos com
+        os dados mais atualizados. As vistas são independentes: mudar só os parâmetros intrínsecos, por exemplo, refaz
+        apenas a imagem 2D (ver `request_render`).
 
         Passos realizados:
         -------------------
-        1. Itera sobre os itens no layout `self.canvas_layout` e remove todos os widgets associados.
-        2. Fecha as figuras existentes, `self.fig1` (gráfico 2D) e `self.fig2` (gráfico 3D), caso estejam definidas.
-        3. Chama o método `plot3d()` para gerar e exibir novamente o gráfico 3D.
-        4. Chama o método `plot2d()` para gerar e exibir novamente o gráfico 2D.
+        1. Sincroniza o estado da cena (`sync_scene_state()`).
+        2. Remove do layout `self.canvas_layout` o widget 3D, se a vista 3D foi pedida.
+        3. Chama o método `plot2d()` para gerar e exibir novamente o gráfico 2D, se pedido.
+        4. Chama o método `plot3d()` para gerar e exibir novamente o gráfico 3D, se pedido.
+        5. Registra no estado da cena as versões com que as vistas foram desenhadas.
+
+        Parâmetros:
+        -----------
+        - `views` (iterable, opcional): Vistas a redesenhar ("2d", "3d"). Por padrão, ambas.
 
         Variáveis envolvidas:
         ----------------------
         - `self.canvas_layout`: O layout do widget onde os gráficos são exibidos. Os widgets antigos são removidos antes de re-renderizar os gráficos.
-        - `self.fig1`: A figura Matplotlib que contém o gráfico 2D. Esta figura é fechada antes de ser recriada.
-        - `self.fig2`: A figura Matplotlib que contém o gráfico 3D. Esta figura é fechada antes de ser recriada.
+        - `self.fig1`: A figura Matplotlib que contém o gráfico 2D (criada uma vez e reaproveitada por `plot2d`).
+        - `self.fig2`: A figura Matplotlib que contém o gráfico 3D (recriada quando a vista 3D é atualizada).
+        - `self.scene_state`: Estado observável da cena, com as versões de cada parte.
         - `self.plot3d`: Função que desenha o gráfico 3D.
         - `self.plot2d`: Função que desenha o gráfico 2D.
         """
 
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: update_canvas")
-        self.log("Limpando layout antigo do canvas...")
-        while self.canvas_layout.count():
-            item = self.canvas_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
+        views = ("2d", "3d") if views is None else tuple(views)
+        self.sync_scene_state()
+        self.log(f"Limpando layout antigo do canvas ({', '.join(views)})...")
+        # A figura 2D é persistente (ver `plot2d`); só o widget 3D é recriado
+        stale_widgets = {"3d": getattr(self, "canvas2", None)}
+        for view in views:
+            widget = stale_widgets.get(view)
+            if widget is not None and self.canvas_layout.indexOf(widget) >= 0:
+                self.canvas_layout.removeWidget(widget)
                 widget.deleteLater()
 
         self.log("Atualizando canvas...")
-        if hasattr(self, 'fig1'):  
-            plt.close(self.fig1)
-
-        if hasattr(self, 'fig2'): 
-            plt.close(self.fig2)
-
-        self.plot2d()
-        self.plot3d()
+        if "2d" in views:
+            self.plot2d()
+        if "3d" in views:
+            self.plot3d()
+        self.scene_state.mark_drawn(views)
+        self.render_dirty = False
         self.log("Canvas atualizado com sucesso.")
         self.log("Saindo da funcao update_canvas")
         self.log("-----------------------------------------")
         self.log("-----------------------------------------")
+
+    def sync_scene_state(self):
+        """
+        Copia a pose, os parâmetros intrínsecos, a malha e o modo de desenho atuais para `self.scene_state`.
+
+        Retorna:
+            changed (list): Partes do estado que mudaram desde a última sincronização.
+        """
+        mesh = self.scene if self.scene is not None else self.urso
+        return self.scene_state.update(pose=self.cam, intrinsics=self.params_intrinsc_values,
+                                       mesh=(mesh, geometry_version(mesh)),
+                                       render_mode=getattr(self, "render_mode", "wireframe"))
+
+    def request_render(self):
+        """
+        Pede que os gráficos sejam redesenhados.
+
+        Depois da inicialização, o estado da cena é sincronizado e só as vistas cujas dependências mudaram são
+        refeitas; se nada mudou (ex.: uma rotação de 0 graus), nada é desenhado. Durante a inicialização (`self.init_state` diferente de
+        `INIT_READY`) o pedido só marca a cena como suja (`self.render_dirty`): vários pedidos feitos enquanto os
+        valores padrão são definidos resultam em um único desenho, feito por `set_init_state(INIT_READY)`.
+        """
+        self.render_dirty = True
+        if getattr(self, "init_state", INIT_READY) != INIT_READY:
+            self.log(f"Desenho adiado (estado de inicializacao: {self.init_state})")
+            return
+        if getattr(self, "render_batch", 0):
+            self.log("Desenho adiado ate o fim da atualizacao em lote")
+            return
+        changed = self.sync_scene_state()
+        views = self.scene_state.stale_views()
+        self.render_dirty = False
+        if not views:
+            self.log("Nenhuma alteracao na cena: desenho ignorado")
+            return
+        self.log(f"Partes alteradas: {changed} | vistas redesenhadas: {views}")
+        self.update_canvas(views)
+
+    @contextmanager
+    def batch_render(self):
+        """
+        Agrupa os pedidos de desenho feitos dentro do bloco `with` em um único `request_render` no final.
+
+        Usado pelos botões "Atualizar", que aplicam vários campos em sequência: cada campo só altera o estado da cena
+        e os gráficos são refeitos uma única vez, apenas nas vistas afetadas.
+        """
+        self.render_batch = getattr(self, "render_batch", 0) + 1
+        try:
+            yield
+        finally:
+            self.render_batch -= 1
+            if self.render_batch == 0 and self.render_dirty:
+                self.request_render()
+
+    def set_init_state(self, state):
+        """
+        Avança a máquina de estados da inicialização (INIT_CREATED -> INIT_CONFIGURING -> INIT_READY).
+
+        Ao chegar em INIT_READY, desenha os gráficos uma única vez se algum desenho foi pedido durante a inicialização.
+        """
+        self.log(f"Estado de inicializacao: {getattr(self, 'init_state', None)} -> {state}")
+        self.init_state = state
+        if state == INIT_READY and getattr(self, "render_dirty", False):
+            self.update_canvas()
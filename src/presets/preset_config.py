@@ -0,0 +1,56 @@
+from PyQt5.QtWidgets import QFileDialog, QInputDialog, QMessageBox
+
+from src.presets.presets import load_preset
+
+
+class Presets:
+    def open_preset(self):
+        """
+        Abre um arquivo de preset (.json ou .toml) escolhido pelo usuário e aplica uma das vistas dele.
+        """
+        filepath, _ = QFileDialog.getOpenFileName(self, "Carregar preset", "", "Presets (*.json *.toml)")
+        if filepath:
+            self.apply_preset(filepath)
+
+    def apply_preset(self, filepath, view_name=None, ask=True):
+        """
+        Aplica uma vista de um preset: pose absoluta e parâmetros intrínsecos de uma só vez.
+
+        O preset inteiro é validado antes de qualquer alteração (`load_preset`); em seguida a vista é aplicada por
+        `restore_state`, o que gera um único registro no histórico e um único desenho. Quando o preset tem várias
+        vistas e `view_name` não é informado, o usuário escolhe a vista (ou a primeira é usada, com `ask=False`).
+
+        Parâmetros:
+        -----------
+        - `filepath` (str): Arquivo de preset.
+        - `view_name` (str, opcional): Nome da vista a aplicar.
+        - `ask` (bool, opcional): Pergunta qual vista aplicar quando `view_name` não é informado.
+
+        Retorna:
+        --------
+        - `bool`: True quando a vista foi aplicada.
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: apply_preset")
+        self.log(f"Carregando preset: {filepath}")
+        try:
+            views = load_preset(filepath, params=self.params_intrinsc_values)
+        except (OSError, ValueError) as e:
+            self.log(f"Preset invalido: {e}")
+            QMessageBox.warning(self, "Erro no preset", str(e))
+            return False
+
+        names = [view["name"] for view in views]
+        if view_name is not None and view_name not in names:
+            QMessageBox.warning(self, "Erro no preset", f"Vista nao encontrada no preset: {view_name}")
+            return False
+        if view_name is None and ask and len(views) > 1:
+            view_name, ok = QInputDialog.getItem(self, "Carregar preset", "Vista:", names, 0, False)
+            if not ok:
+                return False
+        view = views[names.index(view_name)] if view_name in names else views[0]
+        self.restore_state(view["cam"], view["params"])
+        self.log(f"Vista '{view['name']}' aplicada ({len(views)} vista(s) no preset).")
+        self.log("Saindo da funcao apply_preset")
+        self.log("-----------------------------------------")
+        return True
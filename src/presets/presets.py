@@ -0,0 +1,199 @@
+import argparse
+import json
+
+import numpy as np
+
+from src.camera.initialize_camera import initialize_camera
+from src.rig.rig import CameraRig
+from src.sweep.sweep import CHUNK_ELEMENTS, POSE_KEYS, footprint_metrics
+from src.utils.meshes import DEFAULT_MESH, load_mesh
+from src.utils.projection import INTRINSIC_LIMITS, default_intrinsics, derive_intrinsics, validate_intrinsics
+from src.utils.transformations import field_transform
+
+# Formato de um preset (JSON ou TOML, com a mesma estrutura):
+#
+#   name = "inspecao"
+#   [intrinsics]                  # modelo de câmera de base (campos de INTRINSIC_LIMITS, com ou sem ':')
+#   dist_focal = 20
+#   [[views]]                     # poses; sem "views", o preset tem uma única vista na pose inicial
+#   name = "frente"
+#   world = { "X(angle)" = 15 }   # campos de pose aplicados à pose inicial, como em `world_action`
+#   [[views]]
+#   name = "topo"
+#   cam = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 80], [0, 0, 0, 1]]   # pose 4x4 absoluta (como `self.cam`)
+#   intrinsics = { dist_focal = 35 }                                  # parâmetros próprios da vista
+VIEW_KEYS = ("name", "cam", "world", "intrinsics")
+
+# Tolerância da verificação de poses absolutas (presets escritos à mão costumam ter senos e cossenos arredondados)
+POSE_TOLERANCE = 1e-3
+
+
+def field_key(key):
+    """
+    Acrescenta o ':' final dos nomes de campo da interface ("dist_focal" -> "dist_focal:").
+    """
+    key = key.strip()
+    return key if key.endswith(":") else key + ":"
+
+
+def read_preset(filepath):
+    """
+    Lê um arquivo de preset `.json` ou `.toml` (o TOML usa `tomllib`, do Python 3.11, ou o pacote `tomli`).
+
+    Parâmetros:
+        filepath (str): Caminho do arquivo.
+
+    Retorna:
+        data (dict): Conteúdo do arquivo.
+    """
+    if filepath.lower().endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError("Presets TOML precisam do Python 3.11 ou do pacote 'tomli'; use um preset JSON.")
+        with open(filepath, "rb") as f:
+            return tomllib.load(f)
+    with open(filepath, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def preset_pose(value, i):
+    """
+    Valida a pose 4x4 absoluta de uma vista: rotação ortonormal própria (det = +1) e última linha [0, 0, 0, 1].
+
+    Retorna:
+        cam (numpy.ndarray): Pose 4x4.
+    """
+    try:
+        cam = np.asarray(value, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError(f"A pose da vista {i} precisa ser uma matriz 4x4 de numeros")
+    if cam.shape != (4, 4) or not np.isfinite(cam).all():
+        raise ValueError(f"A pose da vista {i} precisa ser uma matriz 4x4 de numeros")
+    R = cam[:3, :3]
+    if not np.allclose(np.dot(R.T, R), np.eye(3), atol=POSE_TOLERANCE) or np.linalg.det(R) <= 0:
+        raise ValueError(f"A rotacao da pose da vista {i} nao e ortonormal com determinante +1")
+    if not np.allclose(cam[3], [0, 0, 0, 1], atol=POSE_TOLERANCE):
+        raise ValueError(f"A ultima linha da pose da vista {i} precisa ser [0, 0, 0, 1]")
+    return cam
+
+
+def preset_intrinsics(values, base):
+    """
+    Sobrescreve `base` com os parâmetros intrínsecos do preset, validando nomes e limites.
+
+    Retorna:
+        params (dict): Parâmetros completos, com sx, sy, ox e oy recalculados.
+    """
+    if values is not None and not isinstance(values, dict):
+        raise ValueError("Os parametros intrinsecos do preset precisam ser uma tabela de campos")
+    params = dict(base)
+    for key, value in (values or {}).items():
+        key = field_key(key)
+        if key not in INTRINSIC_LIMITS:
+            raise ValueError(f"Parametro intrinseco desconhecido no preset: {key}")
+        params[key] = value
+    invalid_fields = validate_intrinsics(params)
+    if invalid_fields:
+        raise ValueError("Os seguintes campos estao fora dos limites ou invalidos:\n\n" + "\n".join(invalid_fields))
+    params = {key: float(value) for key, value in params.items()}
+    return derive_intrinsics(params)
+
+
+def preset_views(data, cam=None, params=None):
+    """
+    Converte o conteúdo de um preset na lista de vistas (pose absoluta e parâmetros intrínsecos completos).
+
+    Parâmetros:
+        data (dict): Conteúdo lido por `read_preset`.
+        cam (numpy.ndarray): Pose inicial à qual os campos "world" são aplicados (padrão: `initialize_camera`).
+        params (dict): Parâmetros intrínsecos de base (padrão: `default_intrinsics`).
+
+    Retorna:
+        views (list): Uma entrada {"name", "cam", "params"} por vista.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("O preset precisa ser uma tabela (objeto JSON) com 'intrinsics' e 'views'")
+    cam = initialize_camera()['cam'] if cam is None else np.asarray(cam, dtype=float)
+    base = preset_intrinsics(data.get("intrinsics"), default_intrinsics() if params is None else params)
+    view_list = data.get("views") or [{}]
+    if not isinstance(view_list, list):
+        raise ValueError("O campo 'views' do preset precisa ser uma lista de vistas")
+    views = []
+    for i, view in enumerate(view_list):
+        if not isinstance(view, dict):
+            raise ValueError(f"A vista {i} precisa ser uma tabela de campos")
+        unknown = set(view) - set(VIEW_KEYS)
+        if unknown:
+            raise ValueError(f"Campos desconhecidos na vista {i}: {sorted(unknown)}")
+        view_cam = preset_pose(view["cam"], i) if "cam" in view else cam.copy()
+        world = view.get("world") or {}
+        if not isinstance(world, dict):
+            raise ValueError(f"O campo 'world' da vista {i} precisa ser uma tabela de campos de pose")
+        for key, value in world.items():
+            key = field_key(key)
+            if key not in POSE_KEYS:
+                raise ValueError(f"Campo de pose desconhecido na vista {i}: {key}")
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"Valor invalido para {key} na vista {i}: {value!r}")
+            view_cam = np.dot(field_transform(key, value), view_cam)
+        views.append({
+            "name": str(view.get("name", f"{data.get('name', 'vista')} {i + 1}")),
+            "cam": view_cam,
+            "params": preset_intrinsics(view.get("intrinsics"), base),
+        })
+    return views
+
+
+def load_preset(filepath, cam=None, params=None):
+    """
+    Lê e valida um preset (ver `preset_views`).
+    """
+    return preset_views(read_preset(filepath), cam, params)
+
+
+def render_views(views, points, chunk_elements=CHUNK_ELEMENTS):
+    """
+    Projeta a malha em todas as vistas de um preset de uma vez, tratando as vistas como um rig de câmeras
+    (`CameraRig.project`).
+
+    Parâmetros:
+        views (list): Vistas de `preset_views`.
+        points (numpy.ndarray): Malha em coordenadas homogêneas 4xN (como `self.urso`).
+        chunk_elements (int): Limite de vistas x vértices projetados por bloco.
+
+    Retorna:
+        results (dict): `names`, os pontos projetados `points_2d` (B, 2, N), a profundidade `depth` (B, N) e as
+        métricas de `footprint_metrics` de cada vista.
+    """
+    rig = CameraRig.from_views(views)
+    points_2d, depth = rig.project(points, chunk_elements=chunk_elements)
+    width, height = rig.sizes()
+
+    results = {"names": np.array([view["name"] for view in views], dtype=str), "points_2d": points_2d,
+               "depth": depth}
+    results.update(footprint_metrics(points_2d, depth, width, height))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Projeta a malha em todas as vistas de um preset.")
+    parser.add_argument("preset", help="Arquivo de preset (.json ou .toml).")
+    parser.add_argument("--mesh", default=DEFAULT_MESH, help="Malha STL ou nuvem de pontos.")
+    parser.add_argument("--output", default="preset.npz", help="Arquivo .npz com as projecoes e metricas.")
+    args = parser.parse_args()
+
+    urso, _ = load_mesh(args.mesh)
+    views = load_preset(args.preset)
+    results = render_views(views, urso)
+    np.savez(args.output, **results)
+    print(f"[LOG] {len(views)} vistas salvas em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import numpy as np
+
+# Direção da luz no referencial da câmera (apontando da superfície para a luz): luz junto da câmera
+DEFAULT_LIGHT = np.array([0.0, 0.0, -1.0])
+
+# Cor base das faces (RGB) e intensidade mínima (luz ambiente)
+BASE_COLOR = np.array([0.85, 0.65, 0.45])
+AMBIENT = 0.15
+
+
+def lambert_intensity(normals, M_ext, light=DEFAULT_LIGHT, ambient=AMBIENT):
+    """
+    Calcula a intensidade de Lambert de cada face, com a luz definida no referencial da câmera.
+
+    As faces são iluminadas dos dois lados (|n · l|), pois a ordem dos vértices dos arquivos STL nem sempre é
+    consistente; as faces de trás ficam escondidas pela ordenação por profundidade.
+
+    Parâmetros:
+        normals (numpy.ndarray): Normais unitárias no mundo (T, 3).
+        M_ext (numpy.ndarray): Matriz extrínseca 4x4 (inv(cam)).
+        light (numpy.ndarray): Direção da luz no referencial da câmera (3,).
+        ambient (float): Intensidade mínima.
+
+    Retorna:
+        intensity (numpy.ndarray): Intensidades (T,) entre `ambient` e 1.
+    """
+    light = np.asarray(light, dtype=float)
+    light = light/np.linalg.norm(light)
+    normals_cam = np.dot(normals, M_ext[:3, :3].T)
+    return ambient + (1 - ambient)*np.abs(np.dot(normals_cam, light))
+
+
+def shade_faces(vectors, normals, cam, K, light=DEFAULT_LIGHT, ambient=AMBIENT):
+    """
+    Projeta os triângulos, calcula a cor de cada um e os ordena do mais distante para o mais próximo (algoritmo
+    do pintor, com um único `argsort`).
+
+    Parâmetros:
+        vectors (numpy.ndarray): Triângulos no mundo (T, 3, 3).
+        normals (numpy.ndarray): Normais unitárias (T, 3).
+        cam (numpy.ndarray): Pose 4x4 da câmera (`self.cam`).
+        K (numpy.ndarray): Matriz intrínseca 3x3.
+        light (numpy.ndarray): Direção da luz no referencial da câmera.
+        ambient (float): Intensidade mínima.
+
+    Retorna:
+        polygons (numpy.ndarray): Triângulos projetados (F, 3, 2), ordenados de trás para frente. Triângulos com
+            algum vértice atrás da câmera são descartados.
+        colors (numpy.ndarray): Cor RGB de cada triângulo (F, 3).
+        order (numpy.ndarray): Índice original de cada triângulo desenhado (F,).
+    """
+    M_ext = np.linalg.inv(cam)
+    camera_points = np.dot(vectors, M_ext[:3, :3].T) + M_ext[:3, 3]
+    depth = camera_points[..., 2]
+    visible = np.flatnonzero(np.all(depth > 0, axis=1))
+    order = visible[np.argsort(-depth[visible].mean(axis=1), kind='stable')]
+
+    pixels = np.dot(camera_points[order], K.T)
+    polygons = pixels[..., :2]/pixels[..., 2:3]
+    intensity = lambert_intensity(normals[order], M_ext, light, ambient)
+    return polygons, intensity[:, None]*BASE_COLOR, order
+
+
+def update_collection(collection, polygons, colors):
+    """
+    Atualiza no lugar os triângulos e as cores de uma `PolyCollection` já adicionada ao eixo.
+    """
+    collection.set_verts(polygons)
+    collection.set_facecolor(colors)
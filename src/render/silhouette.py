@@ -0,0 +1,52 @@
+import numpy as np
+
+
+def front_facing(normals, face_points, eye):
+    """
+    Indica quais triângulos estão voltados para a câmera.
+
+    Parâmetros:
+        normals (numpy.ndarray): Normais dos triângulos (T, 3).
+        face_points (numpy.ndarray): Um vértice de cada triângulo (T, 3).
+        eye (numpy.ndarray): Centro óptico da câmera no mundo (3,), ou seja, `cam[:3, 3]`.
+
+    Retorna:
+        front (numpy.ndarray): Máscara booleana (T,).
+    """
+    return np.einsum('ij,ij->i', normals, eye - face_points) > 0
+
+
+def silhouette_edges(mesh_data, eye):
+    """
+    Seleciona as arestas do contorno visto da câmera: arestas entre um triângulo de frente e um de costas, mais as
+    arestas de borda dos triângulos de frente.
+
+    Parâmetros:
+        mesh_data (MeshData): Dados derivados da malha (normais, arestas e triângulos de cada aresta).
+        eye (numpy.ndarray): Centro óptico da câmera no mundo (3,).
+
+    Retorna:
+        edges (numpy.ndarray): Arestas do contorno (S, 2), como índices em `mesh_data.vertices`.
+    """
+    front = front_facing(mesh_data.normals, mesh_data.vertices[mesh_data.faces[:, 0]], eye)
+    first, second = mesh_data.edge_faces[:, 0], mesh_data.edge_faces[:, 1]
+    boundary = second < 0
+    contour = np.where(boundary, front[first], front[first] != front[np.where(boundary, first, second)])
+    return mesh_data.edges[contour]
+
+
+def edge_segments(points_2d, edges):
+    """
+    Monta uma única polilinha com as arestas separadas por NaN, para desenhá-las com um só `plot`.
+
+    Parâmetros:
+        points_2d (numpy.ndarray): Vértices projetados (2 ou 3, V).
+        edges (numpy.ndarray): Arestas (S, 2), como índices das colunas de `points_2d`.
+
+    Retorna:
+        segments (numpy.ndarray): Coordenadas 2x(3S): (início, fim, NaN) de cada aresta.
+    """
+    segments = np.full((2, len(edges), 3), np.nan)
+    segments[:, :, 0] = points_2d[:2, edges[:, 0]]
+    segments[:, :, 1] = points_2d[:2, edges[:, 1]]
+    return segments.reshape(2, -1)
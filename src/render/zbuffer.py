@@ -0,0 +1,236 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.camera.initialize_camera import initialize_camera
+from src.intrinsic.distortion import distortion_coefficients, has_distortion, remap, undistortion_map
+from src.utils.mesh_analysis import MeshData
+from src.utils.meshes import DEFAULT_MESH, load_mesh
+from src.utils.projection import default_intrinsics, intrinsic_matrix
+
+# Número máximo de pixels candidatos (caixas envolventes dos triângulos) testados por bloco
+MAX_CANDIDATES = 4_000_000
+
+# Profundidade mínima (no referencial da câmera) de um vértice para o triângulo ser rasterizado
+NEAR = 1e-6
+
+
+def rasterize(vectors, cam, K, width, height, max_candidates=MAX_CANDIDATES):
+    """
+    Rasteriza os triângulos com z-buffer, de forma vetorizada, com a mesma projeção de `plot2d`.
+
+    Cada triângulo gera os pixels da sua caixa envolvente; todos os candidatos de um bloco são testados de uma vez
+    com coordenadas baricêntricas, a profundidade é interpolada com correção de perspectiva (interpolação de 1/z)
+    e, para cada pixel, fica o candidato mais próximo (mínimo por pixel com `np.minimum.at`, sem ordenação).
+
+    Parâmetros:
+        vectors (numpy.ndarray): Triângulos no mundo (T, 3, 3).
+        cam (numpy.ndarray): Pose 4x4 da câmera (`self.cam`).
+        K (numpy.ndarray): Matriz intrínseca 3x3.
+        width, height (int): Resolução da imagem.
+        max_candidates (int): Limite de pixels candidatos por bloco (controla o uso de memória).
+
+    Retorna:
+        depth (numpy.ndarray): Profundidade z no referencial da câmera (height, width), float32; inf sem objeto.
+        face (numpy.ndarray): Índice do triângulo visível em cada pixel (height, width); -1 sem objeto.
+    """
+    width, height = int(width), int(height)
+    M_ext = np.linalg.inv(cam)
+    camera_points = np.dot(vectors, M_ext[:3, :3].T) + M_ext[:3, 3]
+    z = camera_points[..., 2]
+    pixels = np.dot(camera_points, K.T)
+    uv = pixels[..., :2]/np.where(z > NEAR, pixels[..., 2], 1)[..., None]
+    u, v = uv[..., 0], uv[..., 1]
+
+    # Funções de aresta (coordenadas baricêntricas): w_i(x, y) = A_i x + B_i y + C_i, normalizadas pela área
+    u1, u2, v1, v2 = np.roll(u, -1, axis=1), np.roll(u, -2, axis=1), np.roll(v, -1, axis=1), np.roll(v, -2, axis=1)
+    A, B, C = v1 - v2, u2 - u1, u1*v2 - u2*v1
+    area = C.sum(axis=1)
+
+    u_min = np.clip(np.ceil(u.min(axis=1) - 0.5), 0, width).astype(np.int64)
+    u_max = np.clip(np.floor(u.max(axis=1) - 0.5), -1, width - 1).astype(np.int64)
+    v_min = np.clip(np.ceil(v.min(axis=1) - 0.5), 0, height).astype(np.int64)
+    v_max = np.clip(np.floor(v.max(axis=1) - 0.5), -1, height - 1).astype(np.int64)
+    box_w, box_h = u_max - u_min + 1, v_max - v_min + 1
+    keep = np.all(z > NEAR, axis=1) & (area != 0) & (box_w > 0) & (box_h > 0)
+    triangles = np.flatnonzero(keep)
+    inv_z = 1/np.where(z > NEAR, z, 1)
+    # Coeficientes de cada triângulo em uma única tabela (12, T), para uma só leitura indexada por candidato
+    safe_area = np.where(area != 0, area, 1)[:, None]
+    A, B, C = A/safe_area, B/safe_area, C/safe_area
+    # 1/z também é afim na imagem: 1/z(x, y) = D x + E y + F, com D = Σ A_i/z_i (e assim por diante)
+    plane = np.stack((np.sum(A*inv_z, axis=1), np.sum(B*inv_z, axis=1), np.sum(C*inv_z, axis=1)), axis=1)
+    coefficients = np.concatenate((A, B, C, plane), axis=1).T.copy()
+
+    counts = (box_w*box_h)[triangles]
+    bounds = np.searchsorted(np.cumsum(counts), np.arange(max_candidates, counts.sum() + max_candidates, max_candidates))
+    hits_pixel, hits_depth, hits_face = [], [], []
+    start = 0
+    for stop in np.unique(np.maximum(bounds + 1, 1)):
+        chunk = triangles[start:stop]
+        start = stop
+        if chunk.size == 0:
+            continue
+        # Varredura por linhas: em cada linha da caixa, o intervalo de pixels dentro do triângulo vem direto das
+        # três funções de aresta, então só os pixels cobertos são enumerados
+        rows = box_h[chunk]
+        tri_row = np.repeat(chunk, rows)
+        py = v_min[tri_row] + np.arange(rows.sum()) - np.repeat(np.cumsum(rows) - rows, rows)
+        slope = coefficients[0:3, tri_row]
+        offset = coefficients[3:6, tri_row]*(py + 0.5) + coefficients[6:9, tri_row]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bound = -offset/slope
+        low = np.max(np.where(slope > 0, bound, -np.inf), axis=0)
+        high = np.min(np.where(slope < 0, bound, np.inf), axis=0)
+        x_start = np.maximum(np.ceil(low - 0.5), u_min[tri_row]).astype(np.int64)
+        x_stop = np.minimum(np.floor(high - 0.5), u_max[tri_row]).astype(np.int64)
+        span = np.where(np.any((slope == 0) & (offset < 0), axis=0), 0, np.maximum(x_stop - x_start + 1, 0))
+
+        tri = np.repeat(tri_row, span)
+        px = np.repeat(x_start, span) + np.arange(span.sum()) - np.repeat(np.cumsum(span) - span, span)
+        py = np.repeat(py, span)
+        plane = coefficients[9:12, tri]
+        hits_pixel.append(py*width + px)
+        hits_depth.append((1/(plane[0]*(px + 0.5) + plane[1]*(py + 0.5) + plane[2])).astype(np.float32))
+        hits_face.append(tri)
+
+    depth = np.full(width*height, np.inf, dtype=np.float32)
+    face = np.full(width*height, -1, dtype=np.int64)
+    if hits_pixel:
+        pixel, z_hit, tri = np.concatenate(hits_pixel), np.concatenate(hits_depth), np.concatenate(hits_face)
+        # Teste de profundidade: menor z de cada pixel; depois, o triângulo que atingiu esse z
+        np.minimum.at(depth, pixel, z_hit)
+        nearest = z_hit == depth[pixel]
+        face[pixel[nearest]] = tri[nearest]
+    return depth.reshape(height, width), face.reshape(height, width)
+
+
+def normal_map(face, normals, cam, vectors):
+    """
+    Monta o mapa de normais (referencial da câmera) a partir do triângulo visível em cada pixel.
+
+    As normais são orientadas para a câmera, já que a ordem dos vértices dos STL nem sempre é consistente.
+
+    Parâmetros:
+        face (numpy.ndarray): Índice do triângulo em cada pixel, retornado por `rasterize`.
+        normals (numpy.ndarray): Normais unitárias no mundo (T, 3).
+        cam (numpy.ndarray): Pose 4x4 da câmera.
+        vectors (numpy.ndarray): Triângulos no mundo (T, 3, 3).
+
+    Retorna:
+        normal (numpy.ndarray): Normais (height, width, 3), float32; zero sem objeto.
+    """
+    M_ext = np.linalg.inv(cam)
+    normals_cam = np.dot(normals, M_ext[:3, :3].T)
+    first = np.dot(vectors[:, 0], M_ext[:3, :3].T) + M_ext[:3, 3]
+    normals_cam *= np.where(np.einsum('ij,ij->i', normals_cam, first) > 0, -1, 1)[:, None]
+    normal = np.zeros(face.shape + (3,), dtype=np.float32)
+    hit = face >= 0
+    normal[hit] = normals_cam[face[hit]]
+    return normal
+
+
+def distortion_lookup(params):
+    """
+    Mapa de `undistortion_map` para os intrínsecos de `params`, ou None sem distorção da lente.
+
+    Depende apenas de K, dos coeficientes e da resolução: é calculado uma vez por sequência e reaproveitado em
+    todos os quadros, como `undistortion_key` em `plot_density`.
+    """
+    coeffs = distortion_coefficients(params)
+    if not has_distortion(coeffs):
+        return None
+    return undistortion_map(intrinsic_matrix(params), coeffs, params["n_pixels_base:"], params["n_pixels_altura:"])
+
+
+def render_targets(mesh_data, cam, params, max_candidates=MAX_CANDIDATES, lookup=None):
+    """
+    Gera os mapas de profundidade e de normais de um quadro, na resolução e com os intrínsecos de `params`.
+
+    Com distorção da lente, os mapas ideais (pinhole) são levados para a imagem distorcida com o mapa de
+    `undistortion_map`, como na imagem de densidade de `plot_density`.
+
+    Parâmetros:
+        mesh_data (MeshData): Dados derivados da malha (triângulos e normais).
+        cam (numpy.ndarray): Pose 4x4 da câmera.
+        params (dict): Parâmetros intrínsecos no formato de `params_intrinsc_values`.
+        max_candidates (int): Limite de pixels candidatos por bloco.
+        lookup (numpy.ndarray): Mapa de `distortion_lookup(params)` já calculado (calculado aqui se for None).
+
+    Retorna:
+        depth (numpy.ndarray): Profundidade (height, width), float32; inf sem objeto.
+        normal (numpy.ndarray): Normais no referencial da câmera (height, width, 3), float32.
+    """
+    K = intrinsic_matrix(params)
+    width, height = params["n_pixels_base:"], params["n_pixels_altura:"]
+    depth, face = rasterize(mesh_data.vectors, cam, K, width, height, max_candidates)
+    if lookup is None:
+        lookup = distortion_lookup(params)
+    if lookup is not None:
+        depth, face = remap(depth, lookup, np.inf), remap(face, lookup, -1)
+    return depth, normal_map(face, mesh_data.normals, cam, mesh_data.vectors)
+
+
+def export_range(mesh_data, cams, params, directory, first=0, lookup=None):
+    """
+    Exporta um trecho contíguo da sequência, numerando os arquivos a partir de `first`.
+
+    O mapa de distorção (`lookup`) é calculado uma única vez para o trecho, se não for informado.
+    """
+    if lookup is None:
+        lookup = distortion_lookup(params)
+    for i, cam in enumerate(cams, start=first):
+        depth, normal = render_targets(mesh_data, cam, params, lookup=lookup)
+        np.save(os.path.join(directory, f"depth_{i:05d}.npy"), depth)
+        np.save(os.path.join(directory, f"normal_{i:05d}.npy"), normal)
+
+
+def export_frames(mesh_data, cams, params, directory, processes=None):
+    """
+    Exporta os mapas de profundidade e normais de uma sequência de poses como arquivos `.npy` (float32).
+
+    Com `processes`, a sequência é dividida em trechos contíguos exportados em paralelo por um pool de processos.
+    O mapa de distorção é calculado uma única vez e repassado a todos os trechos.
+
+    Parâmetros:
+        mesh_data (MeshData): Dados derivados da malha.
+        cams (numpy.ndarray): Poses da câmera (F, 4, 4).
+        params (dict): Parâmetros intrínsecos.
+        directory (str): Pasta de saída (`depth_00000.npy`, `normal_00000.npy`, ...).
+        processes (int): Número de processos (None ou 1 para exportar no processo atual).
+    """
+    os.makedirs(directory, exist_ok=True)
+    lookup = distortion_lookup(params)
+    if not processes or processes == 1:
+        export_range(mesh_data, cams, params, directory, lookup=lookup)
+        return
+
+    bounds = np.linspace(0, len(cams), processes + 1).astype(int)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(export_range, mesh_data, cams[a:b], params, directory, a, lookup)
+                   for a, b in zip(bounds[:-1], bounds[1:])]
+        for future in futures:
+            future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta mapas de profundidade e normais (z-buffer) em .npy.")
+    parser.add_argument("--mesh", default=DEFAULT_MESH, help="Malha STL.")
+    parser.add_argument("--poses", help="Arquivo .npy com as poses da camera (F, 4, 4); padrao: a pose inicial.")
+    parser.add_argument("--output", default="render", help="Pasta de saida.")
+    parser.add_argument("--processes", type=int, help="Numero de processos usados na exportacao.")
+    args = parser.parse_args()
+
+    _, vectors = load_mesh(args.mesh)
+    if vectors is None:
+        parser.error("--mesh precisa ser uma malha triangular (STL).")
+    mesh_data = MeshData.from_file(args.mesh, vectors)
+    cams = np.load(args.poses) if args.poses else initialize_camera()['cam'][None]
+    export_frames(mesh_data, cams.reshape(-1, 4, 4), default_intrinsics(), args.output, args.processes)
+    print(f"[LOG] {len(cams.reshape(-1, 4, 4))} quadros exportados em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
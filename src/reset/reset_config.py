@@ -2,6 +2,9 @@ from PyQt5.QtWidgets import QMessageBox, QPushButton, QLineEdit, QLabel, QGroupB
 from PyQt5.QtGui import QDoubleValidator
 import numpy as np
 
+from src.camera.autoframe import frame_cameras
+from src.utils.bounds import bounding_sphere
+from src.utils.projection import default_intrinsics, derive_intrinsics, intrinsic_matrix, validate_intrinsics
 from src.utils.transformations import move, x_rotation, y_rotation, z_rotation
 
 class Reset:
@@ -21,7 +24,7 @@ class Reset:
         4. Atualiza os campos de entrada da interface gráfica com os valores padrão dos parâmetros intrínsecos, da câmera e do mundo, 
         utilizando as funções `populate_intrinsic_fields()`, `populate_cam_fields()` e `populate_world_fields()`.
         5. Recalcula a projeção 2D chamando a função `projection_2d()`.
-        6. Chama a função `update_canvas()` para atualizar a visualização com os novos parâmetros e projeções.
+        6. Chama a função `request_render()` para atualizar a visualização com os novos parâmetros e projeções.
 
         Variáveis envolvidas:
         ----------------------
@@ -32,7 +35,7 @@ class Reset:
         - `self.populate_cam_fields`: Função que atualiza os campos de entrada com os valores dos parâmetros da câmera.
         - `self.populate_world_fields`: Função que atualiza os campos de entrada com os valores dos parâmetros de transformação do mundo.
         - `self.projection_2d`: Função que recalcula a projeção 2D após a redefinição dos parâmetros.
-        - `self.update_canvas`: Função que atualiza a visualização dos gráficos com os novos parâmetros.
+        - `self.request_render`: Função que pede o redesenho dos gráficos com os novos parâmetros.
         """
 
         self.log("-----------------------------------------")
@@ -48,7 +51,7 @@ class Reset:
         self.populate_world_fields()
 
         self.projection_2d()
-        self.update_canvas()
+        self.request_render()
         self.log("Saindo da funcao reset_parameter")
         self.log("-----------------------------------------")
         self.log("-----------------------------------------")
@@ -70,6 +73,9 @@ class Reset:
         5. Aplica uma rotação de -90 graus no eixo X utilizando a função `x_rotation(-90)`.
         6. Aplica uma translação de 35 unidades ao longo do eixo Z e -60 unidades ao longo do eixo Y usando a função `move(0, -60, 35)`.
         7. Atualiza `self.cam` com a nova matriz resultante das transformações de rotação e translação.
+        8. Com o enquadramento automático ativo (`self.autoframe`), substitui a translação fixa pela posição que 
+        enquadra a esfera envolvente do objeto desenhado (`framing_sphere`) com os parâmetros intrínsecos atuais
+        (os padrão enquanto eles ainda não foram definidos).
 
         Variáveis envolvidas:
         ----------------------
@@ -99,9 +105,45 @@ class Reset:
 
         self.cam = np.dot(x_90, self.cam)
         self.cam = np.dot(T, self.cam)
+
+        if getattr(self, "autoframe", False):
+            self.log("Enquadrando o objeto automaticamente...")
+            params = getattr(self, "params_intrinsc_values", None)
+            if not params or validate_intrinsics(params):
+                params = default_intrinsics()
+            params = derive_intrinsics(dict(params))
+            center, radius = self.framing_sphere()
+            self.cam = frame_cameras(center, radius, intrinsic_matrix(params),
+                                     params["n_pixels_base:"], params["n_pixels_altura:"])
+            self.log(f"Camera posicionada em: {self.cam[:3, 3]}")
         self.log("Saindo da funcao reset")
         self.log("-----------------------------------------")
         self.log("-----------------------------------------")
+    def framing_sphere(self):
+        """
+        Esfera envolvente do que a imagem 2D desenha: a cena, todas as cópias de uma malha instanciada (a partir da
+        esfera da malha única e das transformações, sem materializar as cópias) ou a malha carregada.
+
+        Retorna:
+            center (numpy.ndarray): Centro (3,).
+            radius (float): Raio.
+        """
+        scene = getattr(self, "scene", None)
+        mesh_data = getattr(self, "mesh_data", None)
+        if hasattr(scene, "transforms"):
+            if mesh_data is not None:
+                center, radius = mesh_data.sphere_center, mesh_data.sphere_radius
+            else:
+                center, radius = bounding_sphere(scene.points)
+            centers = np.dot(scene.transforms[:, :3, :3], center) + scene.transforms[:, :3, 3]
+            middle = (centers.min(axis=0) + centers.max(axis=0))/2
+            return middle, float(np.linalg.norm(centers - middle, axis=1).max() + radius)
+        if scene is not None:
+            return bounding_sphere(scene.points)
+        if mesh_data is not None:
+            return mesh_data.sphere_center, mesh_data.sphere_radius
+        return bounding_sphere(self.urso)
+
     def reset_canvas(self):
         """
         Reseta a configuração da câmera, os parâmetros e o canvas de visualização para o estado inicial.
@@ -112,8 +154,9 @@ class Reset:
 
         Passos realizados:
         -------------------
-        1. Chama o método `reset()` para redefinir a configuração inicial da câmera, incluindo a posição e orientação.
-        2. Chama o método `reset_parameter()` para redefinir os parâmetros intrínsecos, de câmera e de transformação do mundo.
+        1. Chama o método `reset_parameter()` para redefinir os parâmetros intrínsecos, de câmera e de transformação do mundo.
+        2. Chama o método `reset()` para redefinir a configuração inicial da câmera, incluindo a posição e orientação
+        (com o enquadramento automático, calculada com os parâmetros intrínsecos já redefinidos).
         3. Exibe uma mensagem de sucesso usando `QMessageBox.information()` informando que os parâmetros foram atualizados com sucesso.
 
         Variáveis envolvidas:
@@ -126,8 +169,11 @@ class Reset:
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: reset_canvas")
         self.log("Resetando canvas..")        
-        self.reset()
-        self.reset_parameter()
+        with self.batch_render():
+            # Os parâmetros intrínsecos voltam primeiro, para que o enquadramento automático use os da nova vista
+            self.reset_parameter()
+            self.reset()
+        self.record_event("reset", {"cam": self.cam.tolist()})
         QMessageBox.information(self, "Reset bem-sucedido", "Parametros atualizados com sucesso!")
         self.log("Saindo da funcao reset_canvas")
         self.log("-----------------------------------------")
@@ -0,0 +1,132 @@
+import numpy as np
+
+from src.intrinsic.distortion import DISTORTION_KEYS, apply_distortion_batch, has_distortion, undistort_points
+from src.stereo.epipolar import fundamental_matrix
+from src.sweep.sweep import CHUNK_ELEMENTS
+from src.utils.projection import derive_intrinsics, intrinsic_matrices, projection_matrices, project_points_batch
+
+
+def world_points(target):
+    """
+    Coordenadas homogêneas 4xN de tudo o que a imagem 2D desenha, no referencial do mundo.
+
+    Parâmetros:
+        target: Malha 4xN (`self.urso`), `Scene` (pontos já no mundo) ou `InstancedMesh` (as instâncias são
+            materializadas na mesma ordem de `InstancedMesh.project`).
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas 4xN.
+    """
+    if hasattr(target, "transforms"):
+        return np.matmul(target.transforms, target.points).transpose(1, 0, 2).reshape(4, -1)
+    if hasattr(target, "points"):
+        return target.points
+    return target
+
+
+class CameraRig:
+    """
+    Conjunto de câmeras calibradas observando a mesma malha, projetadas juntas com um tensor P (N, 3, 4).
+
+    Atributos:
+        cams (list): Poses 4x4 das câmeras (no formato de `self.cam`).
+        params (list): Parâmetros intrínsecos de cada câmera (formato de `params_intrinsc_values`).
+        names (list): Nome de cada câmera.
+    """
+
+    def __init__(self, cams=None, params=None, names=None):
+        self.cams = [np.asarray(cam, dtype=float) for cam in (cams or [])]
+        self.params = [derive_intrinsics(dict(p)) for p in (params or [])]
+        self.names = list(names) if names is not None else [f"Camera {i + 1}" for i in range(len(self.cams))]
+
+    def __len__(self):
+        return len(self.cams)
+
+    @classmethod
+    def from_views(cls, views):
+        """
+        Monta o rig a partir das vistas de um preset (`src.presets.presets.preset_views`).
+        """
+        return cls([view["cam"] for view in views], [view["params"] for view in views],
+                   [view["name"] for view in views])
+
+    def add(self, cam, params, name=None):
+        """
+        Acrescenta uma câmera ao rig (cópias da pose e dos parâmetros).
+        """
+        self.cams.append(np.array(cam, dtype=float))
+        self.params.append(derive_intrinsics(dict(params)))
+        self.names.append(name or f"Camera {len(self.cams)}")
+
+    def column(self, key, cameras=slice(None)):
+        return np.array([p[key] for p in self.params[cameras]])
+
+    def sizes(self, cameras=slice(None)):
+        """
+        Resolução (largura, altura) da imagem de cada câmera, em vetores (N,).
+        """
+        return self.column("n_pixels_base:", cameras), self.column("n_pixels_altura:", cameras)
+
+    def intrinsic_matrices(self, cameras=slice(None)):
+        return intrinsic_matrices(self.column("dist_focal:", cameras), self.column("sx:", cameras),
+                                  self.column("sy:", cameras), self.column("s_theta:", cameras),
+                                  self.column("ox:", cameras), self.column("oy:", cameras))
+
+    def projection_matrices(self, cameras=slice(None)):
+        """
+        Matrizes de projeção empilhadas (N, 3, 4), uma por câmera.
+        """
+        return projection_matrices(np.array(self.cams[cameras]).reshape(-1, 4, 4), self.intrinsic_matrices(cameras))
+
+    def distortion(self, camera):
+        return np.array([self.params[camera].get(key, 0.0) for key in DISTORTION_KEYS])
+
+    def fundamental_matrix(self, source, target):
+        """
+        Matriz fundamental da câmera `source` para a câmera `target` (x_target ᵀ · F · x_source = 0).
+        """
+        Ks = self.intrinsic_matrices()
+        return fundamental_matrix(self.cams[source], Ks[source], self.cams[target], Ks[target])
+
+    def undistort(self, points_2d):
+        """
+        Corrige a distorção de pixels observados (N, 2, V) em cada câmera, levando-os ao modelo pinhole.
+        """
+        Ks = self.intrinsic_matrices()
+        points_2d = np.array(points_2d, dtype=float)
+        for i in range(len(self)):
+            if has_distortion(self.distortion(i)):
+                points_2d[i] = undistort_points(points_2d[i], Ks[i], self.distortion(i))[:2]
+        return points_2d
+
+    def project(self, points, cameras=slice(None), chunk_elements=CHUNK_ELEMENTS):
+        """
+        Projeta a malha em todas as câmeras (ou em `cameras`) com o tensor P empilhado.
+
+        O estágio de distorção é aplicado em lote, agrupando as câmeras com os mesmos coeficientes.
+
+        Parâmetros:
+            points (numpy.ndarray): Coordenadas homogêneas 4xN no referencial do mundo.
+            cameras (slice): Câmeras a projetar (padrão: todas).
+            chunk_elements (int): Limite de câmeras x vértices projetados por bloco.
+
+        Retorna:
+            points_2d (numpy.ndarray): Pixels (N, 2, V), com distorção.
+            depth (numpy.ndarray): Profundidade homogênea (N, V); pontos com profundidade <= 0 estão atrás da câmera.
+        """
+        Ks = self.intrinsic_matrices(cameras)
+        Ps = projection_matrices(np.array(self.cams[cameras]).reshape(-1, 4, 4), Ks)
+        coeffs = np.array([self.distortion(i) for i in range(len(self))[cameras]])
+
+        points = np.asarray(points, dtype=float)
+        points_2d = np.empty((len(Ps), 2, points.shape[1]))
+        depth = np.empty((len(Ps), points.shape[1]))
+        step = max(1, chunk_elements // points.shape[1])
+        for start in range(0, len(Ps), step):
+            chunk = slice(start, start + step)
+            points_2d[chunk], depth[chunk] = project_points_batch(Ps[chunk], points)
+        for group in np.unique(coeffs.reshape(-1, len(DISTORTION_KEYS)), axis=0):
+            if has_distortion(group):
+                members = np.flatnonzero((coeffs == group).all(axis=1))
+                points_2d[members] = apply_distortion_batch(points_2d[members], Ks[members], group)
+        return points_2d, depth
@@ -0,0 +1,237 @@
+import numpy as np
+from PyQt5.QtWidgets import QFileDialog, QMessageBox, QVBoxLayout, QWidget
+
+from src.intrinsic.distortion import undistort_points
+from src.presets.presets import load_preset
+from src.rig.rig import CameraRig, world_points
+from src.rig.rig_view import RigView, polylines
+from src.stereo.epipolar import epipolar_lines, line_segments
+from src.stereo.triangulation import compare_to_mesh, reprojection_errors, triangulate_rig
+from src.utils.projection_cache import geometry_version
+
+
+class Rig:
+    def rig_target(self):
+        return self.scene if self.scene is not None else self.urso
+
+    def update_rig_points(self):
+        """
+        Recalcula `self.rig_points` quando a geometria mudou: outra malha ou cena, ou uma `Scene` alterada no lugar
+        (`geometry_version`).
+
+        Retorna:
+            changed (bool): True quando os pontos foram recalculados.
+        """
+        target = self.rig_target()
+        version = geometry_version(target)
+        if getattr(self, "rig_points", None) is not None:
+            source, source_version = getattr(self, "rig_points_source", (None, None))
+            if source is target and source_version == version:
+                return False
+        self.rig_points = world_points(target)
+        self.rig_points_source = (target, version)
+        return True
+
+    def open_rig(self):
+        """
+        Carrega um rig de câmeras de um arquivo de preset (uma câmera por vista) escolhido pelo usuário.
+        """
+        filepath, _ = QFileDialog.getOpenFileName(self, "Carregar rig de cameras", "", "Presets (*.json *.toml)")
+        if filepath:
+            self.load_rig(filepath)
+
+    def load_rig(self, filepath):
+        """
+        Carrega um rig de câmeras de um preset e exibe as imagens de todas as câmeras lado a lado.
+
+        Parâmetros:
+        -----------
+        - `filepath` (str): Arquivo de preset (.json ou .toml); cada vista é uma câmera do rig.
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: load_rig")
+        try:
+            views = load_preset(filepath, params=self.params_intrinsc_values)
+        except (OSError, ValueError) as e:
+            self.log(f"Rig invalido: {e}")
+            QMessageBox.warning(self, "Erro no rig", str(e))
+            return
+        self.rig = CameraRig.from_views(views)
+        self.rig_projection = None
+        self.epipolar_source, self.epipolar_points = None, None
+        self.update_rig_view()
+        self.log(f"Rig com {len(self.rig)} cameras carregado de: {filepath}")
+        self.log("-----------------------------------------")
+
+    def add_camera_to_rig(self):
+        """
+        Acrescenta a câmera atual (pose e parâmetros intrínsecos) ao rig.
+
+        Apenas a câmera nova é projetada e apenas o eixo dela é criado; as imagens das demais câmeras são mantidas.
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: add_camera_to_rig")
+        if getattr(self, "rig", None) is None:
+            self.rig = CameraRig()
+            self.rig_projection = None
+            self.epipolar_source, self.epipolar_points = None, None
+        self.rig.add(self.cam, self.params_intrinsc_values)
+        self.update_rig_view(new_cameras=1)
+        self.log(f"Rig com {len(self.rig)} cameras.")
+        self.log("-----------------------------------------")
+
+    def update_rig_view(self, new_cameras=None):
+        """
+        Projeta o rig (todas as câmeras, ou só as `new_cameras` últimas) com um único tensor P (N, 3, 4) e atualiza
+        a janela com as imagens lado a lado.
+
+        Variáveis envolvidas:
+        ----------------------
+        - `self.rig`: Rig de câmeras (`CameraRig`).
+        - `self.rig_points`: Pontos da malha (ou da cena) no referencial do mundo, recalculados só quando a geometria
+          muda (`update_rig_points`); nesse caso todas as câmeras são projetadas de novo.
+        - `self.rig_projection`: Projeções de todas as câmeras (N, 2, V), reaproveitadas ao acrescentar câmeras.
+        - `self.rig_view`: Figura com as imagens das câmeras (`RigView`).
+        """
+        geometry_changed = self.update_rig_points()
+        count = len(self.rig)
+        if new_cameras is None or self.rig_projection is None or geometry_changed:
+            cameras = slice(0, count)
+        else:
+            cameras = slice(count - new_cameras, count)
+        points_2d, _ = self.rig.project(self.rig_points, cameras)
+        points_2d = polylines(self.rig_target(), points_2d)
+        if cameras.start == 0:
+            self.rig_projection = points_2d
+        else:
+            self.rig_projection = np.concatenate((self.rig_projection, points_2d))
+
+        self.show_rig_window()
+        widths, heights = self.rig.sizes()
+        self.rig_view.update(self.rig_projection, widths, heights, self.rig.names, range(cameras.start, count))
+        if getattr(self, "reconstruction", None) is not None:
+            self.rig_view.show_points(self.rig.project(self.reconstruction)[0])
+        if getattr(self, "epipolar_points", None) is not None:
+            self.update_epipolar_overlay()
+
+    def show_rig_window(self):
+        """
+        Cria (na primeira vez) e exibe a janela com as imagens do rig.
+        """
+        if getattr(self, "rig_view", None) is None:
+            self.rig_view = RigView()
+            self.rig_window = QWidget()
+            self.rig_window.setWindowTitle("Rig de cameras")
+            layout = QVBoxLayout()
+            layout.addWidget(self.rig_view.canvas)
+            self.rig_window.setLayout(layout)
+            self.rig_window.resize(900, 600)
+            self.rig_view.canvas.mpl_connect("button_press_event", self.pick_epipolar_point)
+        self.rig_window.show()
+
+    def pick_epipolar_point(self, event):
+        """
+        Seleção de pontos na janela do rig: o botão esquerdo acrescenta um ponto na imagem clicada (e desenha as
+        retas epipolares dele nas demais câmeras); o botão direito limpa a seleção.
+        """
+        camera = self.rig_view.camera_at(event)
+        if event.button == 3:
+            self.set_epipolar_points(None, None)
+            return
+        if camera is None or event.xdata is None:
+            return
+        point = np.array([[event.xdata], [event.ydata]])
+        if camera == self.epipolar_source and self.epipolar_points is not None:
+            point = np.hstack((self.epipolar_points, point))
+        self.set_epipolar_points(camera, point)
+
+    def set_epipolar_points(self, source, points_2d):
+        """
+        Seleciona pontos na imagem de uma câmera do rig e desenha as retas epipolares correspondentes nas demais.
+
+        Parâmetros:
+        -----------
+        - `source` (int): Índice da câmera onde os pontos estão (None limpa a seleção).
+        - `points_2d` (numpy.ndarray): Pixels 2xN observados nessa câmera (com distorção, como na imagem).
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: set_epipolar_points")
+        if source is None:
+            self.epipolar_source, self.epipolar_points = None, None
+        else:
+            self.epipolar_source, self.epipolar_points = source, np.asarray(points_2d, dtype=float)[:2]
+            self.log(f"{self.epipolar_points.shape[1]} pontos selecionados na camera {self.rig.names[source]}")
+        self.update_epipolar_overlay()
+        self.log("-----------------------------------------")
+
+    def update_epipolar_overlay(self):
+        """
+        Recalcula as retas epipolares dos pontos selecionados em todas as câmeras do rig, de uma vez por câmera.
+
+        Os pontos são corrigidos da distorção da câmera de origem antes de `F` ser aplicada; as retas são as do
+        modelo pinhole (com distorção forte, a correspondência real na imagem é uma curva próxima da reta).
+
+        Variáveis envolvidas:
+        ----------------------
+        - `self.epipolar_source`: Câmera onde os pontos foram selecionados.
+        - `self.epipolar_points`: Pixels 2xN selecionados.
+        """
+        count = len(self.rig)
+        marks, segments = [None]*count, [None]*count
+        source = self.epipolar_source
+        if source is not None and source < count:
+            marks[source] = self.epipolar_points
+            Ks = self.rig.intrinsic_matrices()
+            points = undistort_points(self.epipolar_points, Ks[source], self.rig.distortion(source))
+            widths, heights = self.rig.sizes()
+            for target in range(count):
+                if target == source:
+                    continue
+                try:
+                    F = self.rig.fundamental_matrix(source, target)
+                except ValueError:
+                    # Câmeras no mesmo centro óptico (por exemplo, só os intrínsecos mudam): sem retas epipolares
+                    continue
+                segments[target] = line_segments(epipolar_lines(F, points), widths[target], heights[target])
+        self.rig_view.overlay(marks, segments)
+
+    def reconstruct_rig(self, points_2d=None, refine=True):
+        """
+        Triangula correspondências observadas pelas câmeras do rig e compara a reconstrução com a malha.
+
+        Sem `points_2d`, usa as projeções da própria malha em cada câmera (verificação do modelo de projeção de ponta
+        a ponta). A reconstrução é reprojetada e desenhada sobre as imagens do rig.
+
+        Parâmetros:
+        -----------
+        - `points_2d` (numpy.ndarray, opcional): Pixels observados (N, 2, V) em cada câmera, com distorção
+          (NaN = ponto não observado na câmera).
+        - `refine` (bool): Aplica o refinamento não linear depois da triangulação linear.
+
+        Variáveis envolvidas:
+        ----------------------
+        - `self.reconstruction`: Pontos triangulados 4xV no referencial do mundo (mesmo formato de `self.urso`).
+        """
+        self.log("-----------------------------------------")
+        self.log("FUNCAO CHAMADA: reconstruct_rig")
+        if getattr(self, "rig", None) is None or len(self.rig) < 2:
+            QMessageBox.warning(self, "Erro no rig", "A triangulacao precisa de um rig com pelo menos duas cameras.")
+            return
+        self.update_rig_points()
+        if points_2d is None:
+            points_2d, depth = self.rig.project(self.rig_points)
+            # Vértices atrás de uma câmera não são observados por ela
+            points_2d = np.where((depth > 0)[:, None], points_2d, np.nan)
+        self.reconstruction = triangulate_rig(self.rig, points_2d, refine=refine)
+        valid = np.isfinite(self.reconstruction).all(axis=0)
+        errors = reprojection_errors(self.rig.projection_matrices(), self.rig.undistort(points_2d), self.reconstruction)
+        mean_error = np.nanmean(errors[:, valid]) if valid.any() else np.nan
+        self.log(f"{int(valid.sum())} de {self.reconstruction.shape[1]} pontos triangulados; "
+                 f"erro de reprojecao medio: {mean_error:.4f} px")
+        distances = compare_to_mesh(self.reconstruction, self.rig_points)
+        if distances is not None and valid.any():
+            self.log(f"Distancia a malha: media {np.nanmean(distances):.6f}, maxima {np.nanmax(distances):.6f}")
+
+        self.show_rig_window()
+        self.rig_view.show_points(self.rig.project(self.reconstruction)[0])
+        self.log("-----------------------------------------")
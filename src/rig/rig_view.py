@@ -0,0 +1,132 @@
+import math
+
+import numpy as np
+
+from src.plot.plot import matplotlib_figure
+
+
+def tile_shape(count):
+    """
+    Número de linhas e colunas da grade de imagens para `count` câmeras (o mais próximo de um quadrado).
+    """
+    cols = max(1, math.ceil(math.sqrt(count)))
+    return max(1, math.ceil(count/cols)), cols
+
+
+class RigView:
+    """
+    Imagens 2D de todas as câmeras de um rig, lado a lado em uma única figura.
+
+    Os eixos e as linhas de cada câmera são criados uma única vez e reaproveitados: atualizar a vista só troca os
+    dados das linhas (`set_data`), e acrescentar uma câmera cria apenas um eixo novo e reposiciona os demais.
+
+    Atributos:
+        fig (matplotlib.figure.Figure): Figura com uma imagem por câmera.
+        canvas (FigureCanvas): Canvas Qt da figura.
+        axes (list): Eixo de cada câmera.
+        lines (list): Linha (`Line2D`) com a projeção da malha em cada câmera.
+        marks (list): Pontos selecionados em cada câmera.
+        epilines (list): Retas epipolares desenhadas em cada câmera (uma única polilinha por eixo).
+        clouds (list): Reprojeção dos pontos reconstruídos (triangulados) em cada câmera.
+    """
+
+    def __init__(self):
+        self.fig, self.canvas = matplotlib_figure()
+        self.axes = []
+        self.lines = []
+        self.marks = []
+        self.epilines = []
+        self.clouds = []
+
+    def resize(self, count):
+        """
+        Ajusta o número de eixos para `count` câmeras, reaproveitando os eixos existentes.
+        """
+        if count == len(self.axes):
+            return
+        while len(self.axes) > count:
+            self.axes.pop().remove()
+            self.lines.pop()
+            self.marks.pop()
+            self.epilines.pop()
+            self.clouds.pop()
+        spec = self.fig.add_gridspec(*tile_shape(count))
+        for i, ax in enumerate(self.axes):
+            ax.set_subplotspec(spec[i])
+        while len(self.axes) < count:
+            ax = self.fig.add_subplot(spec[len(self.axes)])
+            ax.set_aspect('equal')
+            ax.grid(True)
+            ax.tick_params(labelsize=6)
+            line, = ax.plot([], [], linewidth=0.5)
+            marks, = ax.plot([], [], 'o', color='red', markersize=3)
+            epilines, = ax.plot([], [], color='red', linewidth=0.7)
+            cloud, = ax.plot([], [], '.', color='green', markersize=1)
+            self.axes.append(ax)
+            self.lines.append(line)
+            self.marks.append(marks)
+            self.epilines.append(epilines)
+            self.clouds.append(cloud)
+
+    def update(self, points_2d, widths, heights, names, cameras=None):
+        """
+        Atualiza as imagens das câmeras com projeções já calculadas.
+
+        Parâmetros:
+            points_2d (numpy.ndarray): Pixels (N, 2, V) de todas as câmeras do rig.
+            widths, heights (numpy.ndarray): Resolução da imagem de cada câmera (N,).
+            names (list): Nome de cada câmera.
+            cameras (iterable, opcional): Câmeras cujas linhas mudaram (padrão: todas).
+        """
+        self.resize(len(points_2d))
+        for i in (range(len(points_2d)) if cameras is None else cameras):
+            self.lines[i].set_data(points_2d[i, 0], points_2d[i, 1])
+            self.axes[i].set_xlim([0, widths[i]])
+            self.axes[i].set_ylim([heights[i], 0])
+            self.axes[i].set_title(names[i], fontsize=8)
+        self.canvas.draw_idle()
+
+    def camera_at(self, event):
+        """
+        Índice da câmera cujo eixo recebeu o evento de mouse (None fora dos eixos).
+        """
+        return self.axes.index(event.inaxes) if event.inaxes in self.axes else None
+
+    def overlay(self, marks, segments):
+        """
+        Desenha os pontos selecionados e as retas epipolares de cada câmera.
+
+        Parâmetros:
+            marks (list): Pontos 2xN de cada câmera (ou None).
+            segments (list): Polilinhas 2xM de `line_segments` de cada câmera (ou None).
+        """
+        empty = np.empty((2, 0))
+        for i in range(len(self.axes)):
+            points = marks[i] if marks[i] is not None else empty
+            lines = segments[i] if segments[i] is not None else empty
+            self.marks[i].set_data(points[0], points[1])
+            self.epilines[i].set_data(lines[0], lines[1])
+        self.canvas.draw_idle()
+
+    def show_points(self, points_2d):
+        """
+        Desenha pontos (por exemplo, uma reconstrução triangulada) sobre as imagens das câmeras.
+
+        Parâmetros:
+            points_2d (numpy.ndarray): Pixels (N, 2, V) em todas as câmeras do rig (None apaga os pontos).
+        """
+        for i, cloud in enumerate(self.clouds):
+            if points_2d is None:
+                cloud.set_data([], [])
+            else:
+                cloud.set_data(points_2d[i, 0], points_2d[i, 1])
+        self.canvas.draw_idle()
+
+
+def polylines(target, points_2d):
+    """
+    Insere colunas NaN entre os objetos de uma cena, em todas as câmeras de uma vez (como `Scene.polyline`).
+    """
+    if not hasattr(target, "offsets"):
+        return points_2d
+    return np.insert(points_2d, target.offsets[1:-1], np.nan, axis=2)
@@ -0,0 +1,115 @@
+import numpy as np
+
+
+def grid_transforms(nx, ny, nz=1, spacing=(1, 1, 1)):
+    """
+    Gera as transformações de instâncias dispostas em uma grade regular.
+
+    Parâmetros:
+        nx, ny, nz (int): Número de cópias ao longo dos eixos X, Y e Z.
+        spacing (tuple): Distância entre cópias vizinhas em cada eixo.
+
+    Retorna:
+        transforms (numpy.ndarray): Matrizes de translação no formato (nx*ny*nz, 4, 4).
+    """
+    ix, iy, iz = np.meshgrid(np.arange(nx), np.arange(ny), np.arange(nz), indexing='ij')
+    transforms = np.broadcast_to(np.eye(4), (ix.size, 4, 4)).copy()
+    transforms[:, 0, 3] = ix.ravel()*spacing[0]
+    transforms[:, 1, 3] = iy.ravel()*spacing[1]
+    transforms[:, 2, 3] = iz.ravel()*spacing[2]
+    return transforms
+
+
+def project_instances(P, points, transforms):
+    """
+    Projeta várias cópias da mesma malha, cada uma com sua transformação, sem duplicar os vértices.
+
+    As matrizes `P @ T_i` são calculadas para todas as instâncias de uma vez (Nx3x4) e aplicadas ao único
+    buffer de vértices com uma multiplicação em lote.
+
+    Parâmetros:
+        P (numpy.ndarray): Matriz de projeção 3x4.
+        points (numpy.ndarray): Vértices da malha em coordenadas homogêneas 4xV.
+        transforms (numpy.ndarray): Transformações das instâncias no formato (N, 4, 4).
+
+    Retorna:
+        points_2d (numpy.ndarray): Coordenadas (N, 3, V) (u, v, 1) de cada instância.
+        valid (bool): False quando a terceira coordenada homogênea contém zeros (nesse caso ela é tratada como 1).
+    """
+    projected = np.matmul(np.matmul(P, transforms), points)
+    valid = not np.any(projected[:, 2] == 0)
+    if not valid:
+        projected[:, 2][projected[:, 2] == 0] = 1
+    return projected / projected[:, 2:3], valid
+
+
+class InstancedMesh:
+    """
+    Uma malha replicada N vezes por transformações empilhadas (N, 4, 4).
+
+    Guarda um único buffer de vértices e as transformações das instâncias, ou seja, memória O(V + N) em vez de
+    O(V·N). Expõe a mesma interface de projeção de `Scene` (`project`, `offsets`, `polyline`), para que possa ser
+    desenhada pelo mesmo caminho de `plot2d`; os triângulos só são materializados por `sample_vectors`, limitados.
+    """
+
+    def __init__(self, points, vectors=None, transforms=None):
+        self.points = points
+        self.mesh_vectors = vectors
+        self.transforms = np.eye(4)[None] if transforms is None else np.asarray(transforms, dtype=float)
+
+    @classmethod
+    def grid(cls, points, vectors, nx, ny, nz=1, gap=10):
+        """
+        Replica a malha em uma grade, espaçando as cópias pelo tamanho da caixa envolvente mais `gap`.
+        """
+        extent = np.asarray(points[:3].max(axis=1), dtype=float) - np.asarray(points[:3].min(axis=1), dtype=float)
+        return cls(points, vectors, grid_transforms(nx, ny, nz, spacing=extent + gap))
+
+    def __len__(self):
+        return self.transforms.shape[0]
+
+    @property
+    def offsets(self):
+        """
+        Início de cada instância no resultado concatenado de `project`.
+        """
+        return np.arange(len(self) + 1)*self.points.shape[1]
+
+    def project(self, P):
+        """
+        Projeta todas as instâncias com uma única multiplicação em lote.
+
+        Parâmetros:
+            P (numpy.ndarray): Matriz de projeção 3x4.
+
+        Retorna:
+            points_2d (numpy.ndarray): Coordenadas 3x(N·V) de todas as instâncias, concatenadas.
+            offsets (numpy.ndarray): Início de cada instância em `points_2d`.
+            valid (bool): False quando a terceira coordenada homogênea contém zeros.
+        """
+        projected, valid = project_instances(P, self.points, self.transforms)
+        return projected.transpose(1, 0, 2).reshape(3, -1), self.offsets, valid
+
+    def polyline(self, points_2d):
+        """
+        Insere colunas NaN entre as instâncias, para que um único `plot` desenhe todas sem ligá-las.
+        """
+        return np.insert(points_2d[:2], self.offsets[1:-1], np.nan, axis=1)
+
+    def sample_vectors(self, max_triangles):
+        """
+        Triângulos das instâncias no referencial do mundo, para o plot 3D, com no máximo `max_triangles` triângulos
+        (as faces são dizimadas igualmente em todas as instâncias, como `MAX_POINTS_3D` faz com as nuvens; com mais
+        instâncias que `max_triangles`, as próprias instâncias também são amostradas).
+
+        Retorna:
+            vectors (numpy.ndarray): Triângulos (F, 3, 3), ou None quando a malha não tem triângulos.
+        """
+        if self.mesh_vectors is None:
+            return None
+        max_triangles = max(1, int(max_triangles))
+        transforms = self.transforms[::max(1, -(-len(self) // max_triangles))]
+        per_instance = max(1, max_triangles // len(transforms))
+        faces = self.mesh_vectors[::max(1, -(-len(self.mesh_vectors) // per_instance))]
+        rotated = np.einsum('nij,tkj->ntki', transforms[:, :3, :3], faces)
+        return (rotated + transforms[:, None, None, :3, 3]).reshape(-1, 3, 3)
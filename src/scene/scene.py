@@ -0,0 +1,214 @@
+import numpy as np
+
+from src.utils.meshes import load_mesh
+from src.utils.projection import project_points
+from src.utils.transformations import field_transform, move
+
+
+class SceneObject:
+    """
+    Um objeto da cena: malha (ou nuvem de pontos) no referencial local e sua transformação de modelo.
+
+    Atributos:
+        name (str): Nome do objeto na cena.
+        points (numpy.ndarray): Coordenadas homogêneas 4xV no referencial do objeto.
+        vectors (numpy.ndarray): Triângulos Tx3x3 no referencial do objeto (None para nuvens de pontos).
+        model (numpy.ndarray): Matriz 4x4 que leva o objeto para o referencial do mundo.
+    """
+
+    def __init__(self, name, points, vectors=None, model=None):
+        self.name = name
+        self.points = points
+        self.vectors = vectors
+        self.model = np.eye(4) if model is None else np.asarray(model, dtype=float)
+
+    @property
+    def size(self):
+        return self.points.shape[1]
+
+    def world_points(self):
+        return np.dot(self.model, self.points)
+
+    def world_vectors(self):
+        if self.vectors is None:
+            return None
+        return np.dot(self.vectors, self.model[:3, :3].T) + self.model[:3, 3]
+
+
+class Scene:
+    """
+    Contêiner de vários objetos, cada um com sua própria transformação de modelo.
+
+    Os vértices de todos os objetos, já no referencial do mundo, ficam concatenados em um único buffer 4xN.
+    A cada quadro basta uma multiplicação `P @ buffer` para projetar a cena inteira; `offsets` indica onde começa
+    e termina cada objeto no resultado. Quando a transformação de um objeto muda, apenas o trecho dele no buffer
+    é recalculado.
+
+    Como o buffer é alterado no lugar, `version` é incrementado a cada mudança de geometria (objetos adicionados,
+    removidos ou movidos); caches que identificam a cena pelo objeto usam também essa versão.
+    """
+
+    def __init__(self):
+        self.objects = []
+        self.version = 0
+        self._buffer = None
+        self._vectors = None
+        self._vectors_ready = False
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._dirty = set()
+        self._layout_dirty = True
+
+    @classmethod
+    def from_files(cls, filepaths, gap=10):
+        """
+        Monta uma cena com as malhas dos arquivos, lado a lado ao longo do eixo X.
+
+        Parâmetros:
+            filepaths (list): Caminhos das malhas STL ou nuvens de pontos.
+            gap (float): Espaço entre as caixas envolventes de objetos vizinhos.
+
+        Retorna:
+            scene (Scene): A cena montada.
+        """
+        scene = cls()
+        x = 0
+        for filepath in filepaths:
+            points, vectors = load_mesh(filepath)
+            x_min, x_max = float(points[0].min()), float(points[0].max())
+            scene.add(filepath, points, vectors, model=move(x - x_min, 0, 0))
+            x += x_max - x_min + gap
+        return scene
+
+    def __len__(self):
+        return len(self.objects)
+
+    def add(self, name, points, vectors=None, model=None):
+        """
+        Adiciona um objeto à cena.
+
+        Parâmetros:
+            name (str): Nome do objeto (usado para buscá-lo depois); nomes repetidos recebem um sufixo ("#2", "#3").
+            points (numpy.ndarray): Coordenadas homogêneas 4xV no referencial do objeto.
+            vectors (numpy.ndarray): Triângulos Tx3x3 no referencial do objeto (opcional).
+            model (numpy.ndarray): Transformação de modelo 4x4 (identidade por padrão).
+
+        Retorna:
+            obj (SceneObject): O objeto adicionado.
+        """
+        names = {obj.name for obj in self.objects}
+        unique, copy = name, 1
+        while unique in names:
+            copy += 1
+            unique = f"{name}#{copy}"
+        obj = SceneObject(unique, points, vectors, model)
+        self.objects.append(obj)
+        self._layout_dirty = True
+        self.version += 1
+        return obj
+
+    def remove(self, name):
+        self.objects.pop(self.index(name))
+        self._layout_dirty = True
+        self.version += 1
+
+    def index(self, name):
+        for i, obj in enumerate(self.objects):
+            if obj.name == name:
+                return i
+        raise KeyError(f"Objeto nao encontrado na cena: {name}")
+
+    def set_model(self, name, model):
+        """
+        Substitui a transformação de modelo de um objeto.
+        """
+        i = self.index(name)
+        self.objects[i].model = np.asarray(model, dtype=float)
+        self._dirty.add(i)
+        self.version += 1
+
+    def world_action(self, name, key, value):
+        """
+        Aplica a um objeto uma transformação no estilo de `world_action` ("X(move):", "Z(angle):", ...).
+
+        Parâmetros:
+            name (str): Nome do objeto.
+            key (str): Campo da transformação.
+            value (float): Deslocamento ou ângulo (em graus).
+        """
+        i = self.index(name)
+        self.objects[i].model = np.dot(field_transform(key, value), self.objects[i].model)
+        self._dirty.add(i)
+        self.version += 1
+
+    def _update(self):
+        """
+        Atualiza o buffer concatenado: inteiro quando objetos são adicionados ou removidos, ou apenas os trechos
+        dos objetos cuja transformação mudou.
+        """
+        if self._layout_dirty:
+            sizes = [obj.size for obj in self.objects]
+            self._offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+            self._buffer = np.empty((4, int(self._offsets[-1])))
+            self._dirty = set(range(len(self.objects)))
+            self._layout_dirty = False
+        if self._dirty:
+            for i in self._dirty:
+                self._buffer[:, self._offsets[i]:self._offsets[i + 1]] = self.objects[i].world_points()
+            self._dirty = set()
+            self._vectors_ready = False
+
+    @property
+    def points(self):
+        """
+        Vértices de todos os objetos no referencial do mundo, concatenados (4xN, mesmo formato de `self.urso`).
+        """
+        self._update()
+        return self._buffer
+
+    @property
+    def offsets(self):
+        """
+        Índices de início de cada objeto no buffer; o objeto `i` ocupa `offsets[i]:offsets[i+1]`.
+        """
+        self._update()
+        return self._offsets
+
+    @property
+    def vectors(self):
+        """
+        Triângulos de todos os objetos no referencial do mundo, concatenados (para o plot 3D); None quando a cena só
+        tem nuvens de pontos, como `urso_vectors` de uma nuvem.
+        """
+        self._update()
+        if not self._vectors_ready:
+            vectors = [obj.world_vectors() for obj in self.objects if obj.vectors is not None]
+            self._vectors = np.concatenate(vectors) if vectors else None
+            self._vectors_ready = True
+        return self._vectors
+
+    def project(self, P):
+        """
+        Projeta todos os objetos da cena com uma única multiplicação de matrizes.
+
+        Parâmetros:
+            P (numpy.ndarray): Matriz de projeção 3x4.
+
+        Retorna:
+            points_2d (numpy.ndarray): Coordenadas 3xN (u, v, 1) de todos os objetos.
+            offsets (numpy.ndarray): Início de cada objeto em `points_2d`.
+            valid (bool): False quando a terceira coordenada homogênea contém zeros.
+        """
+        points_2d, valid = project_points(P, self.points)
+        return points_2d, self._offsets, valid
+
+    def split(self, points_2d):
+        """
+        Separa um resultado concatenado (de `project`) em uma lista com o trecho de cada objeto.
+        """
+        return np.split(points_2d, self.offsets[1:-1], axis=1)
+
+    def polyline(self, points_2d):
+        """
+        Insere colunas NaN entre os objetos, para que um único `plot` desenhe todos sem ligar um objeto ao outro.
+        """
+        return np.insert(points_2d[:2], self.offsets[1:-1], np.nan, axis=1)
@@ -0,0 +1,83 @@
+import numpy as np
+
+# Partes do estado da cena das quais cada vista depende. A vista 3D mostra a malha e os eixos da câmera, mas não
+# depende dos parâmetros intrínsecos nem do modo de desenho da imagem 2D.
+VIEW_DEPENDENCIES = {
+    "2d": ("pose", "intrinsics", "mesh", "render_mode"),
+    "3d": ("pose", "mesh"),
+}
+
+# Partes comparadas por identidade: o valor é o par (objeto, versão), já que a malha é grande; uma `Scene` alterada
+# no lugar continua sendo o mesmo objeto, mas incrementa `version`
+IDENTITY_PARTS = ("mesh",)
+
+
+def _same_identity(a, b):
+    return a[0] is b[0] and a[1] == b[1]
+
+
+def _same(a, b):
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        a, b = np.asarray(a), np.asarray(b)
+        return a.shape == b.shape and np.array_equal(a, b)
+    return a == b
+
+
+def _snapshot(value):
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, dict):
+        return dict(value)
+    return value
+
+
+class SceneState:
+    """
+    Estado observável da cena: pose da câmera, parâmetros intrínsecos, malha e modo de desenho.
+
+    Cada parte tem um contador de versão, incrementado apenas quando o valor realmente muda. Cada vista guarda as
+    versões com que foi desenhada pela última vez e só fica desatualizada quando muda uma das partes das quais
+    depende (`VIEW_DEPENDENCIES`).
+
+    Atributos:
+        versions (dict): Versão atual de cada parte ("pose", "intrinsics", "mesh", "render_mode").
+    """
+
+    def __init__(self):
+        self.versions = {part: 0 for part in ("pose", "intrinsics", "mesh", "render_mode")}
+        self._values = {}
+        self._drawn = {}
+
+    def update(self, **parts):
+        """
+        Compara os valores recebidos com os guardados e incrementa a versão das partes que mudaram.
+
+        Parâmetros:
+            **parts: Valores atuais, por parte (ex.: `pose=self.cam`, `intrinsics=self.params_intrinsc_values`).
+
+        Retorna:
+            changed (list): Partes cuja versão foi incrementada.
+        """
+        changed = []
+        for part, value in parts.items():
+            if part in self._values:
+                old = self._values[part]
+                if _same_identity(old, value) if part in IDENTITY_PARTS else _same(old, value):
+                    continue
+            self._values[part] = value if part in IDENTITY_PARTS else _snapshot(value)
+            self.versions[part] += 1
+            changed.append(part)
+        return changed
+
+    def view_key(self, view):
+        return tuple(self.versions[part] for part in VIEW_DEPENDENCIES[view])
+
+    def stale_views(self):
+        """
+        Retorna as vistas ("2d", "3d") cujas dependências mudaram desde o último desenho.
+        """
+        return [view for view in VIEW_DEPENDENCIES if self._drawn.get(view) != self.view_key(view)]
+
+    def mark_drawn(self, views):
+        for view in views:
+            self._drawn[view] = self.view_key(view)
@@ -0,0 +1,71 @@
+import json
+import time
+
+
+class SessionRecorder:
+    """
+    Grava a sequência de alterações de parâmetros confirmadas pelo usuário durante uma sessão.
+
+    Cada evento guarda o instante (em segundos, relativo ao início da gravação), o tipo da alteração e os valores
+    aplicados. Os tipos de evento correspondem aos pontos de entrada da interface:
+        - "cam": valores aplicados por `update_cam` (campos de `cam_values`).
+        - "world": valores aplicados por `update_world` (campos de `world_values`).
+        - "intrinsic": valores aplicados por `validate_and_update_params` (campos de `params_intrinsc_values`).
+        - "reset": chamada a `reset_canvas` (valor "cam": pose da câmera após o reset, 4x4).
+        - "restore": estado restaurado por desfazer/refazer (valores "cam", 4x4, e "intrinsic", parâmetros intrínsecos).
+
+    O cabeçalho guarda a malha (`mesh`) e, em sessões com `--grid`, o tamanho da grade (`grid`), para que a
+    reprodução projete as mesmas instâncias.
+    """
+
+    def __init__(self, mesh=None, grid=None):
+        self.mesh = mesh
+        self.grid = list(grid) if grid else None
+        self.events = []
+        self.start = time.perf_counter()
+
+    def record(self, kind, values=None):
+        """
+        Registra um evento na sessão.
+
+        Parâmetros:
+            kind (str): Tipo do evento ("cam", "world", "intrinsic", "reset" ou "restore").
+            values (dict): Campos e valores aplicados, na ordem em que foram aplicados.
+        """
+        self.events.append({
+            "t": time.perf_counter() - self.start,
+            "kind": kind,
+            "values": dict(values or {}),
+        })
+
+    def to_dict(self):
+        return {"mesh": self.mesh, "grid": self.grid, "events": self.events}
+
+    def save(self, filepath):
+        """
+        Salva a sessão gravada em um arquivo JSON.
+
+        Parâmetros:
+            filepath (str): Caminho do arquivo de saída.
+        """
+        with open(filepath, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+
+def load_session(filepath):
+    """
+    Carrega uma sessão gravada por `SessionRecorder.save`.
+
+    Parâmetros:
+        filepath (str): Caminho do arquivo JSON da sessão.
+
+    Retorna:
+        session (dict): Dicionário com a malha usada (`mesh`), a grade de instâncias (`grid`, None sem `--grid`) e a
+        lista de eventos (`events`).
+    """
+    with open(filepath, "r", encoding="utf-8") as f:
+        session = json.load(f)
+    session.setdefault("mesh", None)
+    session.setdefault("grid", None)
+    session.setdefault("events", [])
+    return session
@@ -0,0 +1,165 @@
+import argparse
+import time
+
+import numpy as np
+
+from src.camera.initialize_camera import initialize_camera
+from src.intrinsic.distortion import apply_distortion, distortion_coefficients, has_distortion
+from src.scene.instancing import InstancedMesh
+from src.scene.scene import Scene
+from src.session.recorder import load_session
+from src.utils.meshes import DEFAULT_MESH, load_mesh
+from src.utils.projection import default_intrinsics, derive_intrinsics, intrinsic_matrix, projection_matrix, project_points
+from src.utils.transformations import field_transform
+
+
+class HeadlessSession:
+    """
+    Reproduz, sem interface gráfica, o estado da cena manipulado pela janela principal.
+
+    Mantém a pose da câmera (`cam`) e os parâmetros intrínsecos (`params_intrinsc_values`) e aplica os eventos
+    gravados com a mesma matemática de `cam_action`, `world_action`, `update_params_intrinsc`, `reset_canvas` e
+    `restore_state`.
+    A cada evento a malha é projetada como em `plot2d`, sem desenhar nada; uma `InstancedMesh` (sessões com
+    `--grid`) é projetada em lote, com todas as instâncias.
+    """
+
+    def __init__(self, urso):
+        self.urso = urso
+        self.reset()
+
+    def reset(self, cam=None):
+        """
+        Volta a câmera e os parâmetros intrínsecos para os valores iniciais (equivalente a `reset_canvas`).
+
+        Parâmetros:
+            cam (list): Pose gravada no evento de reset (por exemplo, com enquadramento automático), opcional.
+        """
+        self.cam = initialize_camera()['cam'] if cam is None else np.array(cam, dtype=float)
+        self.zero_cam = np.eye(4)
+        self.params_intrinsc_values = default_intrinsics()
+
+    def apply(self, event):
+        """
+        Aplica um evento gravado ao estado da cena.
+
+        Parâmetros:
+            event (dict): Evento no formato gravado por `SessionRecorder.record`.
+        """
+        kind = event["kind"]
+        values = event.get("values", {})
+        if kind == "cam":
+            for key, value in values.items():
+                self.cam = np.dot(self.cam, np.dot(field_transform(key, value), self.zero_cam))
+        elif kind == "world":
+            for key, value in values.items():
+                self.cam = np.dot(field_transform(key, value), self.cam)
+        elif kind == "intrinsic":
+            self.params_intrinsc_values.update(values)
+            derive_intrinsics(self.params_intrinsc_values)
+        elif kind == "reset":
+            self.reset(values.get("cam"))
+        elif kind == "restore":
+            self.cam = np.array(values["cam"], dtype=float)
+            self.params_intrinsc_values.update(values.get("intrinsic", {}))
+            derive_intrinsics(self.params_intrinsc_values)
+        else:
+            raise ValueError(f"Tipo de evento desconhecido: {kind}")
+
+    def render(self):
+        """
+        Projeta a malha com o estado atual (mesma matemática de `plot2d`).
+
+        Retorna:
+            points_2d (numpy.ndarray): Coordenadas 3xN projetadas na imagem.
+        """
+        K = intrinsic_matrix(self.params_intrinsc_values)
+        P = projection_matrix(self.cam, K)
+        if isinstance(self.urso, InstancedMesh):
+            points_2d, _, _ = self.urso.project(P)
+        else:
+            points_2d, _ = project_points(P, self.urso)
+        coeffs = distortion_coefficients(self.params_intrinsc_values)
+        if has_distortion(coeffs):
+            points_2d = apply_distortion(points_2d, K, coeffs)
+        return points_2d
+
+
+def replay_session(session, urso, realtime=False):
+    """
+    Reproduz uma sessão gravada no núcleo de projeção sem interface, medindo a latência de cada passo.
+
+    Parâmetros:
+        session (dict): Sessão carregada por `load_session`.
+        urso (numpy.ndarray): Malha em coordenadas homogêneas 4xN (ou `InstancedMesh`, em sessões com grade).
+        realtime (bool): Se True, respeita os intervalos gravados entre os eventos; se False, reproduz o mais rápido possível.
+
+    Retorna:
+        latencies (numpy.ndarray): Tempo (em segundos) gasto para aplicar e projetar cada evento.
+        headless (HeadlessSession): Estado final da cena após a reprodução.
+    """
+    headless = HeadlessSession(urso)
+    latencies = np.empty(len(session["events"]))
+    start = time.perf_counter()
+    for i, event in enumerate(session["events"]):
+        if realtime:
+            delay = event["t"] - (time.perf_counter() - start)
+            if delay > 0:
+                time.sleep(delay)
+        step_start = time.perf_counter()
+        headless.apply(event)
+        headless.render()
+        latencies[i] = time.perf_counter() - step_start
+    return latencies, headless
+
+
+def latency_summary(latencies):
+    """
+    Resume as latências de uma reprodução.
+
+    Parâmetros:
+        latencies (numpy.ndarray): Latências por passo, em segundos.
+
+    Retorna:
+        summary (dict): Número de passos, total, média, p50, p95, p99 e máximo (em milissegundos, exceto `steps`).
+    """
+    if latencies.size == 0:
+        return {"steps": 0}
+    ms = latencies*1000
+    return {
+        "steps": int(ms.size),
+        "total_ms": float(ms.sum()),
+        "mean_ms": float(ms.mean()),
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p95_ms": float(np.percentile(ms, 95)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "max_ms": float(ms.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduz uma sessao gravada e mede a latencia de cada passo.")
+    parser.add_argument("session", help="Arquivo JSON gravado com --record.")
+    parser.add_argument("--mesh", help="Malha STL ou nuvem de pontos (padrao: a malha gravada na sessao).")
+    parser.add_argument("--realtime", action="store_true", help="Respeita os intervalos gravados entre os eventos.")
+    parser.add_argument("--repeat", type=int, default=1, help="Numero de repeticoes da sessao.")
+    args = parser.parse_args()
+
+    session = load_session(args.session)
+    mesh = args.mesh or session["mesh"] or DEFAULT_MESH
+    if isinstance(mesh, list):
+        urso = Scene.from_files(mesh).points
+    else:
+        urso, urso_vectors = load_mesh(mesh)
+        if session["grid"]:
+            nx, ny = session["grid"]
+            print(f"[LOG] Sessao gravada com grade {nx}x{ny}: reproduzindo {nx*ny} instancias da malha.")
+            urso = InstancedMesh.grid(urso, urso_vectors, nx, ny)
+
+    latencies = np.concatenate([replay_session(session, urso, realtime=args.realtime)[0] for _ in range(args.repeat)])
+    for key, value in latency_summary(latencies).items():
+        print(f"[LOG] {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
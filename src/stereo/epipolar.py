@@ -0,0 +1,142 @@
+import numpy as np
+
+from src.utils.geometry import skew
+
+# A geometria epipolar vale para o modelo pinhole: pontos com distorção de lente precisam ser corrigidos antes
+# (`undistort_points` em src/intrinsic/distortion.py), e as retas são retas apenas na imagem sem distorção.
+
+
+def relative_pose(cam1, cam2):
+    """
+    Pose da câmera 1 no referencial da câmera 2 (X2 = R · X1 + t), a partir das poses no formato de `self.cam`.
+
+    Parâmetros:
+        cam1, cam2 (numpy.ndarray): Poses 4x4 das câmeras no referencial do mundo.
+
+    Retorna:
+        R (numpy.ndarray): Rotação 3x3.
+        t (numpy.ndarray): Translação (3,).
+    """
+    T = np.dot(np.linalg.inv(cam2), cam1)
+    return T[:3, :3], T[:3, 3]
+
+
+def essential_matrix(cam1, cam2):
+    """
+    Matriz essencial E = [t]x · R entre duas câmeras (coordenadas normalizadas: x2ᵀ · E · x1 = 0).
+    """
+    R, t = relative_pose(cam1, cam2)
+    return np.dot(skew(t), R)
+
+
+def fundamental_matrix(cam1, K1, cam2, K2):
+    """
+    Matriz fundamental entre duas câmeras (pixels: x2ᵀ · F · x1 = 0), normalizada para norma de Frobenius 1.
+
+    Parâmetros:
+        cam1, cam2 (numpy.ndarray): Poses 4x4 das câmeras (formato de `self.cam`).
+        K1, K2 (numpy.ndarray): Matrizes intrínsecas 3x3 (`intrinsic_matrix`).
+
+    Retorna:
+        F (numpy.ndarray): Matriz fundamental 3x3.
+    """
+    F = np.linalg.solve(K2.T, np.dot(essential_matrix(cam1, cam2), np.linalg.inv(K1)))
+    norm = np.linalg.norm(F)
+    if norm < 1e-12:
+        raise ValueError("As cameras tem o mesmo centro optico: sem base, nao ha geometria epipolar.")
+    return F/norm
+
+
+def epipoles(F):
+    """
+    Epipolos das duas imagens (projeção do centro de uma câmera na outra), em pixels homogêneos.
+
+    Retorna:
+        e1, e2 (numpy.ndarray): Vetores (3,) com F · e1 = 0 e Fᵀ · e2 = 0 (terceira coordenada 0 no infinito).
+    """
+    _, _, Vt = np.linalg.svd(F)
+    e1 = Vt[-1]
+    _, _, Vt = np.linalg.svd(F.T)
+    e2 = Vt[-1]
+    normalize = lambda e: e/e[2] if abs(e[2]) > 1e-12 else e
+    return normalize(e1), normalize(e2)
+
+
+def homogeneous(points_2d):
+    """
+    Garante coordenadas homogêneas 3xN (acrescenta a linha de 1 a pontos 2xN).
+    """
+    points_2d = np.asarray(points_2d, dtype=float)
+    if points_2d.shape[0] == 2:
+        return np.vstack((points_2d, np.ones(points_2d.shape[1])))
+    return points_2d
+
+
+def epipolar_lines(F, points_2d):
+    """
+    Retas epipolares na segunda imagem dos pontos da primeira (l2 = F · x1), todas de uma vez.
+
+    As retas (a, b, c), com a·u + b·v + c = 0, são normalizadas para a² + b² = 1, de modo que a·u + b·v + c é a
+    distância com sinal (em pixels) de um ponto à reta. Para as retas na primeira imagem, use `F.T`.
+
+    Parâmetros:
+        F (numpy.ndarray): Matriz fundamental 3x3.
+        points_2d (numpy.ndarray): Pontos 2xN ou 3xN da primeira imagem.
+
+    Retorna:
+        lines (numpy.ndarray): Retas 3xN.
+    """
+    lines = np.dot(F, homogeneous(points_2d))
+    return lines/np.hypot(lines[0], lines[1])
+
+
+def epipolar_distances(F, points1, points2):
+    """
+    Distância simétrica (em pixels) de correspondências à geometria epipolar, vetorizada.
+
+    Parâmetros:
+        F (numpy.ndarray): Matriz fundamental 3x3 (x2ᵀ · F · x1 = 0).
+        points1, points2 (numpy.ndarray): Pontos 2xN ou 3xN correspondentes nas duas imagens.
+
+    Retorna:
+        distances (numpy.ndarray): Média das distâncias de x2 à reta de x1 e de x1 à reta de x2 (N,).
+    """
+    x1, x2 = homogeneous(points1), homogeneous(points2)
+    x1, x2 = x1/x1[2], x2/x2[2]
+    d2 = np.abs(np.sum(epipolar_lines(F, x1)*x2, axis=0))
+    d1 = np.abs(np.sum(epipolar_lines(F.T, x2)*x1, axis=0))
+    return (d1 + d2)/2
+
+
+def line_segments(lines, width, height):
+    """
+    Recorta retas pela moldura da imagem e as junta em uma única polilinha, separada por colunas NaN
+    (um único `plot` desenha todas as retas, como em `edge_segments`).
+
+    Parâmetros:
+        lines (numpy.ndarray): Retas 3xN (a, b, c).
+        width, height (float): Dimensões da imagem em pixels.
+
+    Retorna:
+        segments (numpy.ndarray): Pontos 2x3N (início, fim e NaN de cada reta); retas que não cruzam a imagem
+        ficam só com NaN.
+    """
+    a, b, c = lines
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Interseções com as bordas u = 0, u = width, v = 0 e v = height
+        u = np.stack((np.zeros_like(a), np.full_like(a, width), -c/a, -(b*height + c)/a))
+        v = np.stack((-c/b, -(a*width + c)/b, np.zeros_like(a), np.full_like(a, height)))
+    tolerance = 1e-9*max(width, height)
+    inside = (np.isfinite(u) & np.isfinite(v) & (u >= -tolerance) & (u <= width + tolerance)
+              & (v >= -tolerance) & (v <= height + tolerance))
+    # Extremos das interseções válidas ao longo da direção da reta (-b, a); retas pelos cantos repetem pontos
+    position = np.where(inside, -b*u + a*v, np.nan)
+    crosses = inside.sum(axis=0) >= 2
+    position[:, ~crosses] = 0
+    columns = np.arange(lines.shape[1])
+    ends = (np.nanargmin(position, axis=0), np.nanargmax(position, axis=0))
+    segments = np.full((2, 3, lines.shape[1]), np.nan)
+    for k, end in enumerate(ends):
+        segments[0, k] = np.where(crosses, u[end, columns], np.nan)
+        segments[1, k] = np.where(crosses, v[end, columns], np.nan)
+    return segments.transpose(0, 2, 1).reshape(2, -1)
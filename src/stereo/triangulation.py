@@ -0,0 +1,232 @@
+import argparse
+
+import numpy as np
+
+from src.presets.presets import load_preset
+from src.rig.rig import CameraRig
+from src.utils.load_points import save_homogeneous
+from src.utils.meshes import load_mesh
+
+# Limite de correspondências processadas por bloco (os sistemas 4x4 de cada ponto ficam todos na memória)
+CHUNK_POINTS = 250_000
+
+# Número de condição máximo do sistema normal 3x3 da DLT; acima dele, os raios das vistas são praticamente paralelos
+# (base nula ou ângulo de triangulação desprezível) e a profundidade do ponto não é determinada
+MAX_CONDITION = 1e8
+
+
+def normalization(Ps):
+    """
+    Similaridade 4x4 S que centraliza e escala o mundo pelos centros das câmeras, para que as colunas de P · S
+    tenham a mesma ordem de grandeza (o sistema da DLT fica bem condicionado mesmo com poses distantes).
+    """
+    centers = np.array([np.linalg.svd(P)[2][-1] for P in Ps])
+    centers = centers[:, :3]/centers[:, 3:]
+    center = centers.mean(axis=0)
+    scale = max(np.linalg.norm(centers - center, axis=1).mean(), 1e-12)
+    S = np.eye(4)
+    S[:3, :3] *= scale
+    S[:3, 3] = center
+    return S
+
+
+def triangulate_dlt(Ps, points_2d, chunk_points=CHUNK_POINTS, max_condition=MAX_CONDITION):
+    """
+    Triangulação linear (DLT) de correspondências em duas ou mais vistas, vetorizada para todos os pontos.
+
+    Cada observação (u, v) de um ponto na vista i contribui com as equações u·P3 - P1 e v·P3 - P2. Com w = 1, a
+    solução de mínimos quadrados vem do sistema normal 3x3 de M = AᵀA (resolvido em lote, bem mais rápido que
+    decompor M). Quando esse sistema é mal condicionado (raios paralelos, como em câmeras com o mesmo centro óptico),
+    a profundidade do ponto não é determinada e o ponto fica com NaN.
+
+    Parâmetros:
+        Ps (numpy.ndarray): Matrizes de projeção (V, 3, 4), como `CameraRig.projection_matrices`.
+        points_2d (numpy.ndarray): Pixels (V, 2, N) sem distorção; NaN indica que o ponto não foi observado na vista.
+        chunk_points (int): Limite de pontos por bloco.
+        max_condition (float): Número de condição máximo do sistema normal.
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN (x, y, z, 1), como `self.urso`; pontos observados em
+        menos de duas vistas ou mal condicionados ficam com NaN.
+    """
+    S = normalization(Ps)
+    Ps = np.matmul(Ps, S)
+    N = points_2d.shape[2]
+    points = np.full((4, N), np.nan)
+    for start in range(0, N, chunk_points):
+        chunk = slice(start, start + chunk_points)
+        x = points_2d[:, :, chunk]
+        observed = np.isfinite(x).all(axis=1)
+        u = np.where(observed, x[:, 0], 0)[..., None]
+        v = np.where(observed, x[:, 1], 0)[..., None]
+        rows = np.stack((u*Ps[:, None, 2] - Ps[:, None, 0], v*Ps[:, None, 2] - Ps[:, None, 1]))
+        rows *= observed[None, ..., None]/np.linalg.norm(rows, axis=-1, keepdims=True)
+        M = np.einsum('kvni,kvnj->nij', rows, rows)
+        # M[:3, :3] é simétrica semidefinida positiva: o número de condição é a razão entre os autovalores extremos
+        eigenvalues = np.linalg.eigvalsh(M[:, :3, :3])
+        regular = eigenvalues[:, 2] < max_condition*eigenvalues[:, 0]
+        regular &= observed.sum(axis=0) >= 2
+        X = np.full((4, M.shape[0]), np.nan)
+        X[3] = 1
+        X[:3, regular] = np.linalg.solve(M[regular, :3, :3], -M[regular, :3, 3:])[..., 0].T
+        X = np.dot(S, X)
+        X = X/X[3]
+        points[:, chunk] = X
+    return points
+
+
+def reprojection(Ps, points):
+    """
+    Projeção pinhole de pontos 4xN em todas as vistas.
+
+    Retorna:
+        points_2d (numpy.ndarray): Pixels (V, 2, N).
+        depth (numpy.ndarray): Terceira coordenada homogênea (V, N).
+    """
+    p = np.matmul(Ps, points)
+    return p[:, :2]/p[:, 2:], p[:, 2]
+
+
+def reprojection_errors(Ps, points_2d, points):
+    """
+    Distância em pixels entre as observações e a reprojeção dos pontos triangulados.
+
+    Retorna:
+        errors (numpy.ndarray): Erros (V, N); NaN onde o ponto não foi observado.
+    """
+    projected, _ = reprojection(Ps, points)
+    return np.linalg.norm(projected - points_2d, axis=1)
+
+
+def refine_points(Ps, points_2d, points, iterations=3, chunk_points=CHUNK_POINTS):
+    """
+    Refinamento não linear (Gauss-Newton) do erro de reprojeção, independente para cada ponto e vetorizado.
+
+    Cada passo resolve em lote os sistemas normais 3x3 JᵀJ · Δ = -Jᵀr; um passo só é aceito nos pontos em que o
+    erro diminui.
+
+    Parâmetros:
+        Ps (numpy.ndarray): Matrizes de projeção (V, 3, 4).
+        points_2d (numpy.ndarray): Pixels (V, 2, N) sem distorção (NaN = não observado).
+        points (numpy.ndarray): Estimativa inicial 4xN (por exemplo, de `triangulate_dlt`).
+        iterations (int): Número de passos.
+        chunk_points (int): Limite de pontos por bloco.
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN refinadas.
+    """
+    points = np.array(points, dtype=float)
+    for start in range(0, points.shape[1], chunk_points):
+        chunk = slice(start, start + chunk_points)
+        x = points_2d[:, :, chunk]
+        observed = np.isfinite(x).all(axis=1)
+        x = np.where(observed[:, None], x, 0)
+        X = points[:, chunk]
+        valid = np.isfinite(X).all(axis=0)
+        X[:, ~valid] = 0
+        X[3] = 1
+
+        def residuals(X):
+            p = np.matmul(Ps, X)
+            r = (p[:, :2]/p[:, 2:] - x)*observed[:, None]
+            return p, r, np.sum(r*r, axis=(0, 1))
+
+        p, r, cost = residuals(X)
+        for _ in range(iterations):
+            # d(u, v)/dX = (P[0:2, :3] - (u, v) · P[2, :3])/w, para cada vista e cada ponto
+            J = (Ps[:, None, :2, :3] - (p[:, :2]/p[:, 2:]).transpose(0, 2, 1)[..., None]*Ps[:, None, None, 2, :3])
+            J = J/p[:, 2, :, None, None]*observed[..., None, None]
+            JtJ = np.einsum('vnki,vnkj->nij', J, J)
+            Jtr = np.einsum('vnki,vkn->ni', J, r)
+            # Amortecimento mínimo: pontos sem solução (inválidos ou degenerados) ficam com passo nulo
+            JtJ += (1e-12*np.trace(JtJ, axis1=1, axis2=2) + 1e-300)[:, None, None]*np.eye(3)
+            Jtr[~valid] = 0
+            candidate = X.copy()
+            candidate[:3] -= np.linalg.solve(JtJ, Jtr[..., None])[..., 0].T
+            p_new, r_new, cost_new = residuals(candidate)
+            better = cost_new < cost
+            X[:, better] = candidate[:, better]
+            p[..., better], r[..., better], cost[better] = p_new[..., better], r_new[..., better], cost_new[better]
+        X[:, ~valid] = np.nan
+        points[:, chunk] = X
+    return points
+
+
+def triangulate(Ps, points_2d, refine=True, iterations=3, chunk_points=CHUNK_POINTS):
+    """
+    Triangula correspondências (V, 2, N) em pontos 4xN: DLT seguida, opcionalmente, de `refine_points`.
+    """
+    points = triangulate_dlt(Ps, points_2d, chunk_points)
+    if refine:
+        points = refine_points(Ps, points_2d, points, iterations, chunk_points)
+    return points
+
+
+def triangulate_rig(rig, points_2d, refine=True, iterations=3, chunk_points=CHUNK_POINTS):
+    """
+    Inverso de `CameraRig.project`: corrige a distorção de cada câmera do rig e triangula as correspondências.
+
+    Parâmetros:
+        rig (CameraRig): Câmeras que observaram os pontos.
+        points_2d (numpy.ndarray): Pixels observados (V, 2, N), com distorção (NaN = não observado).
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN no referencial do mundo.
+    """
+    return triangulate(rig.projection_matrices(), rig.undistort(points_2d), refine, iterations, chunk_points)
+
+
+def compare_to_mesh(points, mesh):
+    """
+    Distância de cada ponto reconstruído à malha de referência.
+
+    Quando há tantas correspondências quanto vértices (correspondências geradas pela própria malha, como as de
+    `render_views`), compara vértice a vértice; caso contrário, usa o vértice mais próximo (`scipy.spatial.cKDTree`,
+    quando o scipy está instalado).
+
+    Retorna:
+        distances (numpy.ndarray): Distância de cada ponto (N,), ou None sem o scipy.
+    """
+    if points.shape[1] == mesh.shape[1]:
+        return np.linalg.norm(points[:3] - mesh[:3], axis=0)
+    try:
+        from scipy.spatial import cKDTree
+    except ImportError:
+        return None
+    distances = np.full(points.shape[1], np.nan)
+    valid = np.isfinite(points).all(axis=0)
+    distances[valid], _ = cKDTree(np.asarray(mesh[:3].T)).query(points[:3, valid].T)
+    return distances
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Triangula correspondencias 2D das cameras de um rig.")
+    parser.add_argument("preset", help="Preset (.json ou .toml) com as cameras do rig, uma por vista.")
+    parser.add_argument("correspondences", help="Arquivo .npz com 'points_2d' (V, 2, N) em pixels (como o de src.presets.presets).")
+    parser.add_argument("--mesh", help="Malha STL ou nuvem de pontos para comparar a reconstrucao.")
+    parser.add_argument("--no-refine", action="store_true", help="Usa apenas a triangulacao linear (DLT).")
+    parser.add_argument("--output", default="reconstrucao.npy", help="Nuvem de pontos 4xN reconstruida (.npy).")
+    args = parser.parse_args()
+
+    rig = CameraRig.from_views(load_preset(args.preset))
+    points_2d = np.load(args.correspondences)["points_2d"]
+    if len(points_2d) != len(rig):
+        parser.error(f"As correspondencias tem {len(points_2d)} vistas e o rig tem {len(rig)} cameras.")
+    points = triangulate_rig(rig, points_2d, refine=not args.no_refine)
+    valid = np.isfinite(points).all(axis=0)
+    errors = reprojection_errors(rig.projection_matrices(), rig.undistort(points_2d), points)
+    print(f"[LOG] {valid.sum()} de {points.shape[1]} pontos triangulados; "
+          f"erro de reprojecao medio: {np.nanmean(errors[:, valid]) if valid.any() else np.nan:.4f} px")
+    if args.mesh and valid.any():
+        urso, _ = load_mesh(args.mesh)
+        distances = compare_to_mesh(points, urso)
+        if distances is None:
+            print("[LOG] Comparacao com a malha requer o scipy (ou uma correspondencia por vertice).")
+        else:
+            print(f"[LOG] Distancia a malha: media {np.nanmean(distances):.6f}, maxima {np.nanmax(distances):.6f}")
+    save_homogeneous(points, args.output)
+    print(f"[LOG] Reconstrucao salva em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
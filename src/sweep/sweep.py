@@ -0,0 +1,204 @@
+import argparse
+import csv
+
+import numpy as np
+
+from src.camera.initialize_camera import initialize_camera
+from src.intrinsic.distortion import DISTORTION_KEYS, apply_distortion_batch, distortion_coefficients, has_distortion
+from src.utils.meshes import DEFAULT_MESH, load_mesh
+from src.utils.projection import INTRINSIC_LIMITS, default_intrinsics, intrinsic_matrices, projection_matrices, project_points_batch
+from src.utils.transformations import field_transforms
+
+# Campos de pose aceitos na varredura (aplicados como em `world_action`, na ordem em que aparecem)
+POSE_KEYS = ("X(move):", "Y(move):", "Z(move):", "X(angle):", "Y(angle):", "Z(angle):")
+
+# Número máximo de (combinações x vértices) projetados por bloco
+CHUNK_ELEMENTS = 4_000_000
+
+
+def parameter_grid(axes):
+    """
+    Gera o produto cartesiano dos valores de cada parâmetro.
+
+    Parâmetros:
+        axes (dict): Valores de cada parâmetro, por exemplo {"dist_focal:": [1, 10, 100], "X(angle):": [0, 45]}.
+
+    Retorna:
+        grid (dict): Para cada parâmetro, um vetor com o valor em cada combinação (todos com o mesmo tamanho).
+    """
+    keys = list(axes)
+    values = np.meshgrid(*(np.asarray(axes[key], dtype=float) for key in keys), indexing='ij')
+    return {key: value.ravel() for key, value in zip(keys, values)}
+
+
+def grid_intrinsics(grid, params, size):
+    """
+    Monta as matrizes K de todas as combinações, sobrescrevendo `params` com os valores da grade.
+
+    Os parâmetros derivados (`sx`, `sy`, `ox`, `oy`) são recalculados como em `derive_intrinsics`.
+
+    Parâmetros:
+        grid (dict): Grade gerada por `parameter_grid`.
+        params (dict): Parâmetros intrínsecos de base.
+        size (int): Número de combinações.
+
+    Retorna:
+        Ks (numpy.ndarray): Matrizes intrínsecas (B, 3, 3).
+        width, height (numpy.ndarray): Resolução da imagem de cada combinação (B,).
+    """
+    values = {key: np.broadcast_to(np.asarray(grid.get(key, params[key]), dtype=float), (size,))
+              for key in ("n_pixels_base:", "n_pixels_altura:", "ccd_x:", "ccd_y:", "dist_focal:", "s_theta:")}
+    width, height = values["n_pixels_base:"], values["n_pixels_altura:"]
+    Ks = intrinsic_matrices(values["dist_focal:"], width/values["ccd_x:"], height/values["ccd_y:"],
+                            values["s_theta:"], width/2, height/2)
+    return Ks, width, height
+
+
+def grid_cameras(grid, cam, size):
+    """
+    Aplica os campos de pose da grade à câmera de base (mesma composição de `world_action`: cam = T · cam).
+
+    Parâmetros:
+        grid (dict): Grade gerada por `parameter_grid`.
+        cam (numpy.ndarray): Pose 4x4 de base.
+        size (int): Número de combinações.
+
+    Retorna:
+        cams (numpy.ndarray): Poses da câmera (B, 4, 4).
+    """
+    cams = np.broadcast_to(np.asarray(cam, dtype=float), (size, 4, 4))
+    for key, values in grid.items():
+        if key in POSE_KEYS:
+            cams = np.matmul(field_transforms(key, values), cams)
+    return cams
+
+
+def footprint_metrics(points_2d, depth, width, height):
+    """
+    Resume a projeção de cada combinação.
+
+    Parâmetros:
+        points_2d (numpy.ndarray): Pontos projetados (B, 2, N).
+        depth (numpy.ndarray): Profundidade homogênea (B, N).
+        width, height (numpy.ndarray): Resolução da imagem de cada combinação (B,).
+
+    Retorna:
+        metrics (dict): Caixa envolvente 2D dos pontos à frente da câmera (`u_min`, `u_max`, `v_min`, `v_max`,
+        NaN quando nenhum ponto está à frente), `coverage` (fração da imagem ocupada pela caixa) e
+        `visible_fraction` (fração dos pontos à frente da câmera e dentro da imagem).
+    """
+    u, v = points_2d[:, 0], points_2d[:, 1]
+    front = depth > 0
+    any_front = front.any(axis=1)
+    u_min = np.where(any_front, np.where(front, u, np.inf).min(axis=1), np.nan)
+    u_max = np.where(any_front, np.where(front, u, -np.inf).max(axis=1), np.nan)
+    v_min = np.where(any_front, np.where(front, v, np.inf).min(axis=1), np.nan)
+    v_max = np.where(any_front, np.where(front, v, -np.inf).max(axis=1), np.nan)
+
+    inside = front & (u >= 0) & (u < width[:, None]) & (v >= 0) & (v < height[:, None])
+    clipped_w = np.clip(np.minimum(u_max, width) - np.maximum(u_min, 0), 0, None)
+    clipped_h = np.clip(np.minimum(v_max, height) - np.maximum(v_min, 0), 0, None)
+    return {
+        "u_min": u_min,
+        "u_max": u_max,
+        "v_min": v_min,
+        "v_max": v_max,
+        "coverage": np.nan_to_num(clipped_w*clipped_h/(width*height)),
+        "visible_fraction": inside.mean(axis=1),
+    }
+
+
+def run_sweep(axes, points, cam=None, params=None, chunk_elements=CHUNK_ELEMENTS):
+    """
+    Projeta a malha para todas as combinações de parâmetros intrínsecos e de pose, em blocos vetorizados.
+
+    Parâmetros:
+        axes (dict): Valores de cada parâmetro. Aceita os campos intrínsecos de `INTRINSIC_LIMITS` (exceto os de
+            distorção) e os campos de pose de `POSE_KEYS`.
+        points (numpy.ndarray): Malha em coordenadas homogêneas 4xN (como `self.urso`).
+        cam (numpy.ndarray): Pose de base (padrão: a pose inicial de `initialize_camera`).
+        params (dict): Parâmetros intrínsecos de base (padrão: `default_intrinsics`).
+        chunk_elements (int): Limite de combinações x vértices projetados por bloco.
+
+    Retorna:
+        results (dict): Tabela em colunas, com os valores dos parâmetros (sem os ':') e as métricas de
+        `footprint_metrics` de cada combinação.
+    """
+    cam = initialize_camera()['cam'] if cam is None else cam
+    params = default_intrinsics() if params is None else params
+    for key, values in axes.items():
+        if key in POSE_KEYS:
+            continue
+        if key not in INTRINSIC_LIMITS or key in DISTORTION_KEYS:
+            raise ValueError(f"Parametro de varredura desconhecido: {key}")
+        min_val, max_val = INTRINSIC_LIMITS[key]
+        values = np.asarray(values, dtype=float)
+        if np.any(values < min_val) or np.any(values > max_val):
+            raise ValueError(f"{key} fora do limite: {min_val} a {max_val}")
+
+    grid = parameter_grid(axes)
+    size = len(next(iter(grid.values()))) if grid else 1
+    Ks, width, height = grid_intrinsics(grid, params, size)
+    Ps = projection_matrices(grid_cameras(grid, cam, size), Ks)
+    coeffs = distortion_coefficients(params)
+
+    points = np.asarray(points, dtype=float)
+    step = max(1, chunk_elements // points.shape[1])
+    columns = {}
+    for start in range(0, size, step):
+        chunk = slice(start, start + step)
+        points_2d, depth = project_points_batch(Ps[chunk], points)
+        if has_distortion(coeffs):
+            points_2d = apply_distortion_batch(points_2d, Ks[chunk], coeffs)
+        for key, value in footprint_metrics(points_2d, depth, width[chunk], height[chunk]).items():
+            columns.setdefault(key, []).append(value)
+
+    results = {key.strip(":"): values for key, values in grid.items()}
+    results.update({key: np.concatenate(values) for key, values in columns.items()})
+    return results
+
+
+def save_results(results, filepath):
+    """
+    Salva a tabela de resultados em colunas: `.npz` (uma coluna por array) ou `.csv` (com cabeçalho).
+    """
+    if filepath.lower().endswith(".npz"):
+        np.savez(filepath, **results)
+        return
+    with open(filepath, "w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(list(results))
+        writer.writerows(zip(*(values.tolist() for values in results.values())))
+
+
+def parse_axis(text):
+    """
+    Converte um argumento "campo=inicio:fim:quantidade" (ou "campo=v1,v2,...") em (campo, valores).
+    """
+    key, _, spec = text.partition("=")
+    key = key.strip()
+    if not key.endswith(":"):
+        key += ":"
+    if ":" in spec:
+        start, stop, num = spec.split(":")
+        return key, np.linspace(float(start), float(stop), int(num))
+    return key, np.array([float(value) for value in spec.split(",")])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura de parametros intrinsecos e de pose da camera.")
+    parser.add_argument("--mesh", default=DEFAULT_MESH, help="Malha STL ou nuvem de pontos.")
+    parser.add_argument("--param", action="append", default=[], metavar="CAMPO=INICIO:FIM:N",
+                        help="Parametro varrido, por exemplo dist_focal=1:1000:50 ou 'X(angle)=0,45,90'.")
+    parser.add_argument("--output", default="sweep.npz", help="Arquivo de resultados (.npz ou .csv).")
+    args = parser.parse_args()
+
+    urso, _ = load_mesh(args.mesh)
+    axes = dict(parse_axis(text) for text in args.param)
+    results = run_sweep(axes, urso)
+    save_results(results, args.output)
+    print(f"[LOG] {len(results['coverage'])} combinacoes salvas em {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import numpy as np
+
+
+def oriented_box_corners(points):
+    """
+    Calcula os 8 vértices da caixa envolvente orientada (eixos principais da nuvem, obtidos por PCA).
+
+    Parâmetros:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN.
+
+    Retorna:
+        corners (numpy.ndarray): Vértices da caixa em coordenadas homogêneas 4x8.
+    """
+    xyz = np.asarray(points[:3], dtype=float)
+    center = xyz.mean(axis=1, keepdims=True)
+    _, _, axes = np.linalg.svd((xyz - center).T, full_matrices=False)
+    local = np.dot(axes, xyz - center)
+    low, high = local.min(axis=1), local.max(axis=1)
+    signs = np.array(np.meshgrid([0, 1], [0, 1], [0, 1], indexing='ij')).reshape(3, 8)
+    corners = np.dot(axes.T, low[:, None] + signs*(high - low)[:, None]) + center
+    return np.vstack((corners, np.ones((1, 8))))
+
+
+def hull_points(points):
+    """
+    Reduz a malha aos pontos que bastam para calcular sua caixa envolvente 2D em qualquer projeção.
+
+    Usa os vértices do fecho convexo (scipy.spatial.ConvexHull) quando o scipy está instalado; nesse caso a
+    caixa 2D calculada a partir deles é exata. Sem o scipy, usa os 8 vértices da caixa orientada, que dão uma
+    caixa 2D conservadora (contém a da malha).
+
+    Parâmetros:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN (como `self.urso`).
+
+    Retorna:
+        hull (numpy.ndarray): Pontos selecionados em coordenadas homogêneas 4xH.
+        exact (bool): True quando `hull` são os vértices do fecho convexo.
+    """
+    try:
+        from scipy.spatial import ConvexHull, QhullError
+    except ImportError:
+        return oriented_box_corners(points), False
+    try:
+        vertices = ConvexHull(np.asarray(points[:3], dtype=float).T).vertices
+    except (QhullError, ValueError):
+        # Malhas degeneradas (planas, por exemplo) não têm fecho convexo 3D
+        return oriented_box_corners(points), False
+    return np.asarray(points[:, np.sort(vertices)], dtype=float), True
+
+
+def projected_bbox(Ps, hull, width, height):
+    """
+    Caixa envolvente 2D e teste de enquadramento a partir dos pontos de `hull_points` (custo O(H) por consulta).
+
+    Como a projeção perspectiva leva o fecho convexo da malha no fecho convexo da imagem (com todos os pontos à
+    frente da câmera), os extremos em u e v são atingidos por vértices do fecho.
+
+    Parâmetros:
+        Ps (numpy.ndarray): Matriz de projeção 3x4 ou lote (B, 3, 4).
+        hull (numpy.ndarray): Pontos 4xH retornados por `hull_points`.
+        width, height (float ou numpy.ndarray): Resolução da imagem (`n_pixels_base`, `n_pixels_altura`).
+
+    Retorna:
+        bbox (numpy.ndarray): (u_min, v_min, u_max, v_max), no formato (4,) ou (B, 4). NaN quando algum ponto está
+            atrás da câmera (a projeção não é limitada nesse caso).
+        in_frame (numpy.ndarray): True quando a caixa inteira cabe na imagem.
+    """
+    Ps = np.asarray(Ps, dtype=float)
+    single = Ps.ndim == 2
+    projected = np.matmul(Ps.reshape(-1, 3, 4), hull)
+    depth = projected[:, 2]
+    front = np.all(depth > 0, axis=1)
+    safe = np.where(depth > 0, depth, 1)
+    u, v = projected[:, 0]/safe, projected[:, 1]/safe
+    bbox = np.stack((u.min(axis=1), v.min(axis=1), u.max(axis=1), v.max(axis=1)), axis=1)
+    bbox[~front] = np.nan
+    in_frame = front & (bbox[:, 0] >= 0) & (bbox[:, 1] >= 0) & (bbox[:, 2] <= width) & (bbox[:, 3] <= height)
+    if single:
+        return bbox[0], bool(in_frame[0])
+    return bbox, in_frame
+
+
+def bounding_sphere(points):
+    """
+    Calcula uma esfera envolvente da malha (aproximação de Ritter, em duas passadas vetorizadas).
+
+    Parâmetros:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN.
+
+    Retorna:
+        center (numpy.ndarray): Centro da esfera (3,).
+        radius (float): Raio da esfera (todos os pontos estão dentro dela).
+    """
+    xyz = np.asarray(points[:3], dtype=float)
+    a = xyz[:, np.argmax(np.sum((xyz - xyz[:, :1])**2, axis=0))]
+    b = xyz[:, np.argmax(np.sum((xyz - a[:, None])**2, axis=0))]
+    center = (a + b)/2
+    radius = np.sqrt(np.max(np.sum((xyz - center[:, None])**2, axis=0)))
+    return center, float(radius)
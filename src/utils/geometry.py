@@ -0,0 +1,82 @@
+import numpy as np
+
+
+def skew(v):
+    """
+    Monta as matrizes antissimétricas [v]x de vetores 3D (em lote).
+
+    Parâmetros:
+        v (numpy.ndarray): Vetores no formato (..., 3).
+
+    Retorna:
+        S (numpy.ndarray): Matrizes (..., 3, 3) tais que S @ w = v x w.
+    """
+    v = np.asarray(v, dtype=float)
+    S = np.zeros(v.shape[:-1] + (3, 3))
+    S[..., 0, 1] = -v[..., 2]
+    S[..., 0, 2] = v[..., 1]
+    S[..., 1, 0] = v[..., 2]
+    S[..., 1, 2] = -v[..., 0]
+    S[..., 2, 0] = -v[..., 1]
+    S[..., 2, 1] = v[..., 0]
+    return S
+
+
+def rodrigues(omega):
+    """
+    Converte vetores de rotação (eixo * ângulo, em radianos) em matrizes de rotação (em lote).
+
+    Parâmetros:
+        omega (numpy.ndarray): Vetores de rotação no formato (..., 3).
+
+    Retorna:
+        R (numpy.ndarray): Matrizes de rotação (..., 3, 3).
+    """
+    omega = np.asarray(omega, dtype=float)
+    theta = np.linalg.norm(omega, axis=-1)[..., None, None]
+    S = skew(omega)
+    small = theta < 1e-8
+    safe = np.where(small, 1, theta)
+    a = np.where(small, 1 - theta**2/6, np.sin(safe)/safe)
+    b = np.where(small, 0.5 - theta**2/24, (1 - np.cos(safe))/safe**2)
+    return np.eye(3) + a*S + b*np.matmul(S, S)
+
+
+def pose_to_cam(R, t):
+    """
+    Converte a pose extrínseca (X_cam = R X + t) na matriz da câmera no formato de `self.cam` (em lote).
+
+    `self.cam` é o referencial da câmera escrito no mundo, ou seja, a inversa da matriz extrínseca `M_ext`.
+
+    Parâmetros:
+        R (numpy.ndarray): Rotações (..., 3, 3).
+        t (numpy.ndarray): Translações (..., 3).
+
+    Retorna:
+        cam (numpy.ndarray): Matrizes 4x4 (..., 4, 4).
+    """
+    R = np.asarray(R, dtype=float)
+    t = np.asarray(t, dtype=float)
+    cam = np.zeros(R.shape[:-2] + (4, 4))
+    Rt = np.swapaxes(R, -1, -2)
+    cam[..., :3, :3] = Rt
+    cam[..., :3, 3] = -np.einsum('...ij,...j->...i', Rt, t)
+    cam[..., 3, 3] = 1
+    return cam
+
+
+def cam_to_pose(cam):
+    """
+    Converte matrizes de câmera no formato de `self.cam` na pose extrínseca (R, t), com X_cam = R X + t (em lote).
+
+    Parâmetros:
+        cam (numpy.ndarray): Matrizes 4x4 (..., 4, 4).
+
+    Retorna:
+        R (numpy.ndarray): Rotações (..., 3, 3).
+        t (numpy.ndarray): Translações (..., 3).
+    """
+    cam = np.asarray(cam, dtype=float)
+    R = np.swapaxes(cam[..., :3, :3], -1, -2)
+    t = -np.einsum('...ij,...j->...i', R, cam[..., :3, 3])
+    return R, t
@@ -0,0 +1,260 @@
+import os
+
+import numpy as np
+
+# Tamanho do bloco (em pontos) usado nas conversões e projeções em partes
+CHUNK_SIZE = 1_000_000
+
+# Tipos de propriedade aceitos no cabeçalho PLY
+PLY_TYPES = {
+    "char": "i1", "int8": "i1",
+    "uchar": "u1", "uint8": "u1",
+    "short": "i2", "int16": "i2",
+    "ushort": "u2", "uint16": "u2",
+    "int": "i4", "int32": "i4",
+    "uint": "u4", "uint32": "u4",
+    "float": "f4", "float32": "f4",
+    "double": "f8", "float64": "f8",
+}
+
+POINT_CLOUD_EXTENSIONS = ('.ply', '.xyz', '.npy')
+
+# Cópia 4xN homogênea gravada ao lado de nuvens que não estão nesse formato (PLY binário, `.npy` 3xN ou Nx3)
+HOMOGENEOUS_SUFFIX = ".homogeneous.npy"
+
+
+def to_homogeneous(xyz, dtype=np.float32, out=None):
+    """
+    Converte pontos Nx3 em coordenadas homogêneas 4xN (mesmo formato de `self.urso`), em blocos.
+
+    A conversão em blocos evita cópias intermediárias do tamanho da nuvem inteira quando `xyz` é um memmap.
+
+    Parâmetros:
+        xyz (numpy.ndarray): Pontos Nx3 (pode ser um memmap ou uma visão com passo) ou vetor estruturado com os
+            campos x, y e z (vértices de um PLY binário).
+        dtype (numpy.dtype): Tipo de dado da saída (float32 por padrão, para economizar memória).
+        out (numpy.ndarray): Saída 4xN pré-alocada (por exemplo, um memmap criado com `open_memmap`).
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN.
+    """
+    n = xyz.shape[0]
+    if out is None:
+        out = np.empty((4, n), dtype=dtype)
+    for start in range(0, n, CHUNK_SIZE):
+        stop = min(start + CHUNK_SIZE, n)
+        block = xyz[start:stop]
+        if block.dtype.names:
+            for row, axis in enumerate(("x", "y", "z")):
+                out[row, start:stop] = block[axis]
+        else:
+            out[:3, start:stop] = np.asarray(block).T
+    out[3] = 1
+    return out
+
+
+def homogeneous_file(filepath, xyz):
+    """
+    Converte `xyz` uma única vez para `<nuvem>.homogeneous.npy`, ao lado da nuvem, e devolve esse arquivo mapeado
+    em memória; a cópia é reaproveitada enquanto for mais nova que a nuvem. Sem permissão de escrita na pasta, a
+    conversão é feita na memória.
+
+    Parâmetros:
+        filepath (str): Caminho da nuvem de pontos original.
+        xyz (numpy.ndarray): Pontos Nx3 ou vértices PLY (memmap), como em `to_homogeneous`.
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN (memmap somente leitura quando a cópia pôde ser gravada).
+    """
+    cache = filepath + HOMOGENEOUS_SUFFIX
+    shape = (4, xyz.shape[0])
+    try:
+        if os.path.getmtime(cache) >= os.path.getmtime(filepath):
+            points = np.load(cache, mmap_mode="r")
+            if points.shape == shape:
+                return points
+    except (OSError, ValueError):
+        pass
+
+    try:
+        out = np.lib.format.open_memmap(cache, mode="w+", dtype=np.float32, shape=shape)
+    except OSError:
+        return to_homogeneous(xyz)
+    to_homogeneous(xyz, out=out)
+    out.flush()
+    del out
+    return np.load(cache, mmap_mode="r")
+
+
+def read_ply_header(filepath):
+    """
+    Lê o cabeçalho de um arquivo PLY.
+
+    Parâmetros:
+        filepath (str): Caminho para o arquivo PLY.
+
+    Retorna:
+        header (dict): Formato (`format`), tamanho do cabeçalho em bytes (`offset`), número de linhas do cabeçalho
+        (`lines`) e a lista de elementos (`elements`), cada um com nome, quantidade e propriedades (nome, tipo).
+    """
+    elements = []
+    fmt = None
+    offset = 0
+    lines = 0
+    with open(filepath, "rb") as f:
+        first_line = f.readline()
+        if first_line.strip() != b"ply":
+            raise ValueError(f"Arquivo PLY invalido: {filepath}")
+        # Usa o tamanho da linha lida: cabeçalhos com CRLF ("ply\r\n") têm um byte a mais por linha
+        offset = len(first_line)
+        lines = 1
+        for raw in f:
+            offset += len(raw)
+            lines += 1
+            words = raw.decode("ascii").split()
+            if not words or words[0] in ("comment", "obj_info"):
+                continue
+            if words[0] == "format":
+                fmt = words[1]
+            elif words[0] == "element":
+                elements.append({"name": words[1], "count": int(words[2]), "properties": []})
+            elif words[0] == "property":
+                if words[1] == "list":
+                    elements[-1]["properties"].append((words[-1], "list"))
+                else:
+                    elements[-1]["properties"].append((words[2], words[1]))
+            elif words[0] == "end_header":
+                break
+    return {"format": fmt, "offset": offset, "lines": lines, "elements": elements}
+
+
+def load_ply(filepath, mmap=True):
+    """
+    Carrega os vértices de um arquivo PLY (binário ou ASCII) como coordenadas homogêneas.
+
+    Em arquivos binários os vértices são lidos por mapeamento de memória e convertidos uma única vez para
+    `<nuvem>.homogeneous.npy` (`homogeneous_file`), que é devolvido também mapeado: a nuvem nunca é copiada inteira
+    para a memória. Com `mmap=False`, ou em arquivos ASCII, os pontos são carregados na memória.
+
+    Parâmetros:
+        filepath (str): Caminho para o arquivo PLY.
+        mmap (bool): Usa mapeamento de memória na leitura de arquivos binários.
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN (x, y, z, 1).
+    """
+    header = read_ply_header(filepath)
+    if not header["elements"] or header["elements"][0]["name"] != "vertex":
+        raise ValueError(f"O primeiro elemento do PLY deve ser 'vertex': {filepath}")
+    vertex = header["elements"][0]
+    names = [name for name, _ in vertex["properties"]]
+    if any(kind == "list" for _, kind in vertex["properties"]):
+        raise ValueError(f"Propriedades do tipo lista nao sao suportadas nos vertices: {filepath}")
+
+    if header["format"] == "ascii":
+        usecols = [names.index(axis) for axis in ("x", "y", "z")]
+        xyz = np.loadtxt(filepath, skiprows=header["lines"], max_rows=vertex["count"], usecols=usecols, ndmin=2)
+        return to_homogeneous(xyz)
+
+    endian = "<" if header["format"] == "binary_little_endian" else ">"
+    dtype = np.dtype([(name, endian + PLY_TYPES[kind]) for name, kind in vertex["properties"]])
+    if mmap:
+        data = np.memmap(filepath, dtype=dtype, mode="r", offset=header["offset"], shape=(vertex["count"],))
+        return homogeneous_file(filepath, data)
+    with open(filepath, "rb") as f:
+        f.seek(header["offset"])
+        data = np.fromfile(f, dtype=dtype, count=vertex["count"])
+    return to_homogeneous(data)
+
+
+def load_xyz(filepath):
+    """
+    Carrega um arquivo texto XYZ (uma linha por ponto, colunas separadas por espaço; colunas extras são ignoradas).
+
+    Parâmetros:
+        filepath (str): Caminho para o arquivo XYZ.
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN (x, y, z, 1).
+    """
+    with open(filepath, "r") as f:
+        first_line = f.readline()
+    columns = len(first_line.split())
+    try:
+        values = np.fromfile(filepath, sep=" ")
+        if values.size == 0 or values.size % columns:
+            raise ValueError
+        xyz = values.reshape(-1, columns)[:, :3]
+    except ValueError:
+        # Arquivos com cabeçalho, comentários ou vírgulas: leitura mais lenta, porém tolerante
+        delimiter = "," if "," in first_line else None
+        xyz = np.loadtxt(filepath, usecols=(0, 1, 2), ndmin=2, comments="#", delimiter=delimiter)
+    return to_homogeneous(xyz)
+
+
+def load_npy(filepath, mmap=True):
+    """
+    Carrega uma nuvem de pontos salva em `.npy` (formato 4xN homogêneo, 3xN ou Nx3; colunas extras são ignoradas).
+
+    Arquivos já salvos no formato homogêneo 4xN (ver `save_homogeneous`, última linha toda igual a 1) são usados
+    diretamente por mapeamento de memória, sem cópia; os demais formatos são convertidos uma única vez para
+    `<nuvem>.homogeneous.npy` (`homogeneous_file`). Um array (4, K) sem a linha homogênea é lido como 4 pontos.
+
+    Parâmetros:
+        filepath (str): Caminho para o arquivo `.npy`.
+        mmap (bool): Usa mapeamento de memória na leitura.
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN (x, y, z, 1).
+    """
+    data = np.load(filepath, mmap_mode="r" if mmap else None)
+    if data.ndim == 2 and data.shape[0] == 4 and np.all(data[3] == 1):
+        return data
+    convert = (lambda xyz: homogeneous_file(filepath, xyz)) if mmap else to_homogeneous
+    if data.ndim == 2 and data.shape[0] == 3:
+        return convert(data.T)
+    if data.ndim == 2 and data.shape[1] >= 3:
+        return convert(data[:, :3])
+    raise ValueError(f"Formato de nuvem de pontos nao suportado {data.shape}: {filepath}")
+
+
+def save_homogeneous(points, filepath):
+    """
+    Salva uma nuvem de pontos 4xN em `.npy`, para que `load_npy` possa mapeá-la sem cópia.
+
+    Parâmetros:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN.
+        filepath (str): Caminho do arquivo `.npy` de saída.
+    """
+    out = np.lib.format.open_memmap(filepath, mode="w+", dtype=points.dtype, shape=points.shape)
+    for start in range(0, points.shape[1], CHUNK_SIZE):
+        out[:, start:start + CHUNK_SIZE] = points[:, start:start + CHUNK_SIZE]
+    out.flush()
+
+
+def load_point_cloud(filepath, mmap=True):
+    """
+    Carrega uma nuvem de pontos (PLY, XYZ ou NPY), escolhendo o leitor pela extensão do arquivo.
+
+    Parâmetros:
+        filepath (str): Caminho para o arquivo.
+        mmap (bool): Usa mapeamento de memória quando o formato permite (`.npy` e PLY binário).
+
+    Retorna:
+        points (numpy.ndarray): Coordenadas homogêneas 4xN (x, y, z, 1).
+    """
+    extension = os.path.splitext(filepath)[1].lower()
+    if extension == '.ply':
+        return load_ply(filepath, mmap=mmap)
+    elif extension == '.xyz':
+        return load_xyz(filepath)
+    elif extension == '.npy':
+        return load_npy(filepath, mmap=mmap)
+    raise ValueError(f"Extensao de nuvem de pontos nao suportada: {extension}")
+
+
+def is_point_cloud(filepath):
+    """
+    Indica se o arquivo deve ser carregado como nuvem de pontos (e não como malha STL).
+    """
+    return os.path.splitext(str(filepath))[1].lower() in POINT_CLOUD_EXTENSIONS
@@ -1,4 +1,3 @@
-from stl import mesh
 import numpy as np
 
 def load_stl(filepath):
@@ -12,7 +11,8 @@ def load_stl(filepath):
         urso (numpy.ndarray): Coordenadas homogêneas (x, y, z, 1).
         urso_vectors (numpy.ndarray): Vetores dos triângulos que compõem o objeto.
     """
-    # Carrega o arquivo STL
+    # Carrega o arquivo STL (numpy-stl é importado só aqui, quando uma malha STL é de fato aberta)
+    from stl import mesh
     your_mesh = mesh.Mesh.from_file(filepath)
 
     # Obtém as coordenadas x, y, z
@@ -0,0 +1,169 @@
+import os
+
+import numpy as np
+
+from src.utils.bounds import bounding_sphere
+
+# Sufixo do arquivo de cache gravado ao lado da malha
+CACHE_SUFFIX = ".analysis.npz"
+
+# Versão do formato do cache (incrementar quando os campos mudarem)
+CACHE_VERSION = 1
+
+
+def weld_vertices(vectors):
+    """
+    Une os vértices repetidos dos triângulos (o STL guarda cada triângulo com seus três vértices).
+
+    Parâmetros:
+        vectors (numpy.ndarray): Triângulos Tx3x3 (como `self.urso_vectors`).
+
+    Retorna:
+        vertices (numpy.ndarray): Vértices únicos (V, 3).
+        faces (numpy.ndarray): Índices dos vértices de cada triângulo (T, 3).
+    """
+    vertices, inverse = np.unique(np.asarray(vectors, dtype=float).reshape(-1, 3), axis=0, return_inverse=True)
+    return vertices, inverse.reshape(-1, 3)
+
+
+def face_normals(vectors):
+    """
+    Calcula as normais unitárias dos triângulos (regra da mão direita na ordem dos vértices) e suas áreas.
+
+    Retorna:
+        normals (numpy.ndarray): Normais (T, 3); zero para triângulos degenerados.
+        areas (numpy.ndarray): Áreas (T,).
+    """
+    vectors = np.asarray(vectors, dtype=float)
+    cross = np.cross(vectors[:, 1] - vectors[:, 0], vectors[:, 2] - vectors[:, 0])
+    norm = np.linalg.norm(cross, axis=1)
+    normals = cross/np.where(norm > 0, norm, 1)[:, None]
+    return normals, norm/2
+
+
+def edge_topology(faces):
+    """
+    Lista as arestas únicas da malha e os triângulos que compartilham cada uma.
+
+    Parâmetros:
+        faces (numpy.ndarray): Índices dos vértices de cada triângulo (T, 3).
+
+    Retorna:
+        edges (numpy.ndarray): Arestas únicas (E, 2), com o menor índice primeiro.
+        edge_faces (numpy.ndarray): Os dois triângulos de cada aresta (E, 2); -1 em arestas de borda. Em arestas
+            compartilhadas por mais de dois triângulos, apenas os dois primeiros são guardados.
+        face_edges (numpy.ndarray): Aresta correspondente a cada lado (v0v1, v1v2, v2v0) dos triângulos (T, 3).
+    """
+    T = faces.shape[0]
+    sides = np.sort(faces[:, [[0, 1], [1, 2], [2, 0]]].reshape(-1, 2), axis=1)
+    edges, inverse = np.unique(sides, axis=0, return_inverse=True)
+    inverse = inverse.ravel()
+
+    # Agrupa os lados pela aresta; os dois primeiros de cada grupo dão os triângulos vizinhos
+    order = np.argsort(inverse, kind='stable')
+    counts = np.bincount(inverse, minlength=len(edges))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    owner = order // 3
+    edge_faces = np.full((len(edges), 2), -1, dtype=np.int64)
+    edge_faces[:, 0] = owner[starts]
+    shared = counts > 1
+    edge_faces[shared, 1] = owner[starts[shared] + 1]
+    return edges, edge_faces, inverse.reshape(T, 3)
+
+
+def face_adjacency(edge_faces, face_edges):
+    """
+    Calcula o triângulo vizinho de cada lado de cada triângulo (-1 quando o lado é de borda).
+
+    Retorna:
+        adjacency (numpy.ndarray): Vizinhos (T, 3), na mesma ordem de lados de `face_edges`.
+    """
+    pairs = edge_faces[face_edges]
+    own = np.arange(face_edges.shape[0])[:, None]
+    return np.where(pairs[..., 0] == own, pairs[..., 1], pairs[..., 0])
+
+
+def analyze_mesh(vectors):
+    """
+    Calcula de uma vez os dados derivados da malha usados pelos recursos por quadro.
+
+    Parâmetros:
+        vectors (numpy.ndarray): Triângulos Tx3x3.
+
+    Retorna:
+        data (dict): `vertices`, `faces`, `normals`, `areas`, `edges`, `edge_faces`, `face_edges`, `adjacency`,
+        `aabb` ((2, 3): mínimo e máximo), `sphere_center` e `sphere_radius`.
+    """
+    vertices, faces = weld_vertices(vectors)
+    normals, areas = face_normals(vectors)
+    edges, edge_faces, face_edges = edge_topology(faces)
+    center, radius = bounding_sphere(vertices.T)
+    return {
+        "vertices": vertices,
+        "faces": faces,
+        "normals": normals,
+        "areas": areas,
+        "edges": edges,
+        "edge_faces": edge_faces,
+        "face_edges": face_edges,
+        "adjacency": face_adjacency(edge_faces, face_edges),
+        "aabb": np.stack((vertices.min(axis=0), vertices.max(axis=0))),
+        "sphere_center": center,
+        "sphere_radius": np.float64(radius),
+    }
+
+
+class MeshData:
+    """
+    Dados derivados de uma malha triangular, calculados uma única vez (ver `analyze_mesh`).
+
+    Atributos:
+        vectors (numpy.ndarray): Triângulos Tx3x3 originais.
+        vertices, faces: Malha indexada (vértices únicos e índices dos triângulos).
+        normals, areas: Normais unitárias e áreas dos triângulos.
+        edges, edge_faces, face_edges, adjacency: Topologia de arestas e vizinhança entre triângulos.
+        aabb: Caixa envolvente alinhada aos eixos (mínimo e máximo).
+        sphere_center, sphere_radius: Esfera envolvente.
+    """
+
+    def __init__(self, vectors, data=None):
+        self.vectors = vectors
+        data = analyze_mesh(vectors) if data is None else data
+        for key, value in data.items():
+            setattr(self, key, value)
+        self.sphere_radius = float(self.sphere_radius)
+
+    @classmethod
+    def from_file(cls, filepath, vectors):
+        """
+        Lê os dados de `<malha>.analysis.npz` quando o cache existe e é mais novo que a malha; caso contrário,
+        calcula e grava o cache (sem erro se a pasta não permitir escrita).
+
+        Parâmetros:
+            filepath (str): Caminho da malha STL.
+            vectors (numpy.ndarray): Triângulos Tx3x3 carregados de `filepath`.
+        """
+        cache = filepath + CACHE_SUFFIX
+        try:
+            if os.path.getmtime(cache) >= os.path.getmtime(filepath):
+                with np.load(cache) as stored:
+                    if int(stored["version"]) == CACHE_VERSION and stored["normals"].shape[0] == len(vectors):
+                        return cls(vectors, {key: stored[key] for key in stored.files if key != "version"})
+        except (OSError, KeyError, ValueError):
+            pass
+
+        mesh_data = cls(vectors)
+        try:
+            np.savez(cache, version=CACHE_VERSION, **mesh_data.to_dict())
+        except OSError:
+            pass
+        return mesh_data
+
+    def to_dict(self):
+        keys = ("vertices", "faces", "normals", "areas", "edges", "edge_faces", "face_edges", "adjacency", "aabb",
+                "sphere_center", "sphere_radius")
+        return {key: np.asarray(getattr(self, key)) for key in keys}
+
+    @property
+    def boundary_edges(self):
+        return self.edges[self.edge_faces[:, 1] < 0]
@@ -0,0 +1,30 @@
+from src.utils.load_points import is_point_cloud, load_point_cloud
+from src.utils.load_stl import load_stl
+
+# Malhas disponíveis na escolha do tutorial: nome -> (caminho, ícone)
+MESHES = {
+    "Urso": ('./assets/stl/urso.STL', "🐻"),
+    "Mario": ('./assets/stl/mario.STL', "🧑‍🎮"),
+    "Link Zelda": ('./assets/stl/link_zelda.STL', "🛡️"),
+    "Megaman": ('./assets/stl/megaman.STL', "🤖"),
+    "Donkey Kong": ('./assets/stl/donkey_kong.STL', "🦍")
+}
+
+# Malha carregada quando o usuário fecha o tutorial sem escolher nenhuma
+DEFAULT_MESH = MESHES["Urso"][0]
+
+
+def load_mesh(filepath):
+    """
+    Carrega uma malha STL ou uma nuvem de pontos (PLY, XYZ, NPY), escolhendo o leitor pela extensão.
+
+    Parâmetros:
+        filepath (str): Caminho para o arquivo.
+
+    Retorna:
+        urso (numpy.ndarray): Coordenadas homogêneas 4xN (x, y, z, 1).
+        urso_vectors (numpy.ndarray): Vetores dos triângulos (None para nuvens de pontos).
+    """
+    if is_point_cloud(filepath):
+        return load_point_cloud(filepath), None
+    return load_stl(filepath)
@@ -0,0 +1,251 @@
+import numpy as np
+
+from src.intrinsic.distortion import apply_distortion, distortion_coefficients, has_distortion
+
+# Matriz que descarta a coordenada homogênea (projeção canônica 3x4)
+M_X = np.array([[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0]])
+
+# Limites (min, max) aceitos para os parâmetros intrínsecos editáveis
+INTRINSIC_LIMITS = {
+    'n_pixels_base:': (640, 1920),
+    'n_pixels_altura:': (480, 1080),
+    'ccd_x:': (10, 50),
+    'ccd_y:': (10, 50),
+    'dist_focal:': (1, 1000),
+    's_theta:': (-1000, 1000),
+    'k1:': (-1, 1),
+    'k2:': (-1, 1),
+    'p1:': (-0.1, 0.1),
+    'p2:': (-0.1, 0.1),
+    'k3:': (-1, 1),
+}
+
+
+def default_intrinsics():
+    """
+    Retorna os parâmetros intrínsecos padrão da câmera (os mesmos usados pela interface).
+
+    Retorna:
+        params (dict): Dicionário no formato de `params_intrinsc_values`, já com `sx`, `sy`, `ox` e `oy` calculados.
+    """
+    params = {
+        "n_pixels_base:": 1050,
+        "n_pixels_altura:": 700,
+        "ccd_x:": 36,
+        "ccd_y:": 24,
+        "dist_focal:": 10,
+        "s_theta:": 0,
+        "k1:": 0,
+        "k2:": 0,
+        "p1:": 0,
+        "p2:": 0,
+        "k3:": 0,
+    }
+    return derive_intrinsics(params)
+
+
+def validate_intrinsics(params, limits=INTRINSIC_LIMITS):
+    """
+    Verifica se os parâmetros intrínsecos estão dentro dos limites permitidos.
+
+    Parâmetros:
+        params (dict): Parâmetros intrínsecos (apenas os campos presentes em `limits` são verificados).
+        limits (dict): Limites (min, max) de cada campo.
+
+    Retorna:
+        invalid_fields (list): Descrição dos campos inválidos (vazia quando todos são válidos).
+    """
+    invalid_fields = []
+    for label, (min_val, max_val) in limits.items():
+        if label not in params:
+            continue
+        try:
+            value = float(params[label])
+            if value < min_val or value > max_val:
+                invalid_fields.append(f"{label} (valor digitado: {params[label]}, limite: {min_val} a {max_val})")
+        except (TypeError, ValueError):
+            invalid_fields.append(f"{label} (valor digitado: {params[label]}, valor invalido)")
+    return invalid_fields
+
+
+def derive_intrinsics(params):
+    """
+    Calcula os parâmetros derivados (escala e ponto principal) a partir da resolução e do tamanho do sensor.
+
+    Parâmetros:
+        params (dict): Dicionário no formato de `params_intrinsc_values`. É alterado no lugar.
+
+    Retorna:
+        params (dict): O mesmo dicionário, com `sx:`, `sy:`, `ox:` e `oy:` atualizados.
+    """
+    params["sx:"] = params["n_pixels_base:"]/params["ccd_x:"]
+    params["sy:"] = params["n_pixels_altura:"]/params["ccd_y:"]
+    params["ox:"] = params["n_pixels_base:"]/2
+    params["oy:"] = params["n_pixels_altura:"]/2
+    return params
+
+
+def intrinsic_matrix(params):
+    """
+    Monta a matriz de calibração intrínseca K a partir de `params_intrinsc_values`.
+
+    Parâmetros:
+        params (dict): Parâmetros intrínsecos (precisa de `dist_focal`, `sx`, `sy`, `s_theta`, `ox` e `oy`).
+
+    Retorna:
+        K (numpy.ndarray): Matriz 3x3 de calibração intrínseca.
+    """
+    f = params['dist_focal:']
+    return np.array([[f*params["sx:"], f*params["s_theta:"], params["ox:"]],
+                     [0, f*params["sy:"], params["oy:"]],
+                     [0, 0, 1]])
+
+
+def projection_matrix(cam, K):
+    """
+    Calcula a matriz de projeção P = K · M_x · inv(cam).
+
+    Parâmetros:
+        cam (numpy.ndarray): Matriz 4x4 da pose da câmera (referencial da câmera no mundo).
+        K (numpy.ndarray): Matriz 3x3 de calibração intrínseca.
+
+    Retorna:
+        P (numpy.ndarray): Matriz de projeção 3x4.
+    """
+    M_ext = np.linalg.inv(cam)
+    return np.dot(K, np.dot(M_X, M_ext))
+
+
+def project_points(P, points):
+    """
+    Projeta pontos homogêneos 4xN na imagem e normaliza pela terceira coordenada.
+
+    Parâmetros:
+        P (numpy.ndarray): Matriz de projeção 3x4.
+        points (numpy.ndarray): Coordenadas homogêneas (x, y, z, 1) no formato 4xN (como `self.urso`).
+
+    Retorna:
+        points_2d (numpy.ndarray): Coordenadas 3xN (u, v, 1) na imagem.
+        valid (bool): False quando a terceira coordenada homogênea contém zeros (nesse caso ela é tratada como 1).
+    """
+    projected = np.dot(P, points)
+    valid = not np.any(projected[2] == 0)
+    if not valid:
+        projected[2] = 1
+    return projected / projected[2], valid
+
+
+def project_view(target, cam, params):
+    """
+    Projeta a malha (ou a cena) exatamente como a imagem 2D em modo wireframe: projeção, estágio de distorção e
+    separação dos objetos da cena por colunas NaN.
+
+    Parâmetros:
+        target: Coordenadas homogêneas 4xN, ou uma cena (`Scene`/`InstancedMesh`) com `project` e `polyline`.
+        cam (numpy.ndarray): Pose 4x4 da câmera.
+        params (dict): Parâmetros intrínsecos (formato de `params_intrinsc_values`, com sx, sy, ox e oy).
+
+    Retorna:
+        points_2d (numpy.ndarray): Coordenadas projetadas (3xN para uma malha; 2xM, com NaN, para uma cena).
+        valid (bool): False quando a terceira coordenada homogênea contém zeros.
+    """
+    K = intrinsic_matrix(params)
+    P = projection_matrix(cam, K)
+    if hasattr(target, "project"):
+        # Cena com varios objetos: uma unica projecao para todos
+        points_2d, _, valid = target.project(P)
+    else:
+        points_2d, valid = project_points(P, target)
+    coeffs = distortion_coefficients(params)
+    if has_distortion(coeffs):
+        # Estagio de distorcao da lente, depois da divisao homogenea
+        points_2d = apply_distortion(points_2d, K, coeffs)
+    if hasattr(target, "polyline"):
+        # Colunas NaN separam os objetos, para que um unico plot desenhe todos
+        points_2d = target.polyline(points_2d)
+    return points_2d, valid
+
+
+def density_image(P, points, width, height, chunk_size=1_000_000):
+    """
+    Projeta uma nuvem de pontos e acumula quantos pontos caem em cada pixel da imagem.
+
+    A projeção é feita em blocos, de modo que nuvens com dezenas de milhões de pontos (inclusive memmaps)
+    não precisam ser projetadas inteiras na memória. Pontos atrás da câmera ou fora da imagem são descartados.
+
+    Parâmetros:
+        P (numpy.ndarray): Matriz de projeção 3x4.
+        points (numpy.ndarray): Coordenadas homogêneas 4xN.
+        width (int): Largura da imagem em pixels (`n_pixels_base`).
+        height (int): Altura da imagem em pixels (`n_pixels_altura`).
+        chunk_size (int): Número de pontos projetados por bloco.
+
+    Retorna:
+        density (numpy.ndarray): Imagem `height x width` com a contagem de pontos por pixel.
+    """
+    width, height = int(width), int(height)
+    density = np.zeros(width*height, dtype=np.int64)
+    for start in range(0, points.shape[1], chunk_size):
+        projected = np.dot(P, points[:, start:start + chunk_size])
+        front = projected[2] > 0
+        u = np.floor(projected[0, front] / projected[2, front])
+        v = np.floor(projected[1, front] / projected[2, front])
+        inside = (u >= 0) & (u < width) & (v >= 0) & (v < height)
+        pixels = v[inside].astype(np.int64)*width + u[inside].astype(np.int64)
+        density += np.bincount(pixels, minlength=width*height)
+    return density.reshape(height, width)
+
+
+def intrinsic_matrices(dist_focal, sx, sy, s_theta, ox, oy):
+    """
+    Monta várias matrizes K de uma vez (mesma fórmula de `intrinsic_matrix`); os argumentos são difundidos entre si.
+
+    Parâmetros:
+        dist_focal, sx, sy, s_theta, ox, oy (float ou numpy.ndarray): Parâmetros intrínsecos (escalares ou vetores B).
+
+    Retorna:
+        K (numpy.ndarray): Matrizes intrínsecas (B, 3, 3).
+    """
+    f, sx, sy, s_theta, ox, oy = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=float))
+                                                       for v in (dist_focal, sx, sy, s_theta, ox, oy)))
+    K = np.zeros(f.shape + (3, 3))
+    K[..., 0, 0] = f*sx
+    K[..., 0, 1] = f*s_theta
+    K[..., 0, 2] = ox
+    K[..., 1, 1] = f*sy
+    K[..., 1, 2] = oy
+    K[..., 2, 2] = 1
+    return K
+
+
+def projection_matrices(cams, Ks):
+    """
+    Calcula várias matrizes de projeção P = K · M_x · inv(cam) de uma vez.
+
+    Parâmetros:
+        cams (numpy.ndarray): Poses da câmera (B, 4, 4) ou (4, 4).
+        Ks (numpy.ndarray): Matrizes intrínsecas (B, 3, 3) ou (3, 3).
+
+    Retorna:
+        P (numpy.ndarray): Matrizes de projeção (B, 3, 4).
+    """
+    M_ext = np.linalg.inv(np.asarray(cams, dtype=float))
+    return np.matmul(Ks, M_ext[..., :3, :])
+
+
+def project_points_batch(Ps, points):
+    """
+    Projeta os mesmos pontos com várias matrizes de projeção (uma única multiplicação em lote).
+
+    Parâmetros:
+        Ps (numpy.ndarray): Matrizes de projeção (B, 3, 4).
+        points (numpy.ndarray): Coordenadas homogêneas 4xN.
+
+    Retorna:
+        points_2d (numpy.ndarray): Coordenadas (B, 2, N) na imagem.
+        depth (numpy.ndarray): Terceira coordenada homogênea (B, N); pontos com valor <= 0 estão atrás da câmera.
+    """
+    projected = np.matmul(Ps, points)
+    depth = projected[:, 2]
+    safe = np.where(depth == 0, 1, depth)
+    return projected[:, :2]/safe[:, None], depth
@@ -0,0 +1,97 @@
+from collections import OrderedDict
+
+import numpy as np
+
+# Casas decimais mantidas na pose ao montar a chave: poses restauradas (desfazer, favoritos) diferem da original
+# apenas por erros de arredondamento e devem cair na mesma entrada
+POSE_DECIMALS = 6
+
+# Memória máxima ocupada pelos resultados em cache
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+
+
+def geometry_version(mesh):
+    """
+    Versão da geometria de `mesh`: `Scene.version` para cenas (alteradas no lugar), 0 para malhas e instâncias.
+    """
+    return getattr(mesh, "version", 0)
+
+
+def projection_key(kind, mesh, cam, params, decimals=POSE_DECIMALS):
+    """
+    Monta a chave de cache de uma projeção.
+
+    Parâmetros:
+        kind (str): Tipo do resultado ("wireframe", "density", ...), para separar resultados diferentes da mesma vista.
+        mesh: Objeto projetado (matriz 4xN, `Scene` ou `InstancedMesh`), identificado pelo `id` e pela versão
+            (`geometry_version`), já que uma cena é alterada no lugar.
+        cam (numpy.ndarray): Pose 4x4 da câmera.
+        params (dict): Parâmetros intrínsecos (formato de `params_intrinsc_values`).
+        decimals (int): Casas decimais da quantização da pose.
+
+    Retorna:
+        key (tuple): Chave hashable.
+    """
+    # Somar 0.0 troca -0.0 por 0.0, para que a quantização não gere chaves diferentes para o mesmo valor
+    pose = np.round(np.asarray(cam, dtype=float), decimals) + 0.0
+    intrinsics = tuple(sorted((key, float(value)) for key, value in params.items()))
+    return kind, id(mesh), geometry_version(mesh), pose.tobytes(), intrinsics
+
+
+class ProjectionCache:
+    """
+    Cache LRU de resultados de projeção (pontos 2D, imagens de densidade), limitado pela memória ocupada.
+
+    Os arrays guardados são marcados como somente leitura, já que a mesma instância é devolvida a cada acerto.
+
+    Atributos:
+        max_bytes (int): Orçamento de memória; as entradas menos usadas recentemente são descartadas ao excedê-lo.
+        nbytes (int): Memória ocupada pelas entradas atuais.
+        hits, misses (int): Contadores de acertos e faltas.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = int(max_bytes)
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """
+        Retorna o valor em cache (e o marca como o mais recente), ou None.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, value):
+        """
+        Guarda um resultado (um array ou uma tupla; os arrays da tupla contam no orçamento).
+
+        Resultados maiores que o orçamento inteiro não são guardados.
+        """
+        arrays = [item for item in (value if isinstance(value, tuple) else (value,)) if isinstance(item, np.ndarray)]
+        size = sum(array.nbytes for array in arrays)
+        if size > self.max_bytes:
+            return
+        for array in arrays:
+            array.flags.writeable = False
+        if key in self._entries:
+            self.nbytes -= self._entries.pop(key)[1]
+        self._entries[key] = (value, size)
+        self.nbytes += size
+        while self.nbytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.nbytes -= evicted
+
+    def clear(self):
+        self._entries.clear()
+        self.nbytes = 0
@@ -25,4 +25,102 @@ def move(dx, dy, dz):
     T[0, -1] = dx
     T[1, -1] = dy
     T[2, -1] = dz
-    return T
\ No newline at end of file
+    return T
+
+def field_transform(key, value):
+    """
+    Gera a matriz de transformação associada a um campo da interface ("X(move):", "Y(angle):", ...).
+
+    Parâmetros:
+        key (str): Nome do campo, no formato usado em `cam_values` e `world_values`.
+        value (float): Deslocamento ou ângulo (em graus) digitado no campo.
+
+    Retorna:
+        T (numpy.ndarray): Matriz 4x4 de translação ou rotação.
+    """
+    if "X(move)" in key:
+        return move(value, 0, 0)
+    elif "X(angle)" in key:
+        return x_rotation(value)
+    elif "Y(move)" in key:
+        return move(0, value, 0)
+    elif "Y(angle)" in key:
+        return y_rotation(value)
+    elif "Z(move)" in key:
+        return move(0, 0, value)
+    elif "Z(angle)" in key:
+        return z_rotation(value)
+    raise ValueError(f"Campo de transformacao desconhecido: {key}")
+
+def field_transforms(key, values):
+    """
+    Versão em lote de `field_transform`: gera uma matriz por valor.
+
+    Parâmetros:
+        key (str): Nome do campo ("X(move):", "Y(angle):", ...).
+        values (numpy.ndarray): Deslocamentos ou ângulos (em graus), no formato (B,).
+
+    Retorna:
+        T (numpy.ndarray): Matrizes 4x4 no formato (B, 4, 4).
+    """
+    values = np.atleast_1d(np.asarray(values, dtype=float))
+    T = np.broadcast_to(np.eye(4), values.shape + (4, 4)).copy()
+    axis = "XYZ".index(key.strip()[0]) if key.strip()[:1] in ("X", "Y", "Z") else None
+    if axis is None or not ("(move)" in key or "(angle)" in key):
+        raise ValueError(f"Campo de transformacao desconhecido: {key}")
+    if "(move)" in key:
+        T[:, axis, 3] = values
+        return T
+    angle = np.radians(values)
+    # Eixos que formam o plano da rotação, na mesma convenção de x_rotation, y_rotation e z_rotation
+    a, b = {0: (1, 2), 1: (2, 0), 2: (0, 1)}[axis]
+    T[:, a, a] = cos(angle)
+    T[:, a, b] = -sin(angle)
+    T[:, b, a] = sin(angle)
+    T[:, b, b] = cos(angle)
+    return T
+
+def rotation_to_quaternion(R):
+    """
+    Converte uma matriz de rotação 3x3 em um quaternion unitário (w, x, y, z), com w >= 0.
+
+    Parâmetros:
+        R (numpy.ndarray): Matriz de rotação 3x3 (ou a parte 3x3 de uma matriz 4x4).
+
+    Retorna:
+        q (numpy.ndarray): Quaternion (w, x, y, z).
+    """
+    R = np.asarray(R, dtype=float)[:3, :3]
+    trace = np.trace(R)
+    # Escolhe o maior termo da diagonal para evitar divisões por valores pequenos
+    if trace > 0:
+        s = 2*np.sqrt(1 + trace)
+        q = np.array([s/4, (R[2, 1] - R[1, 2])/s, (R[0, 2] - R[2, 0])/s, (R[1, 0] - R[0, 1])/s])
+    elif R[0, 0] > R[1, 1] and R[0, 0] > R[2, 2]:
+        s = 2*np.sqrt(1 + R[0, 0] - R[1, 1] - R[2, 2])
+        q = np.array([(R[2, 1] - R[1, 2])/s, s/4, (R[0, 1] + R[1, 0])/s, (R[0, 2] + R[2, 0])/s])
+    elif R[1, 1] > R[2, 2]:
+        s = 2*np.sqrt(1 + R[1, 1] - R[0, 0] - R[2, 2])
+        q = np.array([(R[0, 2] - R[2, 0])/s, (R[0, 1] + R[1, 0])/s, s/4, (R[1, 2] + R[2, 1])/s])
+    else:
+        s = 2*np.sqrt(1 + R[2, 2] - R[0, 0] - R[1, 1])
+        q = np.array([(R[1, 0] - R[0, 1])/s, (R[0, 2] + R[2, 0])/s, (R[1, 2] + R[2, 1])/s, s/4])
+    q /= np.linalg.norm(q)
+    return -q if q[0] < 0 else q
+
+def quaternion_to_rotation(q):
+    """
+    Converte um quaternion (w, x, y, z) em uma matriz de rotação 3x3.
+
+    Parâmetros:
+        q (numpy.ndarray): Quaternion (não precisa estar normalizado).
+
+    Retorna:
+        R (numpy.ndarray): Matriz de rotação 3x3.
+    """
+    w, x, y, z = np.asarray(q, dtype=float)/np.linalg.norm(q)
+    return np.array([
+        [1 - 2*(y*y + z*z), 2*(x*y - w*z), 2*(x*z + w*y)],
+        [2*(x*y + w*z), 1 - 2*(x*x + z*z), 2*(y*z - w*x)],
+        [2*(x*z - w*y), 2*(y*z + w*x), 1 - 2*(x*x + y*y)],
+    ])
@@ -1,7 +1,9 @@
-from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton, QLabel, QHBoxLayout, QSpacerItem, QSizePolicy
+from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTextEdit, QPushButton, QLabel, QHBoxLayout, QSpacerItem, QSizePolicy, QFileDialog
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QIcon
 
+from src.utils.meshes import MESHES
+
 def TutorialPopup():
     # Criando a janela do popup
     popup = QDialog()
@@ -32,6 +34,8 @@ def TutorialPopup():
         "<li><b>Coeficientes de escala (n_pixels_base):</b> (min: 640, max: 1920)</li>"
         "<li><b>Coeficientes de escala (n_pixels_altura):</b> (min: 480, max: 1080)</li>"
         "<li><b>Ângulo s0 (s_theta):</b> (min: -1000, max: 1000)</li>"
+        "<li><b>Distorção radial (k1, k2, k3):</b> (min: -1, max: 1)</li>"
+        "<li><b>Distorção tangencial (p1, p2):</b> (min: -0.1, max: 0.1)</li>"
         "</ol>"
         "</ul>"
         "<h2>⚙️ Parâmetros Disponíveis</h2>"
@@ -61,15 +65,6 @@ def TutorialPopup():
     # Botões de escolha de mesh
     mesh_buttons_layout = QHBoxLayout()
 
-    # Caminhos para as meshes
-    meshes = {
-        "Urso": ('./assets/stl/urso.STL', "🐻"),
-        "Mario": ('./assets/stl/mario.STL', "🧑‍🎮"),
-        "Link Zelda": ('./assets/stl/link_zelda.STL', "🛡️"),
-        "Megaman": ('./assets/stl/megaman.STL', "🤖"),
-        "Donkey Kong": ('./assets/stl/donkey_kong.STL', "🦍")
-    }
-
     # Variável para armazenar a escolha do usuário
     chosen_mesh = {"path": None}
 
@@ -79,11 +74,22 @@ def TutorialPopup():
         popup.accept()
 
     # Criar um botão com ícone para cada mesh
-    for mesh_name, (mesh_path, icon) in meshes.items():
+    for mesh_name, (mesh_path, icon) in MESHES.items():
         button = QPushButton(f"{icon} {mesh_name}")
         button.clicked.connect(lambda _, path=mesh_path: choose_mesh(path))
         mesh_buttons_layout.addWidget(button)
 
+    # Botão para abrir outra malha STL ou uma nuvem de pontos (PLY, XYZ, NPY)
+    def choose_file():
+        path, _ = QFileDialog.getOpenFileName(popup, "Abrir malha ou nuvem de pontos", "./assets",
+                                              "Malhas e nuvens de pontos (*.stl *.STL *.ply *.xyz *.npy)")
+        if path:
+            choose_mesh(path)
+
+    file_button = QPushButton("📂 Abrir arquivo...")
+    file_button.clicked.connect(choose_file)
+    mesh_buttons_layout.addWidget(file_button)
+
     spacer = QSpacerItem(20, 40, QSizePolicy.Minimum, QSizePolicy.Expanding)
     mesh_buttons_layout.addSpacerItem(spacer)
     layout.addLayout(mesh_buttons_layout)
@@ -179,27 +179,32 @@ class World:
         - `self.world_line_edits`: Dicionário que contém os campos de entrada para os parâmetros de transformação do mundo.
         - `self.world_values`: Dicionário que armazena os valores dos parâmetros de transformação do mundo, que são atualizados com os valores inseridos.
         - `self.world_action`: Função que é chamada para aplicar a transformação com base no valor inserido para cada parâmetro.
+        - `self.batch_render`: Agrupa os desenhos pedidos pelos campos; só as vistas cuja pose mudou são refeitas, uma única vez.
         """
 
         self.log("-----------------------------------------")
         self.log("FUNCAO CHAMADA: update_world")
         self.log("Atualizando parametros de transformacao do mundo...")
         erro=False
-        for key, world_line_edit in self.world_line_edits.items():
-            text = world_line_edit.text()
-            if text: 
-                try:
-                    self.world_values[key] = float(text)
+        applied = {}
+        with self.batch_render():
+            for key, world_line_edit in self.world_line_edits.items():
+                text = world_line_edit.text()
+                if text: 
+                    try:
+                        self.world_values[key] = float(text)
 
-                    self.world_action(key, self.world_values[key])
+                        self.world_action(key, self.world_values[key])
+                        applied[key] = self.world_values[key]
 
 
-                except ValueError:
-                    erro=True
-                    self.ke=key
-                    self.te=text
-                    print(f"Erro ao converter {key} {text}")
+                    except ValueError:
+                        erro=True
+                        self.ke=key
+                        self.te=text
+                        print(f"Erro ao converter {key} {text}")
 
+        self.record_event("world", applied)
         self.log("-----------------------------------------")
         print(erro)
         if(erro):
@@ -218,7 +223,7 @@ class World:
 
         Este método aplica uma transformação ao mundo, alterando a posição ou a orientação da câmera com base nos 
         parâmetros fornecidos. O método verifica o valor de `key` e aplica a transformação correspondente ao mover 
-        ou rotacionar a câmera nos eixos X, Y ou Z. Após cada transformação, a função `update_canvas()` é chamada 
+        ou rotacionar a câmera nos eixos X, Y ou Z. Após cada transformação, a função `request_render()` é chamada 
         para re-renderizar a cena com as novas configurações.
 
         Passos realizados:
@@ -227,7 +232,7 @@ class World:
         2. Dependendo do eixo (X, Y ou Z) e da transformação (movimento ou rotação), calcula a transformação necessária 
         utilizando as funções `move()`, `x_rotation()`, `y_rotation()`, ou `z_rotation()`.
         3. Aplica a transformação calculada, alterando a matriz de transformação da câmera (`self.cam`).
-        4. Chama a função `update_canvas()` para atualizar a visualização da cena com as novas transformações aplicadas.
+        4. Chama a função `request_render()` para atualizar a visualização da cena com as novas transformações aplicadas.
 
         Parâmetros:
         -----------
@@ -245,7 +250,7 @@ class World:
         - `self.cam`: A matriz de transformação da câmera, que é atualizada após cada transformação.
         - `self.zero_cam`: A configuração inicial da câmera, usada como referência para as transformações.
         - `self.T`: A matriz de transformação calculada para aplicar a operação de movimento ou rotação.
-        - `self.update_canvas`: Função chamada para re-renderizar a visualização com as novas transformações aplicadas.
+        - `self.request_render`: Função chamada para re-renderizar a visualização com as novas transformações aplicadas.
 
         """
 
@@ -259,34 +264,34 @@ class World:
             #self.cam = np.dot(self.T, self.zero_cam) ##FIXME: Erro esta aqui, era pra ter utilizado "self.cam"
             self.cam = np.dot(self.T, self.cam)
 
-            self.update_canvas()          
+            self.request_render()          
 
 
-            self.update_canvas()    
+            self.request_render()    
         elif "X(angle)" in key:
             self.T = x_rotation(value)
             self.cam = np.dot(self.T, self.cam)
-            self.update_canvas()           
+            self.request_render()           
 
         elif "Y(move)" in key:
             self.T = move(0, value, 0)
             self.cam = np.dot(self.T, self.cam)
-            self.update_canvas()        
+            self.request_render()        
 
         elif "Y(angle)" in key:
             self.T = y_rotation(value)
             self.cam = np.dot(self.T, self.cam)
-            self.update_canvas()          
+            self.request_render()          
 
         elif "Z(move)" in key:
             self.T = move(0, 0, value)
             self.cam = np.dot(self.T, self.cam)
-            self.update_canvas()           
+            self.request_render()           
 
         elif "Z(angle)" in key:
             self.T = z_rotation(value)
             self.cam = np.dot(self.T, self.cam)
-            self.update_canvas()
+            self.request_render()
         self.log("Saindo da funcao world_action")
         self.log("-----------------------------------------")
         self.log("-----------------------------------------") 
\ No newline at end of file